@@ -0,0 +1,49 @@
+"""
+    Compares the batched ``addAttributesFromGroup`` against the per-node ``mc.vray`` loop.
+
+    Run with mayapy (V-Ray for Maya must be available):
+
+        mayapy benchmarks/attributes_benchmark.py 1000 10000
+"""
+import sys
+import time
+
+
+def _per_node(nodes, group, state):
+    import maya.cmds as mc
+    for node in nodes:
+        mc.vray("addAttributesFromGroup", node, group, state)
+
+
+def _batched(nodes, group, state):
+    from vrayformayaUtils.batch import addAttributesFromGroup
+    addAttributesFromGroup(nodes, group, state)
+
+
+def _timed(func, *args):
+    start = time.time()
+    func(*args)
+    return time.time() - start
+
+
+def run(counts):
+    import maya.cmds as mc
+    import vrayformayaUtils as vfm
+
+    vfm.loadVray()
+    for count in counts:
+        mc.file(new=True, force=True)
+        transforms = [mc.polyCube(constructionHistory=False)[0] for _ in range(count)]
+        shapes = mc.listRelatives(transforms, shapes=True, fullPath=True)
+
+        for label, func in (("per-node", _per_node), ("batched", _batched)):
+            add = _timed(func, shapes, "vray_subdivision", 1)
+            remove = _timed(func, shapes, "vray_subdivision", 0)
+            print("{0:>8} shapes  {1:<9} add: {2:8.3f}s  remove: {3:8.3f}s".format(count, label, add, remove))
+
+
+if __name__ == "__main__":
+    import maya.standalone
+    maya.standalone.initialize()
+
+    run([int(x) for x in sys.argv[1:]] or [1000, 10000])
@@ -0,0 +1,46 @@
+"""
+    Compares resolving materials through the future history (``getMaterials``) against resolving them through
+    shadingEngine membership (``getAssignedMaterials``).
+
+    Every shape gets a deformer so the future history is comparable to a rigged/deformed production scene.
+
+    Run with mayapy:
+
+        mayapy benchmarks/materials_benchmark.py 10000
+"""
+import sys
+import time
+
+
+def run(counts, materialCount=50):
+    import maya.cmds as mc
+    from vrayformayaUtils.utils import getMaterials, getAssignedMaterials
+
+    for count in counts:
+        mc.file(new=True, force=True)
+        engines = []
+        for i in range(materialCount):
+            material = mc.shadingNode("lambert", asShader=True)
+            engine = mc.sets(renderable=True, noSurfaceShader=True, empty=True)
+            mc.connectAttr(material + ".outColor", engine + ".surfaceShader")
+            engines.append(engine)
+
+        transforms = []
+        for i in range(count):
+            transform = mc.polyCube()[0]
+            mc.cluster(transform)
+            mc.sets(transform, forceElement=engines[i % materialCount])
+            transforms.append(transform)
+
+        for label, func in (("getMaterials", getMaterials), ("getAssignedMaterials", getAssignedMaterials)):
+            start = time.time()
+            materials = func(transforms)
+            print("{0:>8} shapes  {1:<21} {2:8.3f}s  ({3} materials)".format(count, label, time.time() - start,
+                                                                            len(materials)))
+
+
+if __name__ == "__main__":
+    import maya.standalone
+    maya.standalone.initialize()
+
+    run([int(x) for x in sys.argv[1:]] or [10000])
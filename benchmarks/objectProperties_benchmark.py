@@ -0,0 +1,39 @@
+"""
+    Compares the selection free ``objectProperties`` against the selection based ``mc.vray`` path.
+
+    Run with mayapy (V-Ray for Maya must be available):
+
+        mayapy benchmarks/objectProperties_benchmark.py 1000 10000
+"""
+import sys
+import time
+
+
+def _timed(func, *args, **kwargs):
+    start = time.time()
+    func(*args, **kwargs)
+    return time.time() - start
+
+
+def run(counts):
+    import maya.cmds as mc
+    import vrayformayaUtils as vfm
+    from vrayformayaUtils.objectProperties import objectProperties
+
+    vfm.loadVray()
+    for count in counts:
+        for label, useSelection in (("selection", True), ("direct", False)):
+            for cmd in ("add_single", "add_multiple"):
+                mc.file(new=True, force=True)
+                transforms = [mc.polyCube(constructionHistory=False)[0] for _ in range(count)]
+                mc.select(transforms[:10], r=1)
+
+                duration = _timed(objectProperties, cmd, nodes=transforms, useSelection=useSelection)
+                print("{0:>8} nodes  {1:<10} {2:<13} {3:8.3f}s".format(count, label, cmd, duration))
+
+
+if __name__ == "__main__":
+    import maya.standalone
+    maya.standalone.initialize()
+
+    run([int(x) for x in sys.argv[1:]] or [1000, 10000])
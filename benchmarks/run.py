@@ -0,0 +1,360 @@
+"""
+    The vrayformayaUtils benchmark suite.
+
+    Generates synthetic scenes of a configurable size (wide and deep hierarchies, heavy instancing, many materials
+    and the cameras, lights, nurbs and utility nodes of the remaining attribute functions) and times the public
+    functions of the `attributes`, `core` and `objectProperties` modules. For every function it reports the wall
+    time, the amount of Maya commands issued (``maya.cmds`` calls and ``mel.eval`` calls) and the peak memory
+    allocated by Python while running it. The results are written as JSON so they can be compared between releases.
+
+    A function that raises an error is reported as ERROR and makes the run exit with a non-zero status.
+
+    Run headless against the pure-Python stand-in scene (no Maya needed):
+
+        python benchmarks/run.py --size 1000 --output results.json
+
+    Run in Maya (V-Ray for Maya must be available):
+
+        mayapy benchmarks/run.py --maya --size 10000 --output results.json
+
+    Note that the stand-in scene is much slower and simpler than Maya, so only compare results of the same mode.
+    The command counts are comparable between both modes.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2 (mayapy before Maya 2022)
+    tracemalloc = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#: The available synthetic scenes.
+SCENES = ("wide", "deep", "instanced", "materials", "nodeTypes")
+
+#: The amount of nodes per chain in the deep scene.
+DEPTH = 50
+
+#: The shape types (created below a transform) and utility node types of the nodeTypes scene.
+SHAPE_TYPES = ("nurbsSurface", "nurbsCurve", "camera", "ambientLight", "directionalLight", "pointLight", "spotLight",
+               "areaLight")
+UTILITY_TYPES = ("place2dTexture", "samplerInfo")
+
+
+class CommandCounter(object):
+    """ Counts the calls to all ``maya.cmds`` commands and ``mel.eval`` """
+    def __init__(self):
+        import maya.cmds
+        import maya.mel
+
+        self.count = 0
+        for module, names in ((maya.cmds, dir(maya.cmds)), (maya.mel, ["eval"])):
+            for name in names:
+                func = getattr(module, name)
+                if not name.startswith("_") and callable(func):
+                    setattr(module, name, self._counted(func))
+
+    def _counted(self, func):
+        def wrapper(*args, **kwargs):
+            self.count += 1
+            return func(*args, **kwargs)
+        return wrapper
+
+
+#####################
+# scenes
+#####################
+
+def _cube(mc):
+    return mc.polyCube(constructionHistory=False)[0]
+
+
+def buildWide(mc, size):
+    """ A single group with all meshes directly below it """
+    group = mc.group(empty=True, name="wide")
+    for _ in range(size):
+        mc.parent(_cube(mc), group)
+    return {"roots": [group]}
+
+
+def buildDeep(mc, size):
+    """ Chains of DEPTH nested meshes """
+    roots = []
+    parent = None
+    for i in range(size):
+        cube = _cube(mc)
+        if i % DEPTH == 0:
+            roots.append(cube)
+        else:
+            mc.parent(cube, parent)
+        parent = cube
+    return {"roots": roots}
+
+
+def buildInstanced(mc, size):
+    """ A single mesh instanced size times """
+    group = mc.group(empty=True, name="instanced")
+    cube = _cube(mc)
+    mc.parent(cube, group)
+    for _ in range(size - 1):
+        mc.parent(mc.instance(cube)[0], group)
+    return {"roots": [group]}
+
+
+def buildMaterials(mc, size, materialType="VRayMtl"):
+    """ Meshes spread over size / 10 materials that each have a file texture """
+    group = mc.group(empty=True, name="materials")
+    cubes = [_cube(mc) for _ in range(size)]
+    mc.parent(cubes, group)
+
+    materialCount = max(1, size // 10)
+    materials = []
+    textures = []
+    for i in range(materialCount):
+        material = mc.shadingNode(materialType, asShader=True)
+        texture = mc.shadingNode("file", asTexture=True)
+        engine = mc.sets(renderable=True, noSurfaceShader=True, empty=True, name=material + "SG")
+        mc.connectAttr(texture + ".outColor", material + ".color")
+        mc.connectAttr(material + ".outColor", engine + ".surfaceShader")
+        mc.sets(cubes[i::materialCount], forceElement=engine)
+        materials.append(material)
+        textures.append(texture)
+    return {"roots": [group], "meshes": cubes, "materials": materials, "textures": textures}
+
+
+def buildNodeTypes(mc, size):
+    """ Nodes of the types the mesh scenes don't have (see SHAPE_TYPES and UTILITY_TYPES), spread evenly """
+    group = mc.group(empty=True, name="nodeTypes")
+    nodeTypes = SHAPE_TYPES + UTILITY_TYPES
+    utilities = []
+    for i in range(size):
+        nodeType = nodeTypes[i % len(nodeTypes)]
+        if nodeType in UTILITY_TYPES:
+            utilities.append(mc.shadingNode(nodeType, asUtility=True))
+        else:
+            transform = mc.createNode("transform", parent=group)
+            mc.createNode(nodeType, parent=transform)
+    return {"roots": [group], "nodes": utilities}
+
+
+BUILDERS = {"wide": buildWide,
+            "deep": buildDeep,
+            "instanced": buildInstanced,
+            "materials": buildMaterials,
+            "nodeTypes": buildNodeTypes}
+
+
+#####################
+# benchmarks
+#####################
+
+def attributeBenchmarks(scene):
+    """ Yield a (name, function) pair per attribute function that applies to the scene """
+    import maya.cmds as mc
+    from vrayformayaUtils import attributes
+
+    for name, group in attributes.ATTRIBUTE_GROUPS.items():
+        if group.inputs == "materials":
+            # Resolved through the shadingEngines of the meshes
+            nodes = scene.get("meshes")
+        elif group.inputs == "nodes":
+            nodes = mc.ls(scene.get("textures", []) + scene.get("nodes", []), type=list(group.validTypes))
+        elif mc.ls(type=list(group.validTypes)):
+            nodes = scene["roots"]
+        else:
+            # The node types of the function aren't part of this scene
+            nodes = None
+
+        if not nodes:
+            continue
+
+        func = getattr(attributes, name)
+        yield "attributes.{0}(state=1)".format(name), lambda func=func, nodes=nodes: func(nodes, state=1)
+        yield "attributes.{0}(state=0)".format(name), lambda func=func, nodes=nodes: func(nodes, state=0)
+
+    roots = scene["roots"]
+    if mc.ls(type="mesh"):
+        yield "attributes.plan", lambda: attributes.plan("vray_subdivision", roots, vraySubdivEnable=True)
+
+
+def objectPropertiesBenchmarks(scene):
+    """ Yield a (name, function) pair per objectProperties function """
+    import maya.cmds as mc
+    from vrayformayaUtils.objectProperties import objectProperties, addObjectProperties
+
+    transforms = mc.listRelatives(scene["roots"], allDescendents=True, type="transform", fullPath=True) or []
+    transforms = list(scene["roots"]) + transforms
+    groups = dict(("props{0}".format(i), transforms[i::10]) for i in range(min(10, len(transforms))))
+
+    yield "objectProperties.objectProperties(add_single)", lambda: objectProperties("add_single", nodes=transforms)
+    yield "objectProperties.objectProperties(add_multiple)", lambda: objectProperties("add_multiple",
+                                                                                      nodes=transforms)
+    yield "objectProperties.addObjectProperties", lambda: addObjectProperties(groups)
+    yield "objectProperties.objectProperties(remove)", lambda: objectProperties("remove", nodes=transforms)
+
+
+def coreBenchmarks(size):
+    """ Yield a (name, function) pair per render element function.
+
+    The render element schemas are cached in a temporary file while the benchmarks run, so the schema discovery is
+    timed as well and the user's schema cache isn't touched.
+    """
+    import maya.cmds as mc
+    import vrayformayaUtils as vfm
+    from vrayformayaUtils import core, sceneIndex
+
+    count = max(1, size // 10)
+    specs = [{"vrayClassType": "MultiMatteElement", "vray_redid_multimatte": i} for i in range(count)]
+
+    def addRenderElement():
+        for i in range(max(1, count // 10)):
+            vfm.addRenderElement("MultiMatteElement", vray_redid_multimatte=i)
+
+    def indexedRenderElementIndex():
+        sceneIndex.enable(sceneIndex.SceneIndex())
+        try:
+            for _ in range(10):
+                vfm.getRenderElementIndex()
+        finally:
+            sceneIndex.disable()
+
+    directory = tempfile.mkdtemp()
+    schemaCachePath = core.SCHEMA_CACHE_PATH
+    core.SCHEMA_CACHE_PATH = os.path.join(directory, "renderElementSchemas.json")
+    core.clearRenderElementSchemas()
+    try:
+        yield "core.getRenderElementSchema(discover)", lambda: vfm.getRenderElementSchema("MultiMatteElement")
+        yield "core.getRenderElementSchema(cached)", lambda: vfm.getRenderElementSchema("MultiMatteElement")
+        yield "core.addRenderElement", addRenderElement
+        yield "core.addRenderElements", lambda: vfm.addRenderElements(specs)
+        yield "core.getRenderElements", lambda: vfm.getRenderElements()
+        yield "core.getRenderElements(vrayClassType)", lambda: vfm.getRenderElements(vrayClassType="MultiMatteElement")
+        yield "core.getRenderElementClassTypes", lambda: vfm.getRenderElementClassTypes(
+            mc.ls(type="VRayRenderElement"))
+        yield "core.buildRenderElementIndex", vfm.buildRenderElementIndex
+        yield "core.getRenderElementIndex", vfm.getRenderElementIndex
+        yield "core.getRenderElementIndex(sceneIndex)", indexedRenderElementIndex
+    finally:
+        core.SCHEMA_CACHE_PATH = schemaCachePath
+        core.clearRenderElementSchemas()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def measure(func, counter, memory=True):
+    """ Run func once and return its wall time, the amount of commands it issued and its peak memory """
+    if memory and tracemalloc is not None:
+        tracemalloc.start()
+
+    commands = counter.count
+    error = None
+    start = time.time()
+    try:
+        func()
+    except RuntimeError as e:
+        error = str(e)
+    seconds = time.time() - start
+    commands = counter.count - commands
+
+    peakMemory = None
+    if memory and tracemalloc is not None:
+        peakMemory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {"seconds": seconds, "commands": commands, "peakMemory": peakMemory, "error": error}
+
+
+def run(size=1000, scenes=SCENES, filter=None, memory=True, maya=False, verbose=True):
+    """ Run the benchmarks and return the results as dictionary """
+    if maya:
+        import maya.cmds as mc
+        import vrayformayaUtils as vfm
+        vfm.loadVray()
+        newScene = lambda: mc.file(new=True, force=True)
+    else:
+        sys.path.insert(0, ROOT)
+        from tests import standin
+        scene = standin.install()
+        import maya.cmds as mc
+        newScene = scene.clear
+
+    counter = CommandCounter()
+    results = []
+
+    def record(sceneName, name, func):
+        if filter and filter not in name:
+            return
+        result = measure(func, counter, memory=memory)
+        result.update({"scene": sceneName, "size": size, "function": name})
+        results.append(result)
+        if verbose:
+            print("{0:<10} {1:<58} {2:9.4f}s {3:>8} cmds{4}".format(sceneName, name, result["seconds"],
+                                                                    result["commands"],
+                                                                    "  ERROR: {0}".format(result["error"])
+                                                                    if result["error"] else ""))
+
+    for sceneName in scenes:
+        newScene()
+        built = []
+        build = measure(lambda: built.append(BUILDERS[sceneName](mc, size)), counter, memory=False)
+        scene = built[0]
+        if verbose:
+            print("{0:<10} {1:<58} {2:9.4f}s".format(sceneName, "(build)", build["seconds"]))
+
+        for name, func in attributeBenchmarks(scene):
+            record(sceneName, name, func)
+        for name, func in objectPropertiesBenchmarks(scene):
+            record(sceneName, name, func)
+
+    newScene()
+    for name, func in coreBenchmarks(size):
+        record("renderElements", name, func)
+
+    return {"python": platform.python_version(),
+            "platform": platform.platform(),
+            "maya": mc.about(version=True) if maya else None,
+            "mode": "maya" if maya else "standin",
+            "size": size,
+            "results": results,
+            "errors": [result for result in results if result["error"]]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000, help="The amount of meshes per synthetic scene.")
+    parser.add_argument("--scenes", default=",".join(SCENES),
+                        help="Comma separated synthetic scenes to run: {0}".format(", ".join(SCENES)))
+    parser.add_argument("--filter", help="Only run the functions whose name contains this text.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="Don't trace the peak memory (tracing slows down the functions).")
+    parser.add_argument("--maya", action="store_true", help="Run in Maya instead of the stand-in scene.")
+    args = parser.parse_args(argv)
+
+    if args.maya:
+        import maya.standalone
+        maya.standalone.initialize()
+
+    results = run(size=args.size, scenes=[x for x in args.scenes.split(",") if x], filter=args.filter,
+                  memory=args.memory, maya=args.maya)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+
+    if results["errors"]:
+        for result in results["errors"]:
+            sys.stderr.write("ERROR {0} {1}: {2}\n".format(result["scene"], result["function"], result["error"]))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,12 @@
 import unittest
+
+try:
+    import maya.standalone
+except ImportError:
+    # Outside of Maya run against the pure-Python stand-in scene
+    from tests import standin
+    standin.install()
+
 import maya.cmds as mc
 import vrayformayaUtils as vfm
 
@@ -31,7 +39,7 @@ class TestMeshAttributes(unittest.TestCase):
             self.assertFalse(mc.objExists("{0}.vraySubdivEnable".format(shape)))
 
         # Apply to transform without smart convert (should not work)
-        vfm.attributes.vray_subdivision(self.mesh, state=True, smartConvert=False)
+        self.assertRaises(RuntimeError, vfm.attributes.vray_subdivision, self.mesh, state=True, smartConvert=False)
         for shape in shapes:
             self.assertFalse(mc.objExists("{0}.vraySubdivEnable".format(shape)))
 
@@ -105,6 +113,42 @@ class TestMeshAttributes(unittest.TestCase):
         for shape in shapes:
             self.assertFalse(mc.objExists("{0}.vrayDisplacementNone".format(shape)))
 
+    def test_plan(self):
+        transform = self.mesh
+        shapes = mc.listRelatives(transform, children=True, shapes=True, fullPath=True)
+
+        # Planning doesn't change the scene
+        plan = vfm.attributes.plan(vfm.attributes.vray_subdivision, transform, vraySubdivEnable=False)
+        self.assertEqual([operation.node for operation in plan], shapes)
+        self.assertEqual([operation.action for operation in plan], ["add"] * len(shapes))
+        for shape in shapes:
+            self.assertFalse(mc.objExists("{0}.vraySubdivEnable".format(shape)))
+
+        result = plan.execute()
+        self.assertEqual(result.changed, shapes)
+        for shape in shapes:
+            self.assertEqual(mc.getAttr("{0}.vraySubdivEnable".format(shape)), False)
+
+        plan = vfm.attributes.plan("vray_subdivision", transform, vraySubdivEnable=False, skipUnchanged=True)
+        self.assertEqual(len(plan), 0)
+        self.assertEqual(plan.skipped, shapes)
+
+        self.assertRaises(TypeError, vfm.attributes.plan, "vray_subdivision", transform, vrayMaxSubdivs=4)
+        # Only the arguments of the function itself are accepted
+        self.assertRaises(TypeError, vfm.attributes.plan, "vray_subdivision", transform, allowTransform=True)
+
+        # The function's own defaults are used: vray_skip_export doesn't convert shapes to transforms by default
+        self.assertRaises(RuntimeError, vfm.attributes.vray_skip_export, shapes)
+        self.assertRaises(RuntimeError, vfm.attributes.plan, "vray_skip_export", shapes)
+        plan = vfm.attributes.plan("vray_skip_export", shapes, smartConvert=True)
+        self.assertEqual([operation.node for operation in plan], mc.ls(transform, long=True))
+
+    def test_positional_arguments(self):
+        # The attribute keywords keep their positions, skipUnchanged comes after them
+        shapes = mc.listRelatives(self.mesh, children=True, shapes=True)
+        vfm.attributes.vray_object_id(shapes, 1, True, True, False, 5)
+        for shape in shapes:
+            self.assertEqual(mc.getAttr("{0}.vrayObjectID".format(shape)), 5)
 
     def tearDown(self):
         mc.delete(self.mesh)
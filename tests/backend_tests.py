@@ -0,0 +1,100 @@
+import unittest
+from tests import standin
+
+standin.install()
+
+import vrayformayaUtils as vfm
+from vrayformayaUtils import backend
+
+
+class FakeBackend(object):
+    """
+        A backend over a fixed hierarchy of long names that records the calls made to it.
+    """
+    def __init__(self, types, selection=()):
+        self.types = types
+        self.selection = list(selection)
+        self.calls = []
+
+    def _matches(self, name, filterType):
+        if filterType is None:
+            return True
+        if isinstance(filterType, str):
+            filterType = (filterType,)
+        return self.types[name] in filterType
+
+    def ls(self, nodes=None, filterType=None):
+        self.calls.append("ls")
+        nodes = self.selection if nodes is None else nodes
+        return [node for node in nodes if node in self.types and self._matches(node, filterType)]
+
+    def shapes(self, nodes=None, allDescendents=True, filterType=None):
+        self.calls.append("shapes")
+        nodes = self.selection if nodes is None else nodes
+        result = []
+        for node in nodes:
+            for path in sorted(self.types):
+                if path != node and not path.startswith(node + "|"):
+                    continue
+                depth = path[len(node):].count("|")
+                if (allDescendents or depth <= 1) and self.types[path] != "transform" and \
+                        self._matches(path, filterType):
+                    result.append(path)
+        return result
+
+    def shortNames(self, nodes):
+        self.calls.append("shortNames")
+        return [node.rsplit("|", 1)[-1] for node in nodes]
+
+
+class TestBackend(unittest.TestCase):
+    """
+        Tests that the node queries go through the selected backend.
+    """
+    def setUp(self):
+        standin.install()
+        self.fake = FakeBackend({"|grp": "transform",
+                                 "|grp|geo": "transform",
+                                 "|grp|geo|geoShape": "mesh",
+                                 "|grp|cam": "transform",
+                                 "|grp|cam|camShape": "camera",
+                                 "|grp|crvShape": "nurbsCurve",
+                                 "file1": "file"},
+                                selection=["|grp|geo"])
+        backend.BACKEND = self.fake
+
+    def tearDown(self):
+        backend.BACKEND = "cmds"
+
+    def test_getShapes(self):
+        self.assertEqual(vfm.utils.getShapes(["|grp"]), ["|grp|cam|camShape", "|grp|crvShape", "|grp|geo|geoShape"])
+        self.assertEqual(vfm.utils.getShapes(["|grp"], allDescendents=False), ["|grp|crvShape"])
+        self.assertEqual(vfm.utils.getShapes(["|grp"], filterType="mesh", fullPath=False), ["geoShape"])
+        self.assertEqual(vfm.utils.getShapes(), ["|grp|geo|geoShape"])
+        self.assertEqual(vfm.utils.getShapes([]), [])
+        self.assertEqual(self.fake.calls, ["shapes", "shapes", "shapes", "shortNames", "shapes"])
+
+    def test_convert_input_shapes(self):
+        convert = vfm.attributes._convert_input_shapes
+        self.assertEqual(convert(["|grp"], filterType=("mesh",)), ["|grp|geo|geoShape"])
+        self.assertEqual(convert(None, filterType=("mesh",)), ["|grp|geo|geoShape"])
+        self.assertEqual(convert(["|grp|geo", "|grp|geo|geoShape"], smartConvert=False, filterType=("mesh",)),
+                         ["|grp|geo|geoShape"])
+        self.assertEqual(convert(["|grp|geo", "|grp|geo|geoShape"], filterType=("mesh",), allowTransform=True),
+                         ["|grp|geo", "|grp|geo|geoShape"])
+
+    def test_nodes_input(self):
+        group = vfm.attributes.ATTRIBUTE_GROUPS["vray_file_gamma"]
+        self.assertEqual(vfm.attributes._convert_input(group, ["file1", "|grp|geo"], smartConvert=False), ["file1"])
+
+    def test_getBackend(self):
+        backend.BACKEND = "cmds"
+        self.assertIsInstance(backend.getBackend(), backend.CmdsBackend)
+        self.assertIs(backend.getBackend(), backend.getBackend())
+
+        backend.BACKEND = "unknown"
+        self.assertRaises(ValueError, backend.getBackend)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+from tests import standin
+
+standin.install()
+
+import maya.cmds as mc
+from vrayformayaUtils import attributes, batch
+
+
+class TestMelConversion(unittest.TestCase):
+    """
+        Tests the conversion of values to MEL arguments and the comparison of current values.
+    """
+    def test_mel_string(self):
+        self.assertEqual(batch._mel_string("a"), '"a"')
+        self.assertEqual(batch._mel_string('a "b"'), '"a \\"b\\""')
+        self.assertEqual(batch._mel_string("c:\\tex\nnext"), '"c:\\\\tex\\nnext"')
+        self.assertEqual(batch.melStringArray(["a", 'b"']), '{"a", "b\\""}')
+
+    def test_mel_set_attr(self):
+        self.assertEqual(batch._mel_set_attr(True), ("", " 1"))
+        self.assertEqual(batch._mel_set_attr(False), ("", " 0"))
+        self.assertEqual(batch._mel_set_attr(4), ("", " 4"))
+        self.assertEqual(batch._mel_set_attr(0.5), ("", " 0.5"))
+        self.assertEqual(batch._mel_set_attr((1, 2.5, 3)), ("", " 1.0 2.5 3.0"))
+        self.assertEqual(batch._mel_set_attr('a "b"'), ('-type "string" ', ' "a \\"b\\""'))
+
+    def test_values_equal(self):
+        # Values as returned by getAttr
+        self.assertTrue(batch._values_equal(True, 1))
+        self.assertTrue(batch._values_equal(0.1 + 0.2, 0.3))
+        self.assertFalse(batch._values_equal(1.0, 1.1))
+        # Single precision values of large or non-representable floats
+        self.assertTrue(batch._values_equal(1000.0999755859375, 1000.1))
+        self.assertTrue(batch._values_equal(123456792.0, 123456789.0))
+        self.assertFalse(batch._values_equal(1000.1, 1000.2))
+        self.assertFalse(batch._values_equal(1e-7, 0.1))
+        self.assertTrue(batch._values_equal([(1.0, 2.0, 3.0)], (1, 2, 3)))
+        self.assertFalse(batch._values_equal([(1.0, 2.0, 3.0)], (1, 2)))
+        self.assertTrue(batch._values_equal(None, ""))
+        self.assertFalse(batch._values_equal("a", "b"))
+
+        # Values as returned by getAttributes
+        self.assertTrue(batch._values_equal("1", True))
+        self.assertTrue(batch._values_equal("0.5", 0.5))
+        self.assertTrue(batch._values_equal("1000.1", 1000.0999755859375))
+        self.assertTrue(batch._values_equal("1 2.5 3", (1.0, 2.5, 3.0)))
+        self.assertFalse(batch._values_equal("1 2.5", (1.0, 2.5, 3.0)))
+        self.assertTrue(batch._values_equal("", ""))
+
+
+class TestBatch(unittest.TestCase):
+    """
+        Tests the batched MEL evaluation against the stand-in scene.
+    """
+    def setUp(self):
+        self.scene = standin.install()
+        self.shapes = [self.scene.createMesh("mesh{0}".format(i)) for i in range(5)]
+        self.scene.calls.clear()
+
+    def test_chunks(self):
+        statements = ['setAttr "{0}.visibility" 0'.format(shape) for shape in self.shapes]
+        for chunkSize, calls in ((1, 5), (2, 3), (4, 2), (5, 1), (6, 1)):
+            self.scene.calls.clear()
+            self.assertEqual(batch.evalStatements(statements, chunkSize=chunkSize), calls)
+            self.assertEqual(self.scene.calls["mel.eval"], calls)
+            self.assertEqual(self.scene.calls["mel:setAttr"], 5)
+
+        self.assertEqual(batch.evalStatements([]), 0)
+
+    def test_addAttributesFromGroup(self):
+        nodes = batch.addAttributesFromGroup(self.shapes + self.shapes[:2], "vray_subdivision", chunkSize=2)
+        self.assertEqual(nodes, self.shapes)
+        self.assertEqual(self.scene.calls["mel.eval"], 3)
+        for shape in self.shapes:
+            self.assertTrue(mc.objExists(shape + ".vraySubdivEnable"))
+
+        batch.addAttributesFromGroup(self.shapes, "vray_subdivision", state=0)
+        self.assertEqual(batch.hasAttribute(self.shapes, "vraySubdivEnable"), set())
+
+    def test_setAttributes(self):
+        batch.addAttributesFromGroup(self.shapes, "vray_displacement")
+        self.scene.calls.clear()
+        batch.setAttributes(self.shapes, [("vrayDisplacementAmount", 2.5),
+                                          ("vrayDisplacementMinValue", (1, 2, 3)),
+                                          ("vrayDisplacementType", None),
+                                          ("vrayDisplacementKeepContinuity", True)])
+        self.assertEqual(self.scene.calls["mel.eval"], 1)
+        self.assertEqual(self.scene.calls["mel:setAttr"], 15)
+        for shape in self.shapes:
+            self.assertEqual(mc.getAttr(shape + ".vrayDisplacementAmount"), 2.5)
+            self.assertEqual(mc.getAttr(shape + ".vrayDisplacementMinValue"), [(1.0, 2.0, 3.0)])
+
+    def test_getAttributes(self):
+        batch.setAttributes(self.shapes[:1], [("name", 'a "b"'), ("amount", 0.5), ("enabled", True),
+                                              ("color", (1.0, 0.5, 0.0))])
+        plugs = [self.shapes[0] + "." + attr for attr in ("name", "amount", "enabled", "color")]
+        values = batch.getAttributes(plugs, chunkSize=3)
+        self.assertEqual(self.scene.calls["mel:vrayformayaUtils_getAttributes"], 2)
+        self.assertEqual(values[0], 'a "b"')
+        for value, expected in zip(values, ('a "b"', 0.5, True, (1.0, 0.5, 0.0))):
+            self.assertTrue(batch._values_equal(value, expected))
+        self.assertEqual(batch.getAttributes([]), [])
+
+    def test_skipUnchanged(self):
+        values = [("vraySubdivEnable", False), ("vraySubdivUVs", None)]
+        result = batch.applyAttributeGroup(self.shapes, "vray_subdivision", values=values, skipUnchanged=True)
+        self.assertEqual(result.changed, self.shapes)
+
+        mc.setAttr(self.shapes[0] + ".vraySubdivEnable", True)
+        plan = batch.planAttributeGroup(self.shapes, "vray_subdivision", values=values, skipUnchanged=True)
+        self.assertEqual([(operation.node, operation.action) for operation in plan], [(self.shapes[0], "set")])
+        self.assertEqual(plan.skipped, self.shapes[1:])
+
+        plan = batch.planAttributeGroup(self.shapes, "vray_subdivision", state=0, values=values, skipUnchanged=True)
+        self.assertEqual([operation.action for operation in plan], ["remove"] * 5)
+
+
+class TestAttributeNames(unittest.TestCase):
+    """
+        Tests that the light attribute functions write their values to the attributes they're named after.
+    """
+    def setUp(self):
+        self.scene = standin.install()
+
+    def test_vrayMBSamples(self):
+        light = self.scene.createNode("pointLight", "pointLightShape1", parent=mc.createNode("transform"))
+        attributes.vray_pointLight(light, vrayMBSamples=4)
+        self.assertEqual(mc.getAttr(light + ".vrayMBSamples"), 4)
+        self.assertEqual(mc.getAttr(light + ".vrayOverrideMBSamples"), False)
+
+    def test_vrayInvisible(self):
+        light = self.scene.createNode("areaLight", "areaLightShape1", parent=mc.createNode("transform"))
+        attributes.vray_arealight(light, vrayInvisible=True)
+        self.assertEqual(mc.getAttr(light + ".vrayInvisible"), True)
+        self.assertFalse(mc.objExists(light + ".vrayStoreWithIrradianceMap"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from tests import standin
+
+standin.install()
+
+import maya.cmds as mc
+import vrayformayaUtils as vfm
+from vrayformayaUtils import sceneIndex
+
+
+class TestRenderElements(unittest.TestCase):
+    """
+        Tests the render element lookups against the stand-in scene.
+    """
+    def setUp(self):
+        self.scene = standin.install()
+        self.scene.plugins["vrayformaya"] = "3.10.01"
+        self.tmpdir = tempfile.mkdtemp()
+        vfm.core.SCHEMA_CACHE_PATH = os.path.join(self.tmpdir, "schemas.json")
+        vfm.core.clearRenderElementSchemas()
+        self.diffuse = self._createRenderElement("diffuseChannel", "diffuse")
+        self.specular = self._createRenderElement("specularChannel", "specular")
+        self.mmA = self._createRenderElement("MultiMatteElement", "mmA")
+        self.mmB = self._createRenderElement("MultiMatteElement", "mmB")
+
+        # Count the getAttr calls to check the class types aren't queried per render element
+        self.getAttrCalls = 0
+        getAttr = mc.getAttr
+
+        def countingGetAttr(*args, **kwargs):
+            self.getAttrCalls += 1
+            return getAttr(*args, **kwargs)
+        mc.getAttr = countingGetAttr
+
+    def tearDown(self):
+        sceneIndex.disable()
+        vfm.core.SCHEMA_CACHE_PATH = None
+        vfm.core.clearRenderElementSchemas()
+        shutil.rmtree(self.tmpdir)
+
+    def _createRenderElement(self, classType, name):
+        node = self.scene.createNode("VRayRenderElement", name)
+        self.scene.nodes[node].attrs.update({"vrayClassType": classType, "enabled": True,
+                                             "vray_name_multimatte": name})
+        if classType == "MultiMatteElement":
+            self.scene.nodes[node].attrs.update({"vray_redid_multimatte": 0, "vray_usematid_multimatte": False})
+        return node
+
+    def test_getRenderElements(self):
+        self.assertEqual(sorted(vfm.getRenderElements()), ["diffuse", "mmA", "mmB", "specular"])
+        self.assertEqual(sorted(vfm.getRenderElements(vrayClassType="MultiMatteElement")), ["mmA", "mmB"])
+        self.assertEqual(sorted(vfm.getRenderElements(vrayClassType=("diffuseChannel", "specularChannel"))),
+                         ["diffuse", "specular"])
+        self.assertEqual(vfm.getRenderElements(["mmB", "diffuse"], vrayClassType="MultiMatteElement"), ["mmB"])
+        self.assertEqual(vfm.getRenderElements(vrayClassType="lightingChannel"), [])
+
+    def test_index(self):
+        index = vfm.buildRenderElementIndex()
+        self.assertEqual(sorted(index), ["MultiMatteElement", "diffuseChannel", "specularChannel"])
+        self.assertEqual(sorted(index["MultiMatteElement"]), ["mmA", "mmB"])
+        self.assertEqual(vfm.buildRenderElementIndex(["diffuse"]), {"diffuseChannel": ["diffuse"]})
+
+    def test_classTypes(self):
+        # Duplicate names keep the class types aligned with the input
+        self.assertEqual(vfm.getRenderElementClassTypes(["mmA", "diffuse", "mmA", "specular"]),
+                         ["MultiMatteElement", "diffuseChannel", "MultiMatteElement", "specularChannel"])
+        self.assertEqual(vfm.getRenderElementClassTypes([]), [])
+
+    def test_cache(self):
+        index = sceneIndex.SceneIndex()
+        self.scene.addListener(index)
+        sceneIndex.enable(index)
+
+        vfm.getRenderElements(vrayClassType="MultiMatteElement")
+        calls = self.getAttrCalls
+        self.assertEqual(sorted(vfm.getRenderElements(vrayClassType="MultiMatteElement")), ["mmA", "mmB"])
+        self.assertEqual(self.getAttrCalls, calls)
+
+        # Modifying the returned index doesn't affect the cache
+        vfm.getRenderElementIndex()["MultiMatteElement"].append("mmC")
+
+        # Created, renamed and deleted render elements invalidate the cache
+        self._createRenderElement("MultiMatteElement", "mmC")
+        self.assertEqual(sorted(vfm.getRenderElements(vrayClassType="MultiMatteElement")), ["mmA", "mmB", "mmC"])
+
+        self.scene.rename("mmC", "mmD")
+        self.assertEqual(sorted(vfm.getRenderElements(vrayClassType="MultiMatteElement")), ["mmA", "mmB", "mmD"])
+
+        self.scene.delete("mmA")
+        self.assertEqual(sorted(vfm.getRenderElements(vrayClassType="MultiMatteElement")), ["mmB", "mmD"])
+
+
+    def test_schema(self):
+        schema = vfm.getRenderElementSchema("MultiMatteElement")
+        self.assertEqual(schema, {"vrayClassType": "string", "vray_name_multimatte": "string",
+                                  "vray_redid_multimatte": "long", "vray_usematid_multimatte": "bool"})
+
+        # The schema is only looked up once per vrayClassType
+        calls = self.getAttrCalls
+        vfm.getRenderElementSchema("MultiMatteElement")
+        self.assertEqual(self.getAttrCalls, calls)
+
+    def test_schema_persisted(self):
+        schema = vfm.getRenderElementSchema("MultiMatteElement")
+        with open(vfm.core.SCHEMA_CACHE_PATH) as f:
+            self.assertEqual(json.load(f), {"3.10.01": {"MultiMatteElement": schema}})
+
+        # A new session reads the schema from the file
+        vfm.core.clearRenderElementSchemas()
+        self.scene.delete("mmA")
+        self.scene.delete("mmB")
+        calls = self.getAttrCalls
+        self.assertEqual(vfm.getRenderElementSchema("MultiMatteElement"), schema)
+        self.assertEqual(self.getAttrCalls, calls)
+
+        # Schemas are keyed by the V-Ray version
+        self.scene.plugins["vrayformaya"] = "3.40.02"
+        vfm.core.clearRenderElementSchemas()
+        vfm.getRenderElementSchema("diffuseChannel")
+        with open(vfm.core.SCHEMA_CACHE_PATH) as f:
+            self.assertEqual(sorted(json.load(f)), ["3.10.01", "3.40.02"])
+
+        vfm.core.clearRenderElementSchemas(persisted=True)
+        with open(vfm.core.SCHEMA_CACHE_PATH) as f:
+            self.assertEqual(json.load(f)["3.40.02"], {})
+
+    def test_addRenderElements(self):
+        self.scene.calls.clear()
+        nodes = vfm.addRenderElements([{"vrayClassType": "MultiMatteElement", "name": "mm#",
+                                        "vray_redid_multimatte": x} for x in range(3)] +
+                                      [{"vrayClassType": "diffuseChannel", "enabled": False, "suffix": 1}])
+        self.assertEqual(nodes, ["mm1", "mm2", "mm3", "vrayRE_diffuseChannel1"])
+        self.assertEqual([mc.getAttr(node + ".vray_redid_multimatte") for node in nodes[:3]], [0, 1, 2])
+        self.assertEqual(mc.getAttr("vrayRE_diffuseChannel1.enabled"), 0)
+        self.assertEqual(mc.getAttr("vrayRE_diffuseChannel1.vray_name_multimatte"), "1")
+
+        # A single evaluation creates all render elements and another one sets all attributes
+        self.assertEqual(self.scene.calls["mel.eval"], 3)
+        self.assertEqual(self.scene.calls["mel:vrayformayaUtils_addRenderElements"], 1)
+
+    def test_addRenderElements_validation(self):
+        nodes = set(self.scene.nodes)
+        self.assertRaises(RuntimeError, vfm.addRenderElements, [{"vrayClassType": "MultiMatteElement",
+                                                                 "vray_redid_multimatte": 1},
+                                                                {"vrayClassType": "MultiMatteElement",
+                                                                 "vray_greenid_multimatte": 2}])
+        self.assertRaises(RuntimeError, vfm.addRenderElements, [{"vrayClassType": "MultiMatteElement",
+                                                                 "vray_redid_multimatte": "1"}])
+        self.assertRaises(TypeError, vfm.addRenderElements, [{"vrayClassType": "diffuseChannel", "color": 1}])
+        self.assertRaises(TypeError, vfm.addRenderElements, [{"name": "diffuse2"}])
+
+        # Nothing is created when the validation fails
+        self.assertEqual(set(self.scene.nodes), nodes)
+        self.assertEqual(vfm.addRenderElements([]), [])
+
+    def test_addRenderElements_undo(self):
+        # Record the open undo chunks when the temporary render element of the schema discovery is deleted
+        depths = []
+        delete = self.scene.delete
+
+        def recordingDelete(*args, **kwargs):
+            depths.append(self.scene.openChunks)
+            return delete(*args, **kwargs)
+        self.scene.delete = recordingDelete
+
+        nodes = set(self.scene.nodes)
+        self.assertRaises(RuntimeError, vfm.addRenderElements, [{"vrayClassType": "velocityChannel",
+                                                                 "vrayDoesNotExist": 1}])
+        self.assertEqual(set(self.scene.nodes), nodes)
+        self.assertEqual(len(depths), 1)
+        self.assertTrue(depths[0] >= 1)
+
+        # The schema discovery and the creation are a single undo step
+        del self.scene.undoChunks[:]
+        vfm.core.clearRenderElementSchemas(persisted=True)
+        vfm.addRenderElements([{"vrayClassType": "velocityChannel"}])
+        self.assertEqual(len(depths), 2)
+        self.assertTrue(depths[-1] >= 2)
+        self.assertEqual(self.scene.undoChunks.count(0), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
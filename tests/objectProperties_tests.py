@@ -0,0 +1,78 @@
+import unittest
+from tests import standin
+
+standin.install()
+
+import maya.cmds as mc
+import vrayformayaUtils as vfm
+from vrayformayaUtils.objectProperties import objectProperties, addObjectProperties
+
+
+class TestObjectProperties(unittest.TestCase):
+    """
+        Tests creating objectProperties nodes with and without changing the selection against the stand-in scene.
+    """
+    def setUp(self):
+        self.scene = standin.install()
+        self.meshes = [self.scene.createMesh("mesh{0}".format(i)) for i in range(3)]
+        self.transforms = ["mesh0", "mesh1", "mesh2"]
+        self.scene.selection = ["mesh2"]
+
+    def _members(self, node):
+        return sorted(mc.sets(node, q=True) or [])
+
+    def test_add_single(self):
+        nodes = objectProperties("add_single", nodes=self.transforms, useSelection=False)
+        self.assertEqual(len(nodes), 1)
+        self.assertEqual(mc.nodeType(nodes[0]), "VRayObjectProperties")
+        self.assertEqual(self._members(nodes[0]), self.transforms)
+        self.assertEqual(vfm.utils.getConnectedSets(["mesh0"], type="VRayObjectProperties"), nodes)
+
+        # The selection is never changed
+        self.assertEqual(self.scene.selection, ["mesh2"])
+        self.assertEqual(self.scene.selectionChanges, 0)
+
+    def test_add_multiple(self):
+        nodes = objectProperties("add_multiple", type="VRayDisplacement", nodes=self.transforms, name="disp",
+                                 useSelection=False)
+        self.assertEqual(nodes, ["disp", "disp1", "disp2"])
+        for node, transform in zip(nodes, self.transforms):
+            self.assertEqual(mc.nodeType(node), "VRayDisplacement")
+            self.assertEqual(self._members(node), [transform])
+        self.assertEqual(self.scene.selectionChanges, 0)
+
+    def test_selection(self):
+        nodes = objectProperties("add_single", useSelection=False)
+        self.assertEqual(self._members(nodes[0]), ["mesh2"])
+
+        self.scene.selection = []
+        self.assertEqual(objectProperties("add_single", useSelection=False), [])
+        self.assertEqual(objectProperties("add_single", nodes=["doesNotExist"], useSelection=False), [])
+
+    def test_default_uses_selection(self):
+        # The vray command is used by default, the direct path is opt-in
+        self.scene.calls.clear()
+        nodes = objectProperties("add_single", nodes=self.transforms)
+        self.assertEqual(self.scene.calls["vray"], 1)
+        self.assertEqual(self._members(nodes[0]), self.transforms)
+        self.assertEqual(mc.ls(sl=True), ["mesh2"])
+
+
+    def test_addObjectProperties(self):
+        existing = objectProperties("add_single", nodes=["mesh0"], name="propsA", useSelection=False)
+        self.scene.createNode("transform", "propsB")
+
+        result = addObjectProperties({"propsA": ["mesh1"], "propsB": ["mesh0", "mesh2"], "propsC": []})
+        self.assertEqual(sorted(result.items()), [("propsA", "propsA"), ("propsB", "propsB1"), ("propsC", "propsC")])
+        self.assertEqual(result["propsA"], existing[0])
+        self.assertEqual(self._members("propsA"), ["mesh0", "mesh1"])
+        self.assertEqual(self._members("propsB1"), ["mesh0", "mesh2"])
+        self.assertEqual(self._members("propsC"), [])
+        self.assertEqual(self.scene.selectionChanges, 0)
+
+        addObjectProperties({"propsA": ["mesh2"]}, replace=True)
+        self.assertEqual(self._members("propsA"), ["mesh2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from tests import standin
+
+standin.install()
+
+import vrayformayaUtils as vfm
+
+#: The maximum time in seconds importing the package may take (outside of Maya, against the stand-in scene).
+IMPORT_TIME_BUDGET = 0.05
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imports the package in a fresh interpreter and reports the import time (best of a few runs) and loaded submodules
+_IMPORT_SCRIPT = """
+import json, sys, time
+from tests import standin
+standin.install()
+
+times = []
+for _ in range(5):
+    for name in [name for name in sys.modules if name.startswith("vrayformayaUtils")]:
+        del sys.modules[name]
+    start = time.time()
+    import vrayformayaUtils
+    times.append(time.time() - start)
+
+# Python 2 leaves None placeholders of the implicit relative imports in sys.modules, those aren't loaded modules
+print(json.dumps({"seconds": min(times),
+                  "modules": sorted(name for name, module in sys.modules.items()
+                                    if name.startswith("vrayformayaUtils.") and module is not None)}))
+"""
+
+
+def _measureImport():
+    output = subprocess.check_output([sys.executable, "-c", _IMPORT_SCRIPT], cwd=ROOT)
+    return json.loads(output.decode("utf-8"))
+
+
+class TestPackageImport(unittest.TestCase):
+    def test_import_budget(self):
+        result = _measureImport()
+        self.assertEqual(result["modules"], [])
+        self.assertLess(result["seconds"], IMPORT_TIME_BUDGET)
+
+    def test_lazy_attributes(self):
+        self.assertIs(vfm.attributes, sys.modules["vrayformayaUtils.attributes"])
+        self.assertIs(vfm.objectProperties, sys.modules["vrayformayaUtils.objectProperties"])
+        self.assertIs(vfm.utils, sys.modules["vrayformayaUtils.utils"])
+
+        # The core functions are available directly on the package
+        from vrayformayaUtils import core
+        self.assertIs(vfm.addRenderElement, core.addRenderElement)
+        self.assertIn("getRenderElements", dir(vfm))
+
+        from vrayformayaUtils.profiling import profile
+        self.assertIs(vfm.profile, profile)
+
+        self.assertRaises(AttributeError, getattr, vfm, "doesNotExist")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+from tests import standin
+
+standin.install()
+
+import maya.cmds as mc
+import vrayformayaUtils as vfm
+from vrayformayaUtils import attributes, utils
+
+
+class TestProfile(unittest.TestCase):
+    def setUp(self):
+        self.scene = standin.install()
+        self.mesh = mc.polyCube()[0]
+
+    def test_profile(self):
+        original = attributes.getShapes
+        with vfm.profile() as stats:
+            vfm.attributes.vray_subdivision(self.mesh, state=1, vraySubdivEnable=True)
+
+        # The package is restored after the profile
+        self.assertIs(attributes.getShapes, original)
+        self.assertIs(attributes.mc, mc)
+
+        self.assertEqual(stats.functions["attributes.vray_subdivision"][0], 1)
+        self.assertEqual(stats.functions["utils.getShapes"][0], 1)
+        # The attributes are added with batched MEL statements, attributed to the innermost public function
+        self.assertEqual(stats.commands["mel.eval"][0], 1)
+        self.assertIn("mel.eval", stats.commandsByFunction["batch.evalStatements"])
+        # The batched statements are recorded per command
+        self.assertEqual(stats.statements["vray addAttributesFromGroup"][0], 1)
+        self.assertEqual(stats.statements["setAttr"][0], 1)
+        self.assertEqual(stats.commandCount, sum(count for count, seconds in stats.commands.values()))
+        self.assertGreater(stats.commandCount, 0)
+
+        # The function time includes the time of the functions it calls
+        self.assertGreaterEqual(stats.functions["attributes.vray_subdivision"][1],
+                                stats.functions["utils.getShapes"][1])
+
+        stream = StringIO()
+        stats.dump(stream, sortBy="count")
+        self.assertIn("attributes.vray_subdivision", stream.getvalue())
+        self.assertRaises(ValueError, stats.report, sortBy="unknown")
+
+    def test_vray_subcommands(self):
+        with vfm.profile() as stats:
+            vfm.objectProperties.objectProperties("add_single", nodes=[self.mesh], useSelection=True)
+        self.assertEqual(stats.commands["vray objectProperties"][0], 1)
+        self.assertNotIn("vray", stats.commands)
+        self.assertIn("vray objectProperties", stats.report())
+
+    def test_not_instrumented(self):
+        with vfm.profile() as stats:
+            pass
+        mc.ls()
+        utils.getShapes(self.mesh)
+        self.assertEqual(stats.commandCount, 0)
+        self.assertEqual(stats.functions, {})
+
+    def test_single_profile(self):
+        with vfm.profile():
+            self.assertRaises(RuntimeError, vfm.profile().__enter__)
+
+    def test_restore_on_error(self):
+        original = attributes.vray_subdivision
+        try:
+            with vfm.profile():
+                raise ValueError()
+        except ValueError:
+            pass
+        self.assertIs(attributes.vray_subdivision, original)
+        with vfm.profile():
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
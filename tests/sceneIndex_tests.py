@@ -0,0 +1,100 @@
+import unittest
+from tests import standin
+
+scene = standin.install()
+
+import maya.cmds as mc
+import vrayformayaUtils as vfm
+from vrayformayaUtils import sceneIndex
+
+
+class TestSceneIndex(unittest.TestCase):
+    """
+        Tests the scene index against the pure-Python stand-in scene.
+    """
+    def setUp(self):
+        self.scene = standin.install()
+        self.group = self.scene.createNode("transform", "grp")
+        self.meshA = self.scene.createMesh("meshA", parent=self.group)
+        self.meshB = self.scene.createMesh("meshB", parent=self.group)
+        self.camera = self.scene.createNode("camera", "cameraShape1",
+                                            parent=self.scene.createNode("transform", "camera1"))
+        self.material = self.scene.createNode("VRayMtl", "mtlA")
+        self.scene.assign([self.meshA], self.material)
+
+        self.index = sceneIndex.SceneIndex()
+        self.scene.addListener(self.index)
+        sceneIndex.enable(self.index)
+
+        # Count the ls calls to check whether the index is reused
+        self.lsCalls = 0
+        ls = mc.ls
+
+        def countingLs(*args, **kwargs):
+            self.lsCalls += 1
+            return ls(*args, **kwargs)
+        mc.ls = countingLs
+
+    def tearDown(self):
+        sceneIndex.disable()
+
+    def test_getShapes(self):
+        self.assertEqual(vfm.utils.getShapes([self.group]), [self.meshA, self.meshB])
+        self.assertEqual(vfm.utils.getShapes([self.group], filterType="camera"), [])
+        self.assertEqual(vfm.utils.getShapes(["camera1"], filterType="camera"), [self.camera])
+        self.assertEqual(vfm.utils.getShapes(["|grp|meshA"], allDescendents=False), [self.meshA])
+        self.assertEqual(vfm.utils.getShapes([]), [])
+
+    def test_getShapes_selection(self):
+        self.scene.selection = ["meshB"]
+        self.assertEqual(vfm.utils.getShapes(), [self.meshB])
+
+    def test_reuse(self):
+        vfm.utils.getShapes([self.group])
+        calls = self.lsCalls
+        vfm.utils.getShapes([self.group])
+
+        # Only the input conversion may query the scene the second time
+        self.assertEqual(self.lsCalls - calls, 1)
+
+    def test_invalidate_hierarchy(self):
+        vfm.utils.getShapes([self.group])
+        meshC = self.scene.createMesh("meshC", parent=self.group)
+        self.assertEqual(vfm.utils.getShapes([self.group]), [self.meshA, self.meshB, meshC])
+
+        self.scene.parent("meshA", None)
+        self.assertEqual(vfm.utils.getShapes([self.group]), [self.meshB, meshC])
+
+        self.scene.delete("meshB")
+        self.assertEqual(vfm.utils.getShapes([self.group]), [meshC])
+
+    def test_instances(self):
+        other = self.scene.createNode("transform", "other")
+        self.scene.parent("meshA", other, add=True)
+        self.assertEqual(vfm.utils.getShapes([other]), ["|other|meshA|meshAShape"])
+
+    def test_getMaterials(self):
+        self.assertEqual(vfm.utils.getMaterials([self.meshA]), [self.material])
+        self.assertEqual(vfm.utils.getMaterials(["meshA"]), [self.material])
+        self.assertEqual(vfm.utils.getMaterials([self.meshB]), [])
+        self.assertEqual(vfm.utils.getMaterials([self.material]), [self.material])
+
+    def test_invalidate_materials(self):
+        self.assertEqual(vfm.utils.getMaterials([self.meshB]), [])
+
+        other = self.scene.createNode("VRayMtl", "mtlB")
+        self.scene.assign([self.meshB], other)
+        self.assertEqual(vfm.utils.getMaterials([self.meshB]), [other])
+
+        self.scene.assign([self.meshA], other)
+        self.assertEqual(vfm.utils.getMaterials([self.meshA]), [other])
+
+        # Swap the surface shader of the existing shadingEngine
+        engine = self.scene.assign([], other)
+        self.scene.disconnect("mtlB.outColor", engine + ".surfaceShader")
+        self.scene.connect("mtlA.outColor", engine + ".surfaceShader")
+        self.assertEqual(vfm.utils.getMaterials([self.meshA, self.meshB]), [self.material])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,1011 @@
+"""
+    A pure-Python stand-in scene for testing vrayformayaUtils outside of Maya.
+
+    The stand-in models just enough of a Maya scene (DAG hierarchy with instancing, node types, connections and
+    shadingEngine membership) to run the package's scene queries against it. Use `install` to register it as the
+    ``maya.cmds`` module before importing vrayformayaUtils:
+
+        from tests import standin
+        scene = standin.install()
+        import vrayformayaUtils as vfm
+
+    Changes made through the scene's editing methods are reported to listeners (e.g. a
+    ``vrayformayaUtils.sceneIndex.SceneIndex``) the same way Maya's message callbacks would.
+
+    The ``vray`` command (addAttributesFromGroup, objectProperties) and the MEL statements generated by
+    vrayformayaUtils (``mel.eval``) are evaluated against the scene as well. Every command call is counted in
+    ``scene.calls`` (MEL statements as "mel:<command>"), so command-count regressions can be tested without Maya:
+
+        scene.calls.clear()
+        vfm.attributes.vray_subdivision(nodes)
+        assert scene.calls["mel.eval"] == 1
+
+    The subset of ``maya.api.OpenMaya`` used to read plug values (``MSelectionList``, ``MFnDependencyNode`` and
+    ``MPlug``) is registered as well, plug reads are counted as "OpenMaya:findPlug".
+"""
+import collections
+import fnmatch
+import os
+import re
+import sys
+import tempfile
+import types
+import uuid
+
+#: Node types that are considered shapes (DAG leaves that can't have children).
+SHAPE_TYPES = set(["mesh", "nurbsSurface", "nurbsCurve", "camera", "ambientLight", "directionalLight",
+                   "pointLight", "spotLight", "areaLight", "VRayLightDomeShape", "VRayLightRectShape",
+                   "VRayLightSphereShape", "imagePlane"])
+
+#: Node types that are considered materials (as in ``mc.ls(mat=True)``).
+MATERIAL_TYPES = set(["lambert", "blinn", "phong", "surfaceShader", "VRayMtl", "VRayBlendMtl", "VRayFastSSS2"])
+
+#: Abstract node types and the types that derive from them.
+DERIVED_TYPES = {"shape": SHAPE_TYPES,
+                 "surfaceShape": set(["mesh", "nurbsSurface"]),
+                 "light": set(["ambientLight", "directionalLight", "pointLight", "spotLight", "areaLight"]),
+                 "dagNode": SHAPE_TYPES | set(["transform"])}
+
+#: The classifications (as in ``mc.getClassification``) of the shading node types, other types have none.
+CLASSIFICATIONS = dict([(type, "shader/surface") for type in MATERIAL_TYPES] +
+                       [(type, "texture/2d") for type in ("file", "substance", "layeredTexture", "ramp", "checker")] +
+                       [("VRayPtex", "texture/2d:rendernode/vray/texture")] +
+                       [(type, "utility/general") for type in ("place2dTexture", "multiplyDivide", "bump2d")])
+
+
+#: The attribute types (as returned by ``getAttr(type=True)``) of the Python value types.
+ATTRIBUTE_TYPES = {str: "string", bool: "bool", int: "long", float: "double"}
+
+
+#: The extra attributes (and their default values) of render elements per vrayClassType.
+RENDER_ELEMENT_ATTRIBUTES = {"MultiMatteElement": {"vray_redid_multimatte": 0, "vray_greenid_multimatte": 0,
+                                                   "vray_blueid_multimatte": 0, "vray_usematid_multimatte": False}}
+
+#: The attributes (and their default values) that nodes of a type have when they're created.
+NODE_ATTRIBUTES = {"file": {"fileTextureName": "", "fileTextureNamePattern": "", "uvTilingMode": 0},
+                   "substance": {"package": ""},
+                   "VRayPtex": {"ptexFile": ""}}
+
+#: The attributes (and their default values) that ``vray addAttributesFromGroup`` adds per v-ray attribute group.
+#: Groups without attributes of their own get an attribute named after the group to detect their presence.
+ATTRIBUTE_GROUPS = {
+    "vray_2d_placement_options": [("vrayUVSetName", "")],
+    "vray_arealight": [("vrayPhotonSubdivs", 0), ("vrayDiffuseMult", 0.0), ("vrayCausticSubdivs", 0),
+                       ("vrayCausticMult", 0.0), ("vrayShadowBias", 0.0), ("vrayCutoffThreshold", 0.0),
+                       ("vrayDiffuseContrib", 0.0), ("vraySpecularContrib", 0.0), ("vrayInvisible", False),
+                       ("vrayOverrideMBSamples", False), ("vrayMBSamples", 0)],
+    "vray_cameraDome": [("vrayCameraDomeOn", False), ("vrayCameraDomeFlipX", False), ("vrayCameraDomeFlipY", False),
+                        ("vrayCameraDomeFov", 0.0)],
+    "vray_cameraOverrides": [("vrayCameraOverridesOn", False), ("vrayCameraType", 0), ("vrayCameraOverrideFOV", False),
+                             ("vrayCameraFOV", 0.0), ("vrayCameraHeight", 0.0), ("vrayCameraAutoFit", False),
+                             ("vrayCameraDist", 0.0), ("vrayCameraCurve", 0.0)],
+    "vray_cameraPhysical": [("vray_cameraPhysical", True)],
+    "vray_closed_volume": [("vrayClosedVolume", False)],
+    "vray_directlight": [("vrayPhotonSubdivs", 0), ("vrayDiffuseMult", 0.0), ("vrayCausticSubdivs", 0),
+                         ("vrayCausticMult", 0.0), ("vrayShadowBias", 0.0), ("vrayDiffuseContrib", 0.0),
+                         ("vraySpecularContrib", 0.0), ("vrayStoreWithIrradianceMap", False),
+                         ("vrayOverrideMBSamples", False), ("vrayMBSamples", 0)],
+    "vray_displacement": [("vrayDisplacementNone", False), ("vrayDisplacementStatic", False),
+                          ("vrayDisplacementType", 0), ("vrayDisplacementAmount", 0.0), ("vrayDisplacementShift", 0.0),
+                          ("vrayDisplacementKeepContinuity", False), ("vrayEnableWaterLevel", False),
+                          ("vrayWaterLevel", 0.0), ("vray2dDisplacementResolution", 0),
+                          ("vray2dDisplacementPrecision", 0), ("vray2dDisplacementTightBounds", False),
+                          ("vray2dDisplacementFilterTexture", False), ("vray2dDisplacementFilterBlur", 0.0),
+                          ("vrayDisplacementUseBounds", 0), ("vrayDisplacementMinValue", (0.0, 0.0, 0.0)),
+                          ("vrayDisplacementMaxValue", (0.0, 0.0, 0.0))],
+    "vray_file_allow_neg_colors": [("vrayFileAllowNegColors", False)],
+    "vray_file_gamma": [("vrayFileGammaEnable", False), ("vrayFileColorSpace", 0), ("vrayFileGammaValue", 0.0)],
+    "vray_file_ifl": [("vrayFileIFLStartFrame", 0), ("vrayFileIFLEndCondition", 0), ("vrayFileIFLPlaybackRate", 0.0)],
+    "vray_fogFadeOut": [("vrayFogFadeOut", 0.0)],
+    "vray_light": [("vrayPhotonSubdivs", 0), ("vrayDiffuseMult", 0.0), ("vrayCausticSubdivs", 0),
+                   ("vrayCausticMult", 0.0), ("vrayShadowBias", 0.0), ("vrayCutoffThreshold", 0.0),
+                   ("vrayOverrideMBSamples", False), ("vrayMBSamples", 0)],
+    "vray_material_id": [("vrayMaterialId", 0)],
+    "vray_nurbscurve_renderable": [("vrayNurbsCurveRenderable", False), ("vrayNurbsCurveMaterial", 0),
+                                   ("vrayNurbsCurveTesselation", 0), ("vrayNurbsCurveStartWidth", 0.0),
+                                   ("vrayNurbsCurveLockEndWidth", False), ("vrayNurbsCurveEndWidth", 0.0)],
+    "vray_nusrbsStaticGeom": [("vrayAsStaticGeom", False), ("vrayMaxSubdivDepth", 0), ("vrayFlatnessCoef", 0.0)],
+    "vray_objectID": [("vrayObjectID", 0)],
+    "vray_phoenix_object": [("vrayPhoenixObjVoxels", 0)],
+    "vray_pointLight": [("vrayPhotonSubdivs", 0), ("vrayDiffuseMult", 0.0), ("vrayCausticSubdivs", 0),
+                        ("vrayCausticMult", 0.0), ("vrayShadowBias", 0.0), ("vrayCutoffThreshold", 0.0),
+                        ("vrayDiffuseContrib", 0.0), ("vraySpecularContrib", 0.0),
+                        ("vrayStoreWithIrradianceMap", False), ("vrayOverrideMBSamples", False), ("vrayMBSamples", 0)],
+    "vray_roundedges": [("vrayRoundEdges", False), ("vrayRoundEdgesRadius", 0.0)],
+    "vray_samplerinfo_extra_tex": [("vrayNormalObj", 0), ("vrayNormalWorld", 0), ("vrayGNormalWorld", 0),
+                                   ("vrayPointWorldReferenceX", 0), ("vrayNormalWorldReferenceX", 0),
+                                   ("vrayRayDepth", 0), ("vrayPathLength", 0)],
+    "vray_skip_export": [("vraySkipExport", False)],
+    "vray_specific_mtl": [("vray_specific_mtl", True)],
+    "vray_subdivision": [("vraySubdivEnable", False), ("vraySubdivUVs", False), ("vrayPreserveMapBorders", 0),
+                         ("vrayStaticSubdiv", False), ("vrayClassicalCatmark", False)],
+    "vray_subquality": [("vrayOverrideGlobalSubQual", False), ("vrayViewDep", False), ("vrayEdgeLength", 0.0),
+                        ("vrayMaxSubdivs", 0)],
+    "vray_texture_filter": [("vrayOverrideTextureFilter", False), ("vrayTextureFilter", 0),
+                            ("vrayTextureSmoothType", 0)],
+    "vray_user_attributes": [("vrayUserAttributes", "")],
+}
+
+
+def attributeGroups():
+    """ Return the v-ray attribute groups by name as (attribute, default value) pairs """
+    return ATTRIBUTE_GROUPS
+
+
+class Node(object):
+    """ A node in the stand-in scene """
+    def __init__(self, name, type):
+        self.name = name
+        self.type = type
+        self.parents = []
+        self.children = []
+        self.attrs = {}
+        self.connections = []   # (source plug, destination plug) of the connections to and from this node
+        self.uuid = str(uuid.uuid4()).upper()
+
+    @property
+    def dag(self):
+        return self.type == "transform" or self.type in SHAPE_TYPES
+
+    @property
+    def shape(self):
+        return self.type in SHAPE_TYPES
+
+
+class Scene(object):
+    """ An in-memory scene.
+
+    Node names are unique in the whole scene (unlike Maya where they only need to be unique per parent), which keeps
+    name resolution simple while still allowing DAG paths and instancing.
+    """
+    def __init__(self):
+        self.nodes = {}
+        self.selection = []
+        self.listeners = []
+        self._nameIndices = {}
+
+        self.undoEnabled = True
+        self.undoChunks = []     # the closed undo chunks (open depth at the time they were opened)
+        self.openChunks = 0
+        self.refreshSuspended = False
+
+        self.selectionChanges = 0
+        self.calls = collections.Counter()  # command name -> amount of calls (MEL statements as "mel:<command>")
+
+        self.plugins = {}        # loaded plug-in name -> version
+        self.userAppDir = os.path.join(tempfile.gettempdir(), "standin_maya") + os.sep
+        self.workspaceRoot = os.getcwd() + os.sep
+
+    # Listeners
+
+    def addListener(self, listener):
+        self.listeners.append(listener)
+
+    def removeListener(self, listener):
+        self.listeners.remove(listener)
+
+    def _emit(self, event, *args):
+        for listener in list(self.listeners):
+            getattr(listener, event)(*args)
+
+    @property
+    def connections(self):
+        """ All (source plug, destination plug) connections in the scene """
+        result = []
+        for node in self.nodes.values():
+            result.extend(c for c in node.connections if self.resolve(c[0]) is node)
+        return result
+
+    # Paths
+
+    def paths(self, node):
+        """ Return all DAG paths to the node """
+        if not node.dag:
+            return [node.name]
+        if not node.parents:
+            return ["|" + node.name]
+        return [path + "|" + node.name for parent in node.parents for path in self.paths(parent)]
+
+    def resolve(self, name):
+        """ Return the node for a name, long DAG path or plug (None if it doesn't exist) """
+        name = name.split(".", 1)[0]
+        if name.startswith("|"):
+            node = self.nodes.get(name.rsplit("|", 1)[-1])
+            if node is not None and name in self.paths(node):
+                return node
+            return None
+        return self.nodes.get(name)
+
+    # Editing
+
+    def createNode(self, type, name=None, parent=None):
+        if name is None:
+            name = self.uniqueName(type + "#")
+        if name in self.nodes:
+            raise RuntimeError("Node already exists: {0}".format(name))
+
+        node = Node(name, type)
+        node.attrs.update(NODE_ATTRIBUTES.get(type, {}))
+        self.nodes[name] = node
+        self._emit("nodeAdded", name, type, node.dag)
+        if parent is not None:
+            self.parent(name, parent)
+        return self.paths(node)[0]
+
+    def createMesh(self, name, parent=None):
+        """ Create a transform with a mesh shape below it, returns the long name of the shape """
+        transform = self.createNode("transform", name, parent=parent)
+        return self.createNode("mesh", name + "Shape", parent=transform)
+
+    def parent(self, child, parent, add=False):
+        """ Parent child to parent. With add=True the child is instanced under parent instead """
+        child = self.resolve(child)
+        parent = self.resolve(parent) if parent is not None else None
+        if not add:
+            for old in child.parents:
+                old.children.remove(child)
+            child.parents = []
+        if parent is not None:
+            child.parents.append(parent)
+            parent.children.append(child)
+        self._emit("parentChanged", child.name)
+
+    def delete(self, name):
+        node = self.resolve(name)
+        for child in list(node.children):
+            if len(child.parents) == 1:
+                self.delete(child.name)
+            else:
+                child.parents.remove(node)
+        for parent in node.parents:
+            parent.children.remove(node)
+        for src, dst in list(node.connections):
+            self.disconnect(src, dst)
+        del self.nodes[node.name]
+        self._emit("nodeRemoved", node.name, node.type, node.dag)
+
+    def rename(self, name, newName):
+        node = self.resolve(name)
+        del self.nodes[node.name]
+        node.name = newName
+        self.nodes[newName] = node
+        for connection in list(node.connections):
+            renamed = (self._renamed(connection[0], name, newName), self._renamed(connection[1], name, newName))
+            for endpoint in set([self.resolve(renamed[0]), self.resolve(renamed[1])]):
+                endpoint.connections[endpoint.connections.index(connection)] = renamed
+        self._emit("nodeRenamed", newName, name, node.type, node.dag)
+        return self.paths(node)[0]
+
+    def _renamed(self, plug, name, newName):
+        node, attr = plug.split(".", 1)
+        if node.rsplit("|", 1)[-1] == name.rsplit("|", 1)[-1]:
+            return newName + "." + attr
+        return plug
+
+    def connect(self, src, dst):
+        for endpoint in set([self.resolve(src), self.resolve(dst)]):
+            endpoint.connections.append((src, dst))
+        self._emit("connectionChanged", src, dst, True)
+
+    def disconnect(self, src, dst):
+        for endpoint in set([self.resolve(src), self.resolve(dst)]):
+            endpoint.connections.remove((src, dst))
+        self._emit("connectionChanged", src, dst, False)
+
+    def clear(self):
+        """ Remove all nodes and connections (like a new scene) """
+        self.nodes = {}
+        self.selection = []
+        self._nameIndices = {}
+        for listener in list(self.listeners):
+            listener.invalidate()
+
+    def addAttributesFromGroup(self, name, group, state):
+        node = self.resolve(name)
+        if node is None:
+            raise RuntimeError("No object matches name: {0}".format(name))
+        attributes = attributeGroups().get(group)
+        if attributes is None:
+            raise RuntimeError("Unknown attribute group: {0}".format(group))
+        for attr, value in attributes:
+            if state:
+                node.attrs.setdefault(attr, value)
+            else:
+                node.attrs.pop(attr, None)
+
+    def objectProperties(self, cmd, type):
+        """ Apply the objectProperties cmd to the selection """
+        members = [self.resolve(name).name for name in self.selection]
+        if cmd == "add_single":
+            node = self.createNode(type, self.uniqueName(type + "#"))
+            for member in members:
+                self.addMember(node, member)
+        elif cmd == "add_multiple":
+            for member in members:
+                node = self.createNode(type, self.uniqueName(type + "#"))
+                self.addMember(node, member)
+        elif cmd in ("remove", "remove_sub"):
+            for setNode in [n for n in self.nodes.values() if n.type == type]:
+                for member in members:
+                    self.removeMember(setNode.name, member)
+        else:
+            raise RuntimeError("Unknown objectProperties cmd: {0}".format(cmd))
+
+    def addRenderElement(self, classType):
+        name = self.createNode("VRayRenderElement", self.uniqueName("vrayRE_" + classType + "#"))
+        node = self.nodes[name]
+        node.attrs.update({"vrayClassType": classType, "enabled": True, "vray_name_multimatte": ""})
+        node.attrs.update(RENDER_ELEMENT_ATTRIBUTES.get(classType, {}))
+        return name
+
+    def uniqueName(self, name):
+        """ Return name with a trailing number (replacing a trailing '#') when it already exists, like Maya """
+        if name.endswith("#"):
+            name = name[:-1]
+        elif name not in self.nodes:
+            return name
+
+        # Continue from the last number given to base, so creating many nodes doesn't get quadratic
+        base = name.rstrip("0123456789")
+        index = self._nameIndices.get(base, 1)
+        while "{0}{1}".format(base, index) in self.nodes:
+            index += 1
+        self._nameIndices[base] = index
+        return "{0}{1}".format(base, index)
+
+    def addMember(self, setName, member):
+        """ Add the member to the set (no-op if it is already a member) """
+        node = self.resolve(member)
+        setNode = self.resolve(setName)
+        plugs = set()
+        for src, dst in setNode.connections:
+            if ".dagSetMembers" in dst:
+                plugs.update((src, dst))
+        plug = node.name + (".instObjGroups[0]" if node.dag else ".message")
+        if plug in plugs:
+            return
+        index = len(plugs) // 2
+        while "{0}.dagSetMembers[{1}]".format(setNode.name, index) in plugs:
+            index += 1
+        self.connect(plug, "{0}.dagSetMembers[{1}]".format(setNode.name, index))
+
+    def removeMember(self, setName, member):
+        """ Remove the member from the set """
+        node = self.resolve(member)
+        setNode = self.resolve(setName)
+        for src, dst in list(node.connections):
+            if self.resolve(dst) is setNode and ".dagSetMembers" in dst:
+                self.disconnect(src, dst)
+
+    def assign(self, shapes, material):
+        """ Assign the material to the shapes, creating its shadingEngine if needed. Returns the shadingEngine """
+        engines = [dst.split(".")[0] for src, dst in self.resolve(material).connections
+                   if src == material + ".outColor" and dst.endswith(".surfaceShader")]
+        if engines:
+            engine = engines[0]
+        else:
+            engine = self.createNode("shadingEngine", material + "SG")
+            self.connect(material + ".outColor", engine + ".surfaceShader")
+
+        for shape in shapes:
+            node = self.resolve(shape)
+            for src, dst in list(node.connections):
+                if self.resolve(src) is node and src.endswith(".instObjGroups[0]"):
+                    self.disconnect(src, dst)
+            self.addMember(engine, node.name)
+        return engine
+
+
+class Cmds(object):
+    """ The subset of ``maya.cmds`` used by vrayformayaUtils operating on a stand-in `Scene` """
+    def __init__(self, scene):
+        self.scene = scene
+
+    def _nodes(self, names):
+        if names is None:
+            return []
+        if isinstance(names, str):
+            names = [names]
+        result = []
+        for name in names:
+            node = self.scene.resolve(name)
+            if node is not None:
+                result.append((name, node))
+        return result
+
+    def _types(self, type):
+        if type is None:
+            return None
+        if isinstance(type, str):
+            type = [type]
+        result = set()
+        for t in type:
+            result.add(t)
+            result.update(DERIVED_TYPES.get(t, ()))
+        return result
+
+    def ls(self, *args, **kwargs):
+        scene = self.scene
+        long = kwargs.get("long", kwargs.get("l", False))
+        allPaths = kwargs.get("allPaths", kwargs.get("ap", False))
+        showType = kwargs.get("showType", kwargs.get("st", False))
+        dag = kwargs.get("dag", False)
+        objectsOnly = kwargs.get("objectsOnly", kwargs.get("o", False))
+        types = self._types(kwargs.get("type", kwargs.get("typ")))
+
+        if kwargs.get("sl", kwargs.get("selection", False)):
+            entries = self._nodes(scene.selection)
+        elif args:
+            entries = self._nodes(args[0])
+        else:
+            entries = [(None, node) for node in scene.nodes.values()]
+
+        if dag:
+            expanded = []
+            for name, node in entries:
+                for path in self._entry_paths(name, node, allPaths or name is not None):
+                    expanded.append((path, node))
+                    expanded.extend(self._descendants(path, node))
+            entries = expanded
+
+        result = []
+        seen = set()
+        for name, node in entries:
+            if dag and not node.dag:
+                continue
+            if kwargs.get("shapes", kwargs.get("s", False)) and not node.shape:
+                continue
+            if kwargs.get("mat", False) and node.type not in MATERIAL_TYPES:
+                continue
+            if kwargs.get("sets", False) and node.type not in ("objectSet", "shadingEngine") and \
+                    not node.type.startswith("VRay"):
+                continue
+            if types is not None and node.type not in types:
+                continue
+            if kwargs.get("lf", kwargs.get("leaf", False)) and node.children:
+                continue
+
+            attr = name.split(".", 1)[1] if name is not None and "." in name else None
+            if attr is not None and objectsOnly:
+                # Components belong to the shape, e.g. "pCube1.f[0]" lists "pCubeShape1"
+                if _COMPONENT.match(attr) and not node.shape:
+                    shapes = [child for child in node.children if child.shape]
+                    if not shapes:
+                        continue
+                    node = shapes[0]
+                    name = self._entry_paths(name, self.scene.resolve(name), False)[0] + "|" + node.name
+                attr = None
+            elif attr is not None and not _COMPONENT.match(attr) and attr not in node.attrs:
+                continue
+
+            if kwargs.get("uuid", False):
+                # One uuid per entry, so instanced paths give the same uuid
+                result.append(node.uuid)
+                continue
+
+            if long or dag:
+                names = self._entry_paths(name, node, allPaths)
+                if not long:
+                    names = [node.name for _ in names]
+            else:
+                names = [node.name]
+
+            if attr is not None:
+                names = [item + "." + attr for item in names]
+
+            for item in names:
+                if item in seen:
+                    continue
+                seen.add(item)
+                result.append(item)
+                if showType:
+                    result.append(node.type)
+        return result
+
+    def _entry_paths(self, name, node, allPaths):
+        if name is not None and name.startswith("|"):
+            return [name.split(".", 1)[0]]
+        paths = self.scene.paths(node)
+        return paths if allPaths else paths[:1]
+
+    def _descendants(self, path, node):
+        result = []
+        for child in node.children:
+            childPath = path + "|" + child.name
+            result.append((childPath, child))
+            result.extend(self._descendants(childPath, child))
+        return result
+
+    def listRelatives(self, nodes, children=False, parent=False, allDescendents=False, fullPath=False,
+                      shapes=False, **kwargs):
+        result = []
+        for name, node in self._nodes(nodes):
+            path = self._entry_paths(name, node, False)[0]
+            if parent:
+                if node.parents:
+                    found = [(path.rsplit("|", 1)[0], node.parents[0])]
+                else:
+                    found = []
+            elif allDescendents:
+                found = self._descendants(path, node)
+            else:
+                found = [(path + "|" + child.name, child) for child in node.children]
+
+            for childPath, child in found:
+                if shapes and not child.shape:
+                    continue
+                result.append(childPath if fullPath else child.name)
+        return result or None
+
+    def nodeType(self, name, isTypeName=False, derived=False):
+        if isTypeName:
+            return sorted(self._types(name)) if derived else name
+        return self.scene.resolve(name).type
+
+    def getClassification(self, type):
+        return [CLASSIFICATIONS.get(type, "")]
+
+    def objExists(self, name):
+        node = self.scene.resolve(name)
+        if node is None:
+            return False
+        if "." in name:
+            return name.split(".", 1)[1] in node.attrs
+        return True
+
+    def listConnections(self, nodes, source=True, destination=True, type=None, plugs=False, connections=False,
+                        **kwargs):
+        source = kwargs.get("s", source)
+        destination = kwargs.get("d", destination)
+        types = self._types(type)
+        result = []
+        for name, node in self._nodes(nodes):
+            attr = name.split(".", 1)[1] if "." in name else None
+            for src, dst in node.connections:
+                for mine, other, enabled in ((src, dst, destination), (dst, src, source)):
+                    if not enabled or self.scene.resolve(mine) is not node:
+                        continue
+                    if attr is not None and not mine.split(".", 1)[1].startswith(attr):
+                        continue
+                    otherNode = self.scene.resolve(other)
+                    if types is not None and otherNode.type not in types:
+                        continue
+                    if connections:
+                        result.append(mine)
+                    result.append(other if plugs else otherNode.name)
+        return result or None
+
+    def sets(self, *args, **kwargs):
+        if kwargs.get("forceElement") or kwargs.get("fe"):
+            engine = kwargs.get("forceElement") or kwargs.get("fe")
+            for name, node in self._nodes(args[0] if args else self.scene.selection):
+                for child in [node] + node.children:
+                    if child.shape:
+                        # A shape is a member of a single shadingEngine only
+                        for src, dst in list(child.connections):
+                            if src.startswith(child.name + ".instObjGroups") and \
+                                    self.scene.resolve(dst).type == "shadingEngine":
+                                self.scene.disconnect(src, dst)
+                        self.scene.addMember(engine, child.name)
+            return None
+
+        if kwargs.get("empty") or kwargs.get("em"):
+            type = "shadingEngine" if kwargs.get("renderable") or kwargs.get("r") else "objectSet"
+            return self.createNode(type, name=kwargs.get("name") or kwargs.get("n"))
+
+        if kwargs.get("addElement") or kwargs.get("add"):
+            setName = kwargs.get("addElement") or kwargs.get("add")
+            for name, node in self._nodes(args[0] if args else self.scene.selection):
+                self.scene.addMember(setName, node.name)
+            return None
+
+        if kwargs.get("remove") or kwargs.get("rm"):
+            setName = kwargs.get("remove") or kwargs.get("rm")
+            for name, node in self._nodes(args[0] if args else self.scene.selection):
+                self.scene.removeMember(setName, node.name)
+            return None
+
+        node = self.scene.resolve(args[0])
+        members = []
+        for src, dst in node.connections:
+            if self.scene.resolve(dst) is node and ".dagSetMembers" in dst:
+                members.append(self.scene.resolve(src).name)
+        return members or None
+
+    def createNode(self, type, name=None, n=None, parent=None, p=None):
+        return self.scene.createNode(type, self.scene.uniqueName(name or n or type + "#"), parent=parent or p)
+
+    def group(self, nodes=None, empty=False, em=False, name=None, n=None, parent=None, p=None):
+        group = self.createNode("transform", name=name or n or "group#", parent=parent or p)
+        if not (empty or em):
+            self.parent(nodes, group)
+        return group.rsplit("|", 1)[-1]
+
+    def parent(self, nodes, parent=None, world=False, w=False, addObject=False, add=False, **kwargs):
+        result = []
+        for name, node in self._nodes(nodes):
+            self.scene.parent(node.name, None if world or w else parent, add=addObject or add)
+            result.append(node.name)
+        return result
+
+    def instance(self, nodes, name=None, n=None):
+        result = []
+        for name_, node in self._nodes(nodes):
+            transform = self.scene.createNode("transform", self.scene.uniqueName(name or n or node.name + "#"))
+            for child in list(node.children):
+                self.scene.parent(child.name, transform, add=True)
+            result.append(transform.rsplit("|", 1)[-1])
+        return result
+
+    def shadingNode(self, type, asShader=False, asTexture=False, asUtility=False, name=None, n=None):
+        return self.createNode(type, name=name or n)
+
+    def connectAttr(self, src, dst, force=False, f=False):
+        self.scene.connect(src, dst)
+
+    def rename(self, name, newName):
+        node = self.scene.resolve(name)
+        if newName == node.name:
+            return node.name
+        return self.scene.rename(name, self.scene.uniqueName(newName))
+
+    def select(self, nodes=None, r=False, replace=False, add=False, d=False, deselect=False, clear=False):
+        self.scene.selectionChanges += 1
+        if d or deselect or clear:
+            self.scene.selection = []
+            return
+        names = [name for name, node in self._nodes(nodes)]
+        if add:
+            self.scene.selection.extend(name for name in names if name not in self.scene.selection)
+        else:
+            self.scene.selection = names
+
+    def getAttr(self, plug, type=False):
+        node = self.scene.resolve(plug)
+        attr = plug.split(".", 1)[1]
+        if node is None or attr not in node.attrs:
+            raise ValueError("No object matches name: {0}".format(plug))
+        value = node.attrs[attr]
+        if type:
+            return ATTRIBUTE_TYPES.get(value.__class__, "float3")
+        if isinstance(value, tuple):
+            # Compound attributes are returned as a list with a single tuple
+            return [value]
+        return value
+
+    def listAttr(self, name, string=None):
+        node = self.scene.resolve(name)
+        attrs = sorted(node.attrs)
+        if string is not None:
+            attrs = [attr for attr in attrs if fnmatch.fnmatchcase(attr, string)]
+        return attrs or None
+
+    def setAttr(self, plug, *values, **kwargs):
+        node = self.scene.resolve(plug)
+        if node is None:
+            raise ValueError("No object matches name: {0}".format(plug))
+        node.attrs[plug.split(".", 1)[1]] = values[0] if len(values) == 1 else values
+
+    def listHistory(self, nodes, future=False, f=False, **kwargs):
+        """ The nodes themselves and (with future) all nodes downstream of them """
+        result = []
+        seen = set()
+        stack = [node for name, node in self._nodes(nodes)]
+        while stack:
+            node = stack.pop(0)
+            if node.name in seen:
+                continue
+            seen.add(node.name)
+            result.append(node.name)
+            if future or f:
+                stack.extend(self.scene.resolve(dst) for src, dst in node.connections
+                             if self.scene.resolve(src) is node)
+        return result or None
+
+    def delete(self, nodes):
+        for name, node in self._nodes(nodes):
+            if node.name in self.scene.nodes:
+                self.scene.delete(node.name)
+
+    def polyCube(self, constructionHistory=True, ch=True, name=None, n=None):
+        transform = self.scene.uniqueName(name or n or "pCube#")
+        shape = self.scene.createMesh(transform)
+        return [transform, shape.rsplit("|", 1)[-1]]
+
+    def file(self, new=False, force=False, **kwargs):
+        if new:
+            self.scene.clear()
+
+    def vray(self, command, *args):
+        """ The v-ray commands used by vrayformayaUtils """
+        if command == "addAttributesFromGroup":
+            node, group, state = args
+            self.scene.addAttributesFromGroup(node, group, state)
+        elif command == "objectProperties":
+            cmd, type = args
+            self.scene.objectProperties(cmd, type)
+        else:
+            raise RuntimeError("vray {0} isn't available in the stand-in".format(command))
+
+    def pluginInfo(self, name, query=False, version=False, loaded=False):
+        if loaded:
+            return name in self.scene.plugins
+        if name not in self.scene.plugins:
+            raise RuntimeError("Plug-in, \"{0}\", was not found on MAYA_PLUG_IN_PATH.".format(name))
+        return self.scene.plugins[name]
+
+    def internalVar(self, userAppDir=False):
+        return self.scene.userAppDir
+
+    def workspace(self, query=False, q=False, rootDirectory=False, rd=False):
+        return self.scene.workspaceRoot
+
+    def undoInfo(self, query=False, state=False, stateWithoutFlush=None, openChunk=False, closeChunk=False):
+        if query:
+            return self.scene.undoEnabled
+        if stateWithoutFlush is not None:
+            self.scene.undoEnabled = bool(stateWithoutFlush)
+        if openChunk:
+            self.scene.openChunks += 1
+        if closeChunk:
+            if not self.scene.openChunks:
+                raise RuntimeError("No undo chunk is open")
+            self.scene.openChunks -= 1
+            self.scene.undoChunks.append(self.scene.openChunks)
+
+    def refresh(self, suspend=None):
+        if suspend is not None:
+            self.scene.refreshSuspended = bool(suspend)
+
+
+def _split_statements(code):
+    """ Split MEL code into its top level statements """
+    statements = []
+    current = []
+    depth = 0
+    quoted = False
+    escaped = False
+    for char in code:
+        current.append(char)
+        if quoted:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == "\"":
+                quoted = False
+            continue
+
+        if char == "\"":
+            quoted = True
+        elif char in "({":
+            depth += 1
+        elif char in ")}":
+            depth -= 1
+        elif char == ";" and depth == 0:
+            current.pop()
+            statements.append("".join(current).strip())
+            current = []
+    statements.append("".join(current).strip())
+    return [statement for statement in statements if statement]
+
+
+_COMPONENT = re.compile(r"^(f|e|vtx|vtxFace|map|cv|ep)\[[^\]]*\](\[[^\]]*\])?$")
+_TOKEN = re.compile(r'"(?:\\.|[^"\\])*"|\{[^}]*\}|[^\s]+')
+_STRING = re.compile(r'"((?:\\.|[^"\\])*)"')
+_CALL = re.compile(r'^(\w+)\s*\((.*)\)$', re.DOTALL)
+_ESCAPES = {"n": "\n", "t": "\t"}
+
+
+def _unquote(token):
+    """ Return the value of a MEL string literal (or the token itself if it isn't quoted) """
+    if not token.startswith("\""):
+        return token
+    return re.sub(r"\\(.)", lambda m: _ESCAPES.get(m.group(1), m.group(1)), token[1:-1])
+
+
+def _number(token):
+    try:
+        return int(token)
+    except ValueError:
+        return float(token)
+
+
+def _mel_value(scene, plug):
+    """ Return the value of the plug the way MEL converts it to a string """
+    node = scene.resolve(plug)
+    attr = plug.split(".", 1)[1]
+    if node is None or attr not in node.attrs:
+        raise RuntimeError("No object matches name: {0}".format(plug))
+    value = node.attrs[attr]
+    if isinstance(value, str):
+        return value
+    if isinstance(value, tuple):
+        return " ".join("{0:.10g}".format(x) for x in value)
+    return "{0:.10g}".format(value)
+
+
+class Mel(object):
+    """ Evaluates the MEL statements generated by vrayformayaUtils on a stand-in `Scene` """
+    def __init__(self, scene):
+        self.scene = scene
+
+    def eval(self, code):
+        result = None
+        for statement in _split_statements(code):
+            result = self._evalStatement(statement)
+        return result
+
+    def _evalStatement(self, statement):
+        scene = self.scene
+        if statement.startswith("global proc"):
+            scene.calls["mel:global proc"] += 1
+            return None
+
+        match = _CALL.match(statement)
+        if match is not None:
+            command = match.group(1)
+            scene.calls["mel:" + command] += 1
+            if command == "vrayformayaUtils_addRenderElements":
+                classTypes, names = [[_unquote(x) for x in _STRING.findall(array)]
+                                     for array in re.findall(r"\{[^}]*\}", match.group(2))]
+                nodes = []
+                for classType, name in zip(classTypes, names):
+                    node = scene.addRenderElement(classType)
+                    if name:
+                        node = scene.rename(node, scene.uniqueName(name))
+                    nodes.append(node)
+                return nodes
+            if command == "vrayformayaUtils_getAttributes":
+                return [_mel_value(scene, _unquote(plug)) for plug in _STRING.findall(match.group(2))]
+            raise RuntimeError("Cannot find procedure \"{0}\".".format(command))
+
+        tokens = _TOKEN.findall(statement)
+        command = tokens[0]
+        scene.calls["mel:" + command] += 1
+
+        if command == "vray":
+            args = [_unquote(token) for token in tokens[1:]]
+            if args[0] == "addAttributesFromGroup":
+                scene.addAttributesFromGroup(args[1], args[2], int(args[3]))
+            elif args[0] == "objectProperties":
+                scene.objectProperties(args[1], args[2])
+            return None
+
+        if command == "setAttr":
+            args = tokens[1:]
+            attrType = None
+            while args[0].startswith("-"):
+                if args[0] == "-type":
+                    attrType = _unquote(args[1])
+                    args = args[2:]
+                else:
+                    args = args[1:]
+            plug = _unquote(args[0])
+            if attrType == "string":
+                values = [_unquote(args[1])]
+            else:
+                values = [_number(token) for token in args[1:]]
+
+            node = scene.resolve(plug)
+            if node is None:
+                raise RuntimeError("No object matches name: {0}".format(plug))
+            node.attrs[plug.split(".", 1)[1]] = values[0] if len(values) == 1 else tuple(values)
+            return None
+
+        if command == "vrayAddRenderElement":
+            return scene.addRenderElement(tokens[1])
+
+        raise RuntimeError("Cannot find procedure \"{0}\".".format(command))
+
+
+class OpenMaya(object):
+    """ The subset of ``maya.api.OpenMaya`` used by vrayformayaUtils operating on a stand-in `Scene` """
+    def __init__(self, scene):
+        self.scene = scene
+        openMaya = self
+
+        class MSelectionList(object):
+            def __init__(self):
+                self._nodes = []
+
+            def add(self, name):
+                node = openMaya.scene.resolve(name)
+                if node is None:
+                    raise RuntimeError("(kInvalidParameter): Object does not exist")
+                # Like Maya a node is only in the list once
+                if node not in self._nodes:
+                    self._nodes.append(node)
+
+            def length(self):
+                return len(self._nodes)
+
+            def getDependNode(self, index):
+                return self._nodes[index]
+
+        class MPlug(object):
+            def __init__(self, node, attr):
+                self._node = node
+                self._attr = attr
+
+            def asString(self):
+                return self._node.attrs.get(self._attr) or ""
+
+        class MFnDependencyNode(object):
+            def __init__(self, obj):
+                self._node = obj
+
+            def name(self):
+                return self._node.name
+
+            def findPlug(self, attr, wantNetworkedPlug):
+                openMaya.scene.calls["OpenMaya:findPlug"] += 1
+                if attr not in self._node.attrs:
+                    raise RuntimeError("(kInvalidParameter): No element at given index")
+                return MPlug(self._node, attr)
+
+        self.MSelectionList = MSelectionList
+        self.MFnDependencyNode = MFnDependencyNode
+        self.MPlug = MPlug
+
+
+def _counted(calls, name, func):
+    """ Wrap func to count its calls as name """
+    def wrapper(*args, **kwargs):
+        calls[name] += 1
+        return func(*args, **kwargs)
+    wrapper.__name__ = name
+    return wrapper
+
+
+def install(scene=None):
+    """ Register a stand-in scene as the ``maya.cmds`` and ``maya.mel`` modules.
+
+    :return: The installed scene
+    :rtype: Scene
+    """
+    if scene is None:
+        scene = Scene()
+    cmds = Cmds(scene)
+
+    maya = sys.modules.get("maya")
+    if maya is None or not getattr(maya, "__standin__", False):
+        maya = types.ModuleType("maya")
+        maya.__standin__ = True
+        maya.__path__ = []
+        sys.modules["maya"] = maya
+
+    cmdsModule = types.ModuleType("maya.cmds")
+    for name in dir(cmds):
+        if not name.startswith("_") and callable(getattr(cmds, name)):
+            setattr(cmdsModule, name, _counted(scene.calls, name, getattr(cmds, name)))
+    cmdsModule.scene = scene
+
+    # Modules that already imported maya.cmds keep a reference to the module object, so update it in place.
+    existing = sys.modules.get("maya.cmds")
+    if existing is not None and getattr(maya, "cmds", None) is existing:
+        existing.__dict__.update(cmdsModule.__dict__)
+        cmdsModule = existing
+
+    sys.modules["maya.cmds"] = cmdsModule
+    maya.cmds = cmdsModule
+
+    mel = sys.modules.get("maya.mel")
+    if mel is None or getattr(maya, "mel", None) is not mel:
+        mel = types.ModuleType("maya.mel")
+        sys.modules["maya.mel"] = mel
+        maya.mel = mel
+    mel.eval = _counted(scene.calls, "mel.eval", Mel(scene).eval)
+
+    api = sys.modules.get("maya.api")
+    if api is None or getattr(maya, "api", None) is not api:
+        api = types.ModuleType("maya.api")
+        api.__path__ = []
+        sys.modules["maya.api"] = api
+        maya.api = api
+    openMaya = types.ModuleType("maya.api.OpenMaya")
+    openMaya.__dict__.update((name, value) for name, value in vars(OpenMaya(scene)).items() if name != "scene")
+    sys.modules["maya.api.OpenMaya"] = openMaya
+    api.OpenMaya = openMaya
+
+    return scene
@@ -0,0 +1,82 @@
+import unittest
+from tests import standin
+
+standin.install()
+
+import maya.cmds as mc
+import maya.mel as mel
+import vrayformayaUtils as vfm
+
+
+class TestStandin(unittest.TestCase):
+    """
+        Tests the stand-in scene's MEL evaluation and call counters.
+    """
+    def setUp(self):
+        self.scene = standin.install()
+
+    def test_mel(self):
+        shape = self.scene.createMesh("a")
+        mel.eval('vray "addAttributesFromGroup" "{0}" "vray_displacement" 1;\n'
+                 'setAttr "{0}.vrayDisplacementAmount" 2.5;\n'
+                 'setAttr "{0}.vrayDisplacementMinValue" 1.0 2.0 3.0;\n'
+                 'setAttr -type "string" "{0}.vrayDisplacementNone" "a;b \\"c\\""'.format(shape))
+        self.assertEqual(mc.getAttr(shape + ".vrayDisplacementAmount"), 2.5)
+        self.assertEqual(mc.getAttr(shape + ".vrayDisplacementMinValue"), [(1.0, 2.0, 3.0)])
+        self.assertEqual(mc.getAttr(shape + ".vrayDisplacementNone"), 'a;b "c"')
+        self.assertEqual(self.scene.calls["mel.eval"], 1)
+        self.assertEqual(self.scene.calls["mel:setAttr"], 3)
+
+        mel.eval('vray "addAttributesFromGroup" "{0}" "vray_displacement" 0'.format(shape))
+        self.assertFalse(mc.objExists(shape + ".vrayDisplacementAmount"))
+        self.assertRaises(RuntimeError, mel.eval, "unknownProcedure 1")
+
+    def test_registry_attributes(self):
+        # Every attribute the registry writes is an attribute of its v-ray attribute group
+        for name, group in vfm.attributes.ATTRIBUTE_GROUPS.items():
+            expected = set(attr for attr, value in standin.ATTRIBUTE_GROUPS[group.group])
+            for attr, attrType in group.attributes:
+                self.assertIn(attr, expected, "{0}: {1} isn't part of {2}".format(name, attr, group.group))
+
+    def test_ls_plugs(self):
+        shape = self.scene.createMesh("a")
+        mc.vray("addAttributesFromGroup", shape, "vray_subdivision", 1)
+        self.assertEqual(mc.ls([shape + ".vraySubdivEnable", shape + ".doesNotExist"], long=True),
+                         [shape + ".vraySubdivEnable"])
+
+
+class TestCommandCounts(unittest.TestCase):
+    """
+        Guards the amount of commands the attribute functions need against regressions.
+    """
+    def setUp(self):
+        self.scene = standin.install()
+        self.transforms = [mc.polyCube(constructionHistory=False)[0] for _ in range(200)]
+        self.scene.calls.clear()
+
+    def test_attribute_function(self):
+        result = vfm.attributes.vray_subdivision(self.transforms, vraySubdivEnable=False, vraySubdivUVs=True)
+        self.assertEqual(len(result.changed), 200)
+
+        # The commands don't grow with the amount of nodes
+        self.assertEqual(self.scene.calls["vray"], 0)
+        self.assertEqual(self.scene.calls["setAttr"], 0)
+        self.assertEqual(self.scene.calls["mel.eval"], 1)
+        self.assertEqual(self.scene.calls["mel:vray"], 200)
+        self.assertEqual(self.scene.calls["mel:setAttr"], 400)
+
+    def test_skipUnchanged(self):
+        vfm.attributes.vray_subdivision(self.transforms, vraySubdivEnable=False)
+        self.scene.calls.clear()
+
+        result = vfm.attributes.vray_subdivision(self.transforms, vraySubdivEnable=False, skipUnchanged=True)
+        self.assertEqual(result.changed, [])
+        self.assertEqual(len(result.skipped), 200)
+        self.assertEqual(self.scene.calls["mel:vray"], 0)
+        # The current values are queried in bulk instead of with a getAttr per node
+        self.assertEqual(self.scene.calls["getAttr"], 0)
+        self.assertEqual(self.scene.calls["mel:vrayformayaUtils_getAttributes"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
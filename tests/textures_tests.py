@@ -0,0 +1,337 @@
+import os
+import shutil
+import tempfile
+import unittest
+from tests import standin
+
+standin.install()
+
+import maya.cmds as mc
+from vrayformayaUtils import textures
+
+
+class TestColorSpacePass(unittest.TestCase):
+    """
+        Tests classifying and converting file nodes by their file name against the stand-in scene.
+    """
+    FILES = {"diffuse": "/textures/wood_diffuse.jpg",
+             "shared": "/textures/wood_diffuse.jpg",
+             "normal": "/textures/wood_normal.png",
+             "rough": "C:\\textures\\wood_Roughness.1001.tif",
+             "hdri": "/textures/sky.exr",
+             "unknown": "/textures/wood.psd",
+             "empty": ""}
+
+    def setUp(self):
+        self.scene = standin.install()
+        for node, fileName in self.FILES.items():
+            self.scene.createNode("file", node)
+            mc.setAttr("{0}.fileTextureName".format(node), fileName, type="string")
+
+    def test_classifyFileNodes(self):
+        result = textures.classifyFileNodes()
+        self.assertEqual(list(result), ["data", "hdr", "srgb", None])
+        self.assertEqual(sorted(result["data"]), ["normal", "rough"])
+        self.assertEqual(result["hdr"], ["hdri"])
+        self.assertEqual(sorted(result["srgb"]), ["diffuse", "shared"])
+        self.assertEqual(sorted(result[None]), ["empty", "unknown"])
+
+        result = textures.classifyFileNodes(["diffuse", "hdri"], rules=[("all", r".", {})])
+        self.assertEqual(sorted(result["all"]), ["diffuse", "hdri"])
+
+    def test_colorSpacePass(self):
+        results = textures.colorSpacePass(default={"vrayFileGammaEnable": False})
+        self.assertEqual([result.rule for result in results], ["data", "hdr", "srgb", None])
+        counts = dict((result.rule, len(result.changed)) for result in results)
+        self.assertEqual(counts, {"data": 2, "hdr": 1, "srgb": 2, None: 2})
+
+        self.assertEqual(mc.getAttr("normal.vrayFileColorSpace"), textures.COLOR_SPACE_LINEAR)
+        self.assertEqual(mc.getAttr("shared.vrayFileColorSpace"), textures.COLOR_SPACE_SRGB)
+        self.assertEqual(mc.getAttr("unknown.vrayFileGammaEnable"), False)
+
+        # Running it again doesn't change anything
+        self.scene.calls.clear()
+        results = textures.colorSpacePass(default={"vrayFileGammaEnable": False})
+        self.assertEqual(sum(len(result.changed) for result in results), 0)
+        self.assertEqual(sum(len(result.skipped) for result in results), len(self.FILES))
+        self.assertEqual(self.scene.calls["mel:vray"], 0)
+        # The texture paths are read through the API and the current values in bulk, nothing with a getAttr per node
+        self.assertEqual(self.scene.calls["getAttr"], 0)
+        self.assertEqual(self.scene.calls["OpenMaya:findPlug"], len(self.FILES))
+
+    def test_bulk(self):
+        self.scene.calls.clear()
+        textures.colorSpacePass()
+        # A single undo step and a single MEL evaluation per rule
+        self.assertEqual(self.scene.undoChunks.count(0), 1)
+        self.assertEqual(self.scene.calls["mel.eval"], 3)
+        self.assertEqual(self.scene.calls["mel:vray"], 5)
+
+
+class TestSequences(unittest.TestCase):
+    """
+        Tests the image sequence detection against a temporary directory.
+    """
+    def setUp(self):
+        self.scene = standin.install()
+        self.directory = tempfile.mkdtemp()
+        for name in ("tex.1001.exr", "tex.1002.exr", "tex.1004.exr", "anim.0101.exr", "anim.0102.exr", "still.exr",
+                     "single.0001.exr", "unpadded_9.png", "unpadded_10.png", "skin_u1_v1.exr", "skin_u1_v2.exr",
+                     "rock_1.jpg", "rock_2.jpg"):
+            self._touch(name)
+        for frame in range(1001, 1011):
+            self._touch("smoke.{0}.exr".format(frame))
+        for node, name in (("seq", "anim.0102.exr"), ("seq2", "anim.0101.exr"), ("still", "still.exr"),
+                           ("single", "single.0001.exr"), ("unpadded", "unpadded_10.png"),
+                           ("udim", "tex.1001.exr"), ("mari", "skin_u1_v1.exr"), ("smoke", "smoke.1001.exr"),
+                           ("rock", "rock_1.jpg"), ("missing", "missing/anim.0101.exr")):
+            self.scene.createNode("file", node)
+            mc.setAttr("{0}.fileTextureName".format(node), os.path.join(self.directory, name), type="string")
+        mc.setAttr("udim.uvTilingMode", 3)
+
+    def tearDown(self):
+        textures.clearDirectoryCache()
+        shutil.rmtree(self.directory)
+
+    def _touch(self, name):
+        open(os.path.join(self.directory, name), "w").close()
+
+    def test_findSequence(self):
+        sequence = textures.findSequence(os.path.join(self.directory, "tex.1004.exr"))
+        self.assertEqual((sequence.prefix, sequence.suffix, sequence.padding), ("tex.", ".exr", 4))
+        self.assertEqual(sequence.frames, [1001, 1002, 1004])
+
+        sequence = textures.findSequence(os.path.join(self.directory, "smoke.1005.exr"))
+        self.assertEqual((sequence.prefix, sequence.padding), ("smoke.", 4))
+        self.assertEqual(sequence.frames, list(range(1001, 1011)))
+
+        # Numbered variants without padding aren't frames
+        self.assertIsNone(textures.findSequence(os.path.join(self.directory, "rock_1.jpg")))
+        self.assertIsNone(textures.findSequence(os.path.join(self.directory, "unpadded_9.png")))
+        self.assertIsNone(textures.findSequence(os.path.join(self.directory, "still.exr")))
+        self.assertIsNone(textures.findSequence(os.path.join(self.directory, "single.0001.exr")))
+
+    def test_detectSequences(self):
+        sequences = textures.detectSequences()
+        self.assertEqual(sorted(node for node, sequence in sequences.items() if sequence is not None),
+                         ["seq", "seq2", "smoke"])
+        self.assertIs(sequences["seq"], sequences["seq2"])
+
+    def test_frame_pattern(self):
+        # The rule can be relaxed to also group unpadded frame numbers
+        pattern = textures.FRAME_PATTERN
+        textures.FRAME_PATTERN = r"^(.*[._-])(\d+)(\.[^.]*)$"
+        try:
+            sequence = textures.findSequence(os.path.join(self.directory, "unpadded_9.png"))
+            self.assertEqual((sequence.padding, sequence.frames), (1, [9, 10]))
+        finally:
+            textures.FRAME_PATTERN = pattern
+        self.assertIsNone(textures.findSequence(os.path.join(self.directory, "unpadded_9.png")))
+
+    def test_udim_tiles(self):
+        # Nodes with UV tiling enabled aren't image sequences, whatever their file is numbered like
+        for node, name in (("tiled", "anim.0101.exr"), ("pattern", "anim.0101.exr")):
+            self.scene.createNode("file", node)
+            mc.setAttr("{0}.fileTextureName".format(node), os.path.join(self.directory, name), type="string")
+        mc.setAttr("tiled.uvTilingMode", 3)
+        mc.setAttr("pattern.fileTextureNamePattern", os.path.join(self.directory, "anim.<f>.exr"), type="string")
+
+        sequences = textures.detectSequences(["udim", "mari", "tiled", "pattern", "seq"])
+        self.assertEqual([node for node, sequence in sequences.items() if sequence is not None], ["seq"])
+
+        sequences, changed, skipped = textures.iflPass(["udim", "mari", "tiled"])
+        self.assertEqual(changed, [])
+        self.assertFalse(mc.objExists("udim.vrayFileIFLStartFrame"))
+
+    def test_cache(self):
+        sequence = textures.findSequence(os.path.join(self.directory, "tex.1001.exr"))
+        self.assertIs(textures.findSequence(os.path.join(self.directory, "tex.1001.exr")), sequence)
+
+        # A new file changes the directory's modification time and invalidates the listing
+        self._touch("tex.1003.exr")
+        mtime = os.stat(self.directory).st_mtime + 10
+        os.utime(self.directory, (mtime, mtime))
+        sequence = textures.findSequence(os.path.join(self.directory, "tex.1001.exr"))
+        self.assertEqual(sequence.frames, [1001, 1002, 1003, 1004])
+
+    def test_iflPass(self):
+        sequences, changed, skipped = textures.iflPass(playbackRate=2.0)
+        self.assertEqual(sorted(changed), ["seq", "seq2", "smoke"])
+        self.assertEqual(skipped, [])
+        self.assertEqual(mc.getAttr("seq.vrayFileIFLStartFrame"), 101)
+        self.assertEqual(mc.getAttr("smoke.vrayFileIFLStartFrame"), 1001)
+        self.assertEqual(mc.getAttr("seq.vrayFileIFLPlaybackRate"), 2.0)
+        for node in ("still", "rock", "unpadded", "udim"):
+            self.assertFalse(mc.objExists(node + ".vrayFileIFLStartFrame"))
+
+        sequences, changed, skipped = textures.iflPass(playbackRate=2.0)
+        self.assertEqual(changed, [])
+        self.assertEqual(sorted(skipped), ["seq", "seq2", "smoke"])
+
+
+class TestValidateTexturePaths(unittest.TestCase):
+    """
+        Tests the texture path validation against a temporary directory.
+    """
+    def setUp(self):
+        self.scene = standin.install()
+        self.directory = tempfile.mkdtemp()
+        for name in ("color.exr", "wood.1001.tif", "wood.1002.tif", "skin_u1_v1.exr", "skin_u2_v1.exr",
+                     "anim.0001.png", "anim.0002.png", "model.ptx", "locked.exr"):
+            open(os.path.join(self.directory, name), "w").close()
+
+        self.paths = {}
+        for node, type, attr, name in (("color", "file", "fileTextureName", "color.exr"),
+                                       ("shared", "file", "fileTextureName", "color.exr"),
+                                       ("udim", "file", "fileTextureName", "wood.<UDIM>.tif"),
+                                       ("uvtile", "file", "fileTextureName", "skin_<UVTILE>.exr"),
+                                       ("mari", "file", "fileTextureName", "skin_u<U>_v<V>.exr"),
+                                       ("frames", "file", "fileTextureName", "anim.####.png"),
+                                       ("frame", "file", "fileTextureName", "anim.<f>.png"),
+                                       ("missing", "file", "fileTextureName", "missing.exr"),
+                                       ("missingUdim", "file", "fileTextureName", "missing.<UDIM>.exr"),
+                                       ("locked", "file", "fileTextureName", "locked.exr"),
+                                       ("ptex", "VRayPtex", "ptexFile", "model.ptx"),
+                                       ("substance", "substance", "package", "missing.sbsar")):
+            self.scene.createNode(type, node)
+            path = os.path.join(self.directory, name)
+            mc.setAttr("{0}.{1}".format(node, attr), path, type="string")
+            self.paths[node] = path
+
+        self.scene.createNode("file", "empty")
+        mc.setAttr("empty.fileTextureName", "", type="string")
+
+    def tearDown(self):
+        textures.clearDirectoryCache()
+        shutil.rmtree(self.directory)
+
+    def test_getTexturePaths(self):
+        paths = textures.getTexturePaths()
+        self.assertEqual(paths["ptex"], self.paths["ptex"])
+        self.assertEqual(paths["substance"], self.paths["substance"])
+        self.assertEqual(len(paths), len(self.paths) + 1)
+        self.assertEqual(list(textures.getTexturePaths(["color", "ptex"])), ["color", "ptex"])
+        self.assertEqual(textures.getTexturePaths([]), {})
+
+    def test_expandTexturePath(self):
+        self.assertEqual([os.path.basename(x) for x in textures.expandTexturePath(self.paths["udim"])],
+                         ["wood.1001.tif", "wood.1002.tif"])
+        self.assertEqual(len(textures.expandTexturePath(self.paths["uvtile"])), 2)
+        self.assertEqual(len(textures.expandTexturePath(self.paths["mari"])), 2)
+        self.assertEqual(len(textures.expandTexturePath(self.paths["frames"])), 2)
+        self.assertEqual(textures.expandTexturePath(self.paths["color"]), [self.paths["color"]])
+        self.assertEqual(textures.expandTexturePath(self.paths["missingUdim"]), [])
+
+    def test_validateTexturePaths(self):
+        for threads in (1, 4):
+            report = textures.validateTexturePaths(threads=threads)
+            self.assertEqual(sorted(x.nodes[0] for x in report.missing), ["missing", "missingUdim", "substance"])
+            self.assertEqual([x.nodes for x in report.empty], [["empty"]])
+            self.assertEqual(report.unreadable, [])
+
+            statuses = dict((x.path, x.status) for x in report.paths)
+            self.assertEqual(statuses[self.paths["udim"]], textures.STATUS_OK)
+            self.assertEqual(statuses[self.paths["frame"]], textures.STATUS_OK)
+
+            # Each unique path is validated once
+            color = [x for x in report.paths if x.path == self.paths["color"]][0]
+            self.assertEqual(color.nodes, ["color", "shared"])
+
+    def test_resolve_paths(self):
+        # Environment variables are expanded and relative paths are resolved against the workspace root
+        self.scene.workspaceRoot = os.path.dirname(self.directory)
+        os.environ["VFM_TEST_TEXTURES"] = self.directory
+        try:
+            for node, name in (("env", os.path.join("$VFM_TEST_TEXTURES", "color.exr")),
+                               ("relative", os.path.join(os.path.basename(self.directory), "wood.<UDIM>.tif"))):
+                self.scene.createNode("file", node)
+                mc.setAttr("{0}.fileTextureName".format(node), name, type="string")
+
+            self.scene.calls.clear()
+            report = textures.validateTexturePaths(["env", "relative"], threads=2)
+        finally:
+            del os.environ["VFM_TEST_TEXTURES"]
+
+        self.assertEqual(report.missing, [])
+        self.assertEqual([x.files for x in report.paths][0], [self.paths["color"]])
+        self.assertEqual(len(report.paths[1].files), 2)
+        self.assertEqual(self.scene.calls["workspace"], 1)
+
+    @unittest.skipIf(not hasattr(os, "geteuid") or os.geteuid() == 0, "File permissions don't apply")
+    def test_unreadable(self):
+        os.chmod(self.paths["locked"], 0)
+        report = textures.validateTexturePaths(["locked", "color"])
+        self.assertEqual([x.nodes for x in report.unreadable], [["locked"]])
+
+
+class TestTileIndex(unittest.TestCase):
+    """
+        Tests the UDIM tile index against a temporary directory.
+    """
+    def setUp(self):
+        self.scene = standin.install()
+        self.directory = tempfile.mkdtemp()
+        for name in ("wood.1001.tif", "wood.1002.tif", "wood.1011.tif", "skin_u0_v0.exr", "skin_u1_v0.exr",
+                     "skin_u1_v1.exr", "tex_0_0.tif", "tex_1_0.tif", "color.exr",
+                     "wood.1000.tif"):
+            open(os.path.join(self.directory, name), "w").close()
+
+        for node, name in (("udim", "wood.<UDIM>.tif"), ("shared", "wood.<udim>.tif"),
+                           ("zbrush", "skin_u<U>_v<V>.exr"), ("mudbox", "skin_<UVTILE>.exr"),
+                           ("bare", "tex_<U>_<V>.tif"), ("empty", "missing.<UDIM>.tif"), ("still", "color.exr")):
+            self.scene.createNode("file", node)
+            mc.setAttr("{0}.fileTextureName".format(node), os.path.join(self.directory, name), type="string")
+
+        # Maya's UV tiling mode keeps the first tile as file name and the tokens in the pattern
+        self.scene.createNode("file", "tiling")
+        mc.setAttr("tiling.fileTextureName", os.path.join(self.directory, "wood.1001.tif"), type="string")
+        mc.setAttr("tiling.fileTextureNamePattern", os.path.join(self.directory, "wood.<UDIM>.tif"), type="string")
+
+    def tearDown(self):
+        textures.clearDirectoryCache()
+        shutil.rmtree(self.directory)
+
+    def test_buildTileIndex(self):
+        index = textures.buildTileIndex()
+        self.assertEqual(sorted(index.nodes()), ["bare", "empty", "mudbox", "shared", "tiling", "udim", "zbrush"])
+        self.assertNotIn("still", index)
+        self.assertEqual(index.tiles("still"), [])
+
+        # 1000 isn't a UDIM tile
+        self.assertEqual(index.udims("udim"), [1001, 1002, 1011])
+        self.assertEqual(index.udims("shared"), [1001, 1002, 1011])
+        self.assertEqual(index.udims("tiling"), [1001, 1002, 1011])
+        self.assertEqual([(tile.u, tile.v) for tile in index.tiles("udim")], [(0, 0), (1, 0), (0, 1)])
+        self.assertEqual(index.udims("zbrush"), [1001, 1002, 1012])
+        self.assertEqual(index.udims("mudbox"), [1001])
+        self.assertEqual(index.paths("mudbox"), [os.path.join(self.directory, "skin_u1_v1.exr")])
+        self.assertEqual(index.udims("bare"), [1001, 1002])
+        self.assertEqual(index.tiles("empty"), [])
+
+    def test_bare_uv_tokens(self):
+        path = os.path.join(self.directory, "tex_<U>_<V>.tif")
+        self.assertEqual(textures.expandTexturePath(path),
+                         [os.path.join(self.directory, name) for name in ("tex_0_0.tif", "tex_1_0.tif")])
+        report = textures.validateTexturePaths(["bare"], threads=1)
+        self.assertEqual(report.missing, [])
+
+    def test_single_scan(self):
+        listdir = os.listdir
+        listed = []
+
+        def countedListdir(path):
+            listed.append(path)
+            return listdir(path)
+
+        os.listdir = countedListdir
+        try:
+            textures.buildTileIndex()
+            textures.buildTileIndex()
+            textures.validateTexturePaths(threads=1)
+        finally:
+            os.listdir = listdir
+        self.assertEqual(len(listed), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,275 @@
+import unittest
+from tests import standin
+
+standin.install()
+
+import maya.cmds as mc
+import vrayformayaUtils as vfm
+
+
+class TestAssignedMaterials(unittest.TestCase):
+    """
+        Tests resolving materials through shadingEngine membership against the stand-in scene.
+    """
+    def setUp(self):
+        self.scene = standin.install()
+        self.group = self.scene.createNode("transform", "grp")
+        self.meshA = self.scene.createMesh("meshA", parent=self.group)
+        self.meshB = self.scene.createMesh("meshB", parent=self.group)
+        self.meshC = self.scene.createMesh("meshC")
+        self.mtlA = self.scene.createNode("VRayMtl", "mtlA")
+        self.mtlB = self.scene.createNode("VRayMtl", "mtlB")
+        self.engineA = self.scene.assign([self.meshA, self.meshB], self.mtlA)
+        self.engineB = self.scene.assign([self.meshC], self.mtlB)
+
+    def test_shapes(self):
+        self.assertEqual(vfm.utils.getAssignedMaterials([self.meshA]), ["mtlA"])
+        self.assertEqual(sorted(vfm.utils.getAssignedMaterials([self.meshA, self.meshB, self.meshC])),
+                         ["mtlA", "mtlB"])
+
+    def test_transforms(self):
+        self.assertEqual(vfm.utils.getAssignedMaterials(["meshC"]), ["mtlB"])
+
+        # Only direct children shapes are resolved
+        self.assertEqual(vfm.utils.getAssignedMaterials([self.group]), [])
+
+    def test_materials_and_engines(self):
+        self.assertEqual(vfm.utils.getAssignedMaterials(["mtlB"]), ["mtlB"])
+        self.assertEqual(vfm.utils.getAssignedMaterials([self.engineA]), ["mtlA"])
+
+    def test_selection(self):
+        self.scene.selection = ["meshC"]
+        self.assertEqual(vfm.utils.getAssignedMaterials(), ["mtlB"])
+
+        self.scene.selection = []
+        self.assertEqual(vfm.utils.getAssignedMaterials(), [])
+
+    def test_volume(self):
+        volume = self.scene.createNode("VRayMtl", "volumeA")
+        self.scene.connect("volumeA.outColor", self.engineA + ".volumeShader")
+        self.assertEqual(vfm.utils.getAssignedMaterials([self.meshA]), ["mtlA"])
+        self.assertEqual(sorted(vfm.utils.getAssignedMaterials([self.meshA], volume=True)), ["mtlA", volume])
+
+
+class TestUniqueInstances(unittest.TestCase):
+    """
+        Tests collapsing instanced DAG paths to a single path per node.
+    """
+    def setUp(self):
+        self.scene = standin.install()
+        self.shape = self.scene.createMesh("rock")
+        for i in range(3):
+            self.scene.parent("rock", self.scene.createNode("transform", "set{0}".format(i)), add=True)
+        self.other = self.scene.createMesh("tree")
+
+    def test_uniqueInstances(self):
+        shapes = vfm.utils.getShapes(self.scene.selection + ["set0", "set1", "set2", "tree"])
+        self.assertEqual(len(shapes), 4)
+
+        unique, collapsed = vfm.utils.uniqueInstances(shapes)
+        self.assertEqual(unique, ["|set0|rock|rockShape", self.other])
+        self.assertEqual(collapsed, 2)
+
+    def test_empty(self):
+        self.assertEqual(vfm.utils.uniqueInstances([]), ([], 0))
+
+
+class TestStringAttributes(unittest.TestCase):
+    """
+        Tests reading string attributes through the API against the stand-in scene.
+    """
+    def setUp(self):
+        self.scene = standin.install()
+        for name in ("a", "b"):
+            self.scene.createNode("file", name)
+            mc.setAttr(name + ".fileTextureName", name + ".exr", type="string")
+        self.shape = self.scene.createMesh("rock")
+        for name in ("grpA", "grpB"):
+            self.scene.parent("rock", self.scene.createNode("transform", name), add=True)
+        self.scene.nodes["rockShape"].attrs["label"] = "rock"
+
+    def test_getStringAttributes(self):
+        self.assertEqual(vfm.utils.getStringAttributes(["a", "b"], "fileTextureName"), ["a.exr", "b.exr"])
+        self.assertEqual(vfm.utils.getStringAttributes(["b", "a"], ["fileTextureName", "fileTextureNamePattern"]),
+                         ["b.exr", ""])
+        self.assertEqual(vfm.utils.getStringAttributes([], "fileTextureName"), [])
+
+    def test_duplicates(self):
+        # Duplicate names and different paths of the same node keep a value per input
+        nodes = ["a", "b", "a", "|grpA|rock|rockShape", "|grpB|rock|rockShape", "rockShape"]
+        attrs = ["fileTextureName"] * 3 + ["label"] * 3
+        self.assertEqual(vfm.utils.getStringAttributes(nodes, attrs), ["a.exr", "b.exr", "a.exr"] + ["rock"] * 3)
+
+
+class TestBulkOperation(unittest.TestCase):
+    """
+        Tests the undo chunk and refresh suspension of bulk operations.
+    """
+    def setUp(self):
+        self.scene = standin.install()
+
+    def test_undo_chunk(self):
+        with vfm.utils.bulkOperation(["a", "b"]):
+            self.assertEqual(self.scene.openChunks, 1)
+            self.assertFalse(self.scene.refreshSuspended)
+        self.assertEqual(self.scene.openChunks, 0)
+        self.assertEqual(self.scene.undoChunks, [0])
+
+    def test_threshold(self):
+        with vfm.utils.bulkOperation(10, threshold=10):
+            self.assertTrue(self.scene.refreshSuspended)
+        self.assertFalse(self.scene.refreshSuspended)
+
+        with vfm.utils.bulkOperation(9, threshold=10):
+            self.assertFalse(self.scene.refreshSuspended)
+
+        with vfm.utils.bulkOperation(suspendRefresh=True):
+            self.assertTrue(self.scene.refreshSuspended)
+
+    def test_nested(self):
+        with vfm.utils.bulkOperation(suspendRefresh=True):
+            with vfm.utils.bulkOperation(suspendRefresh=True):
+                pass
+            self.assertTrue(self.scene.refreshSuspended)
+        self.assertFalse(self.scene.refreshSuspended)
+        self.assertEqual(self.scene.undoChunks, [1, 0])
+
+    def test_not_undoable(self):
+        with vfm.utils.bulkOperation(undoable=False):
+            self.assertFalse(self.scene.undoEnabled)
+            self.assertEqual(self.scene.openChunks, 0)
+        self.assertTrue(self.scene.undoEnabled)
+
+    def test_decorator(self):
+        @vfm.utils.bulkOperation(suspendRefresh=True)
+        def operation():
+            self.assertTrue(self.scene.refreshSuspended)
+            raise ValueError()
+
+        self.assertRaises(ValueError, operation)
+        self.assertFalse(self.scene.refreshSuspended)
+        self.assertEqual(self.scene.openChunks, 0)
+        self.assertEqual(operation.__name__, "operation")
+
+
+class TestConnectedSets(unittest.TestCase):
+    """
+        Tests the set membership queries against the stand-in scene.
+    """
+    def setUp(self):
+        self.scene = standin.install()
+        self.mesh = self.scene.createMesh("mesh")
+        self.material = self.scene.createNode("VRayMtl", "mtl")
+        self.props = self.scene.createNode("VRayObjectProperties", "props")
+        self.objectSet = self.scene.createNode("objectSet", "set")
+        self.scene.addMember("props", "mesh")
+        self.scene.addMember("set", "mesh")
+        self.scene.addMember("set", "mtl")
+
+        # A downstream connection to another set that isn't a membership
+        self.scene.connect("mesh.worldMatrix[0]", "set.dnSetMembers[5]")
+
+    def test_getConnectedSets(self):
+        self.assertEqual(sorted(vfm.utils.getConnectedSets(["mesh"])), ["props", "set"])
+        self.assertEqual(vfm.utils.getConnectedSets("mesh", type="VRayObjectProperties"), ["props"])
+        self.assertEqual(vfm.utils.getConnectedSets(["mtl"]), ["set"])
+        self.assertEqual(vfm.utils.getConnectedSets(["meshShape"]), [])
+        self.assertEqual(vfm.utils.getConnectedSets([]), [])
+
+    def test_getConnectedSets_components(self):
+        # Components are resolved to their shape instead of producing invalid plugs
+        self.scene.addMember("set", "meshShape")
+        self.assertEqual(mc.ls(["mesh.f[0:3]"], long=True), ["|mesh.f[0:3]"])
+        self.assertEqual(vfm.utils.getConnectedSets(["mesh.f[0:3]", "mesh.vtx[2]"]), ["set"])
+
+    def test_snapshot(self):
+        snapshot = vfm.utils.ConnectedSetsSnapshot(["mesh"], type="VRayObjectProperties")
+        other = self.scene.createNode("VRayObjectProperties", "props1")
+        self.scene.addMember(other, "mesh")
+        self.scene.removeMember("props", "mesh")
+        self.assertEqual(snapshot.diff(update=True), (set(["props1"]), set(["props"])))
+        self.assertEqual(snapshot.diff(), (set(), set()))
+
+
+class TestUpstreamTextures(unittest.TestCase):
+    """
+        Tests walking the shading networks against the stand-in scene.
+    """
+    def setUp(self):
+        self.scene = standin.install()
+        self.meshA = self.scene.createMesh("meshA")
+        self.meshB = self.scene.createMesh("meshB")
+        self.mtlA = self.scene.createNode("VRayMtl", "mtlA")
+        self.mtlB = self.scene.createNode("VRayMtl", "mtlB")
+        self.engineA = self.scene.assign([self.meshA], self.mtlA)
+        self.engineB = self.scene.assign([self.meshB], self.mtlB)
+
+        # mtlA and mtlB share a layered texture with a file, mtlA has its own file as well
+        for name, type in (("layered", "layeredTexture"), ("shared", "file"), ("own", "file"),
+                           ("place", "place2dTexture"), ("unused", "file")):
+            self.scene.createNode(type, name)
+        self.scene.connect("place.outUV", "shared.uvCoord")
+        self.scene.connect("shared.outColor", "layered.inputs[0].color")
+        self.scene.connect("layered.outColor", "mtlA.color")
+        self.scene.connect("layered.outColor", "mtlB.color")
+        self.scene.connect("own.outColor", "mtlA.bumpMap")
+
+    def test_getUpstreamTextures(self):
+        self.assertEqual(sorted(vfm.utils.getUpstreamTextures(["meshA"])), ["own", "shared"])
+        self.assertEqual(vfm.utils.getUpstreamTextures(["meshB"]), ["shared"])
+        self.assertEqual(sorted(vfm.utils.getUpstreamTextures([self.engineA, "mtlB"])), ["own", "shared"])
+        self.assertEqual(vfm.utils.getUpstreamTextures(["unused"]), ["unused"])
+        self.assertEqual(vfm.utils.getUpstreamTextures(["meshA"], textureTypes="place2dTexture"), ["place"])
+        self.assertEqual(vfm.utils.getUpstreamTextures([]), [])
+
+    def test_byMaterial(self):
+        textures = vfm.utils.getUpstreamTextures(["meshA", "meshB"], byMaterial=True)
+        self.assertEqual(sorted(textures), ["mtlA", "mtlB"])
+        self.assertEqual(sorted(textures["mtlA"]), ["own", "shared"])
+        self.assertEqual(textures["mtlB"], ["shared"])
+
+    def test_shared_network_queried_once(self):
+        self.scene.calls.clear()
+        vfm.utils.getUpstreamTextures(["mtlA", "mtlB"])
+        # A single query per level of the network: materials, layered/own, shared, place
+        self.assertEqual(self.scene.calls["listConnections"], 4)
+
+    def test_smartConvert(self):
+        vfm.attributes.vray_file_gamma(["meshB"], vrayFileGammaValue=2.0)
+        self.assertEqual(mc.getAttr("shared.vrayFileGammaValue"), 2.0)
+        self.assertFalse(mc.objExists("own.vrayFileGammaValue"))
+
+        self.assertRaises(RuntimeError, vfm.attributes.vray_file_gamma, ["meshB"], smartConvert=False)
+
+    def test_input_textures(self):
+        # Texture nodes in the input are used as they are, the textures upstream of them aren't included
+        self.scene.connect("own.outColor", "shared.colorGain")
+        self.assertEqual(vfm.utils.getUpstreamTextures(["shared"]), ["shared"])
+        self.assertEqual(vfm.utils.getUpstreamTextures(["shared"], byMaterial=True), {"shared": ["shared"]})
+        vfm.attributes.vray_file_gamma(["shared"], vrayFileGammaValue=2.0)
+        self.assertEqual(mc.getAttr("shared.vrayFileGammaValue"), 2.0)
+        self.assertFalse(mc.objExists("own.vrayFileGammaValue"))
+
+        # Other dependency nodes aren't walked
+        self.assertEqual(vfm.utils.getUpstreamTextures(["layered"]), [])
+
+    def test_imagePlane(self):
+        # Image planes are DAG shapes, they're used as they are instead of being resolved to their materials
+        camera = mc.createNode("transform", name="imagePlane1")
+        imagePlane = mc.createNode("imagePlane", name="imagePlaneShape1", parent=camera)
+        vfm.attributes.vray_file_gamma([imagePlane], vrayFileGammaValue=2.0)
+        self.assertEqual(mc.getAttr(imagePlane + ".vrayFileGammaValue"), 2.0)
+
+    def test_walk_stays_in_shading_network(self):
+        # A transform and an expression driving material attributes don't pull in what's upstream of them
+        for name, type in (("ctrl", "transform"), ("expr", "expression"), ("rigA", "file"), ("rigB", "file")):
+            self.scene.createNode(type, name)
+        self.scene.connect("rigA.outAlpha", "ctrl.translateX")
+        self.scene.connect("ctrl.translateX", "mtlA.diffuse")
+        self.scene.connect("rigB.outAlpha", "expr.input[0]")
+        self.scene.connect("expr.output[0]", "mtlB.diffuse")
+        self.assertEqual(sorted(vfm.utils.getUpstreamTextures(["meshA", "meshB"])), ["own", "shared"])
+
+
+if __name__ == "__main__":
+    unittest.main()
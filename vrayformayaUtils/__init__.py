@@ -10,5 +10,91 @@
 # TODO: Add v-ray object properties support (likely to objectProperties.py)
 
 # Making it easily accessible by just importing the full package.
-import attributes
-from core import *
+# The submodules are only imported on first access (e.g. `vfm.attributes` or `vfm.addRenderElement`) so importing
+# the package stays cheap for scripts that only need a single function.
+import importlib
+import sys
+import types
+
+#: The submodules that are imported on first attribute access of the package.
+_LAZY_SUBMODULES = ("attributes", "backend", "batch", "core", "objectProperties", "profiling", "sceneIndex", "textures",
+                    "utils")
+
+#: The names from submodules (other than core) that are available on the package, by the submodule they're in.
+_LAZY_ATTRIBUTES = {"profile": "profiling"}
+
+_coreExported = False
+
+
+def _import(name):
+    """ Import the submodule and set it on the package.
+
+    For module internal use.
+    """
+    module = importlib.import_module("{0}.{1}".format(__name__, name))
+    setattr(sys.modules[__name__], name, module)
+    return module
+
+
+def _importCore():
+    """ Import the core module and expose its public names on the package (like `from core import *`).
+
+    For module internal use.
+    """
+    global _coreExported
+    core = _import("core")
+    names = getattr(core, "__all__", None)
+    if names is None:
+        names = [name for name in vars(core) if not name.startswith("_")]
+    namespace = vars(sys.modules[__name__])
+    for name in names:
+        # Don't replace submodules that were already loaded
+        namespace.setdefault(name, getattr(core, name))
+    _coreExported = True
+    return core
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        if name == "core":
+            return _importCore()
+        return _import(name)
+
+    package = sys.modules[__name__]
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(_import(_LAZY_ATTRIBUTES[name]), name)
+        setattr(package, name, value)
+        return value
+
+    if not name.startswith("__") and not _coreExported:
+        _importCore()
+        if name in vars(package):
+            return vars(package)[name]
+
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+
+def __dir__():
+    _importCore()
+    return sorted(set(vars(sys.modules[__name__])) | set(_LAZY_SUBMODULES) | set(_LAZY_ATTRIBUTES))
+
+
+class _LazyPackage(types.ModuleType):
+    """ The package module on Python versions without module level __getattr__ (before 3.7).
+
+    For module internal use.
+    """
+    def __getattr__(self, name):
+        return __getattr__(name)
+
+    def __dir__(self):
+        return __dir__()
+
+
+# Module level __getattr__ requires Python 3.7, older versions replace the package by a module that implements it.
+if sys.version_info < (3, 7):
+    _package = _LazyPackage(__name__)
+    _package.__dict__.update(globals())
+    # Keep the original module alive, Python 2 clears the globals of a module when it is deleted
+    _package._module = sys.modules[__name__]
+    sys.modules[__name__] = _package
@@ -20,6 +20,8 @@
         It allows the input list to be interpreted as 'get related objects that can have this attribute'.
         This means you can actually apply a ``vray_material_id`` to a mesh.
         It will get the related assigned material and applies it to that. Easy right?
+        The texture functions (like ``vray_file_gamma``) likewise collect all texture nodes upstream of the
+        materials of the input, texture nodes in the input are used as they are.
 
         If you don't want this automatic conversion doing anything you can set the smartConvert parameter to False.
 
@@ -49,12 +51,59 @@
         ``addAttributesGroup`` creates the given attribute group even if it's not relevant to the node you supply.
         In short the default vray command doesn't come with error checking; this framework helps by doing just that.
 
+    - **Instances are processed once**
+
+        Shapes are collected with all their DAG paths, so an instanced shape would be found once per instance. Since
+        attributes live on the underlying node every instanced node is only processed once. The amount of collapsed
+        instance paths is available on the returned result as ``collapsed``.
+
+    - **Single undo step**
+
+        Every attribute function is recorded as a single undo step. Operations on many nodes (see
+        ``vrayformayaUtils.utils.BULK_THRESHOLD``) also suspend the viewport refresh while running. To combine several
+        attribute functions into one undo step use ``vrayformayaUtils.utils.bulkOperation``.
+
+    - **Skip unchanged nodes (skipUnchanged parameter)**
+
+        Re-running the same attribute function on a finished scene doesn't have to cost as much as the first run.
+        With skipUnchanged set to True the existing attributes and their values are queried up front and only the
+        nodes that actually need to change are processed. The returned result lists both the changed and the
+        skipped nodes, e.g. ``len(vray_subdivision(skipUnchanged=True).skipped)``.
+
+    - **Dry-run (plan function)**
+
+        Every attribute function can be planned with ``plan`` which returns the operations it would do without
+        changing the scene. The plan can be inspected and executed afterwards, e.g.
+        ``plan(vray_subdivision, nodes, vraySubdivEnable=True).execute()``.
+
+    - **Attribute groups registry**
+
+        Every attribute function is described in ``ATTRIBUTE_GROUPS`` by its v-ray attribute group name, valid node
+        types and the types of its attributes. All functions share the same implementation that converts the input,
+        validates the attribute values and applies them in bulk.
+
 
     Functions
     =========
 """
+import inspect
+from collections import namedtuple, OrderedDict
+
 import maya.cmds as mc
-from vrayformayaUtils.utils import getShapes, getMaterials
+from vrayformayaUtils import backend
+from vrayformayaUtils.utils import (getShapes, getAssignedMaterials, getUpstreamTextures, uniqueInstances,
+                                    bulkOperation, TEXTURE_TYPES)
+from vrayformayaUtils.batch import planAttributeGroup
+
+try:
+    basestring
+except NameError:
+    basestring = str
+
+try:
+    _getargspec = inspect.getfullargspec
+except AttributeError:
+    _getargspec = inspect.getargspec
 
 
 def _convert_state(state):
@@ -90,19 +139,413 @@ def _convert_input_shapes(shapes=None, smartConvert=True, allDescendents=True, f
 
         filterType = filterType + ("transform",)
 
+    scene = backend.getBackend()
+
     # If None provided as input list use selection
     if shapes is None:
-        shapes = mc.ls(sl=1, long=True)
+        shapes = scene.ls()
 
     # Convert to related shapes if smartConvert else get directly from input shapes.
     if smartConvert:
         shapes = getShapes(shapes, allDescendents=allDescendents, filterType=filterType)
     else:
-        shapes = mc.ls(shapes, filterType, long=True)
+        shapes = scene.ls(shapes, filterType)
 
     return shapes
 
 
+#####################
+# attribute groups registry
+#####################
+
+#: Describes a v-ray attribute group:
+#:
+#:  - name: The name of the function in this module managing the attribute group.
+#:  - group: The name of the attribute group as used by ``mc.vray("addAttributesFromGroup", ..)``.
+#:  - validTypes: The node types that can have the attribute group.
+#:  - inputs: How the input list is converted. One of "shapes", "materials", "nodes" or "transforms".
+#:  - label: Describes the valid nodes in error messages, e.g. "meshes".
+#:  - attributes: The (attribute, type) pairs of the group. Type is one of "bool", "int", "enum", "float", "string",
+#:    "double3" or None to pass the value through unchanged.
+AttributeGroup = namedtuple("AttributeGroup", ["name", "group", "validTypes", "inputs", "label", "attributes"])
+
+#: The registered attribute groups by function name.
+ATTRIBUTE_GROUPS = OrderedDict()
+
+
+def _register(name, group, validTypes, attributes=(), inputs="shapes", label="shapes"):
+    """ Register an attribute group in ATTRIBUTE_GROUPS.
+
+    For module internal use.
+    """
+    ATTRIBUTE_GROUPS[name] = AttributeGroup(name=name,
+                                            group=group,
+                                            validTypes=tuple(validTypes),
+                                            inputs=inputs,
+                                            label=label,
+                                            attributes=tuple(attributes))
+
+
+_LIGHT_ATTRIBUTES = (("vrayPhotonSubdivs", "int"),
+                     ("vrayDiffuseMult", "float"),
+                     ("vrayCausticSubdivs", "int"),
+                     ("vrayCausticMult", "float"),
+                     ("vrayShadowBias", "float"))
+
+_LIGHT_MB_ATTRIBUTES = (("vrayOverrideMBSamples", "bool"),
+                        ("vrayMBSamples", "int"))
+
+# mesh, nurbsSurface
+_register("vray_object_id", "vray_objectID",
+          ("mesh", "nurbsSurface", "VRayLightDomeShape", "VRayLightRectShape", "VRayLightSphereShape"),
+          [("vrayObjectID", "int")])
+_register("vray_user_attributes", "vray_user_attributes", ("mesh", "nurbsSurface"),
+          [("vrayUserAttributes", "string")])
+
+# mesh
+_register("vray_subdivision", "vray_subdivision", ("mesh",),
+          [("vraySubdivEnable", "bool"),
+           ("vraySubdivUVs", "bool"),
+           ("vrayPreserveMapBorders", "enum"),
+           ("vrayStaticSubdiv", "bool"),
+           ("vrayClassicalCatmark", "bool")],
+          label="meshes")
+_register("vray_subquality", "vray_subquality", ("mesh",),
+          [("vrayOverrideGlobalSubQual", "bool"),
+           ("vrayViewDep", "bool"),
+           ("vrayEdgeLength", "float"),
+           ("vrayMaxSubdivs", "int")],
+          label="meshes")
+_register("vray_displacement", "vray_displacement", ("mesh",),
+          [("vrayDisplacementNone", "bool"),
+           ("vrayDisplacementStatic", "bool"),
+           ("vrayDisplacementType", "enum"),
+           ("vrayDisplacementAmount", "float"),
+           ("vrayDisplacementShift", "float"),
+           ("vrayDisplacementKeepContinuity", "bool"),
+           ("vrayEnableWaterLevel", "bool"),
+           ("vrayWaterLevel", "float"),
+           ("vray2dDisplacementResolution", "int"),
+           ("vray2dDisplacementPrecision", "int"),
+           ("vray2dDisplacementTightBounds", "bool"),
+           ("vray2dDisplacementFilterTexture", "bool"),
+           ("vray2dDisplacementFilterBlur", "float"),
+           ("vrayDisplacementUseBounds", "enum"),
+           ("vrayDisplacementMinValue", "double3"),
+           ("vrayDisplacementMaxValue", "double3")],
+          label="meshes")
+_register("vray_roundedges", "vray_roundedges", ("mesh",),
+          [("vrayRoundEdges", "bool"),
+           ("vrayRoundEdgesRadius", "float")],
+          label="meshes")
+_register("vray_fogFadeOut", "vray_fogFadeOut", ("mesh",),
+          [("vrayFogFadeOut", "float")],
+          label="meshes")
+_register("vray_phoenix_object", "vray_phoenix_object", ("mesh",),
+          [("vrayPhoenixObjVoxels", "enum")],
+          label="meshes")
+
+# nurbsSurface (note the typo in the actual v-ray attribute group name)
+_register("vray_nurbsStaticGeom", "vray_nusrbsStaticGeom", ("nurbsSurface",),
+          [("vrayAsStaticGeom", "bool"),
+           ("vrayMaxSubdivDepth", "int"),
+           ("vrayFlatnessCoef", "float")])
+
+# nurbsCurve
+_register("vray_nurbscurve_renderable", "vray_nurbscurve_renderable", ("nurbsCurve",),
+          [("vrayNurbsCurveRenderable", "bool"),
+           # TODO: Test if this works, it's likely that this needs to have a connection instead of 'value'
+           ("vrayNurbsCurveMaterial", None),
+           ("vrayNurbsCurveTesselation", "int"),
+           ("vrayNurbsCurveStartWidth", "float"),
+           ("vrayNurbsCurveLockEndWidth", "bool"),
+           ("vrayNurbsCurveEndWidth", "float")])
+
+# materials
+_register("vray_material_id", "vray_material_id", (), [("vrayMaterialId", "int")],
+          inputs="materials", label="materials")
+_register("vray_specific_mtl", "vray_specific_mtl", (),
+          inputs="materials", label="materials")
+_register("vray_closed_volume", "vray_closed_volume", (), [("vrayClosedVolume", "bool")],
+          inputs="materials", label="materials")
+
+# camera
+_register("vray_cameraPhysical", "vray_cameraPhysical", ("camera",),
+          label="cameras")
+_register("vray_cameraOverrides", "vray_cameraOverrides", ("camera",),
+          [("vrayCameraOverridesOn", "bool"),
+           ("vrayCameraType", "enum"),
+           ("vrayCameraOverrideFOV", "bool"),
+           ("vrayCameraFOV", "float"),
+           ("vrayCameraHeight", "float"),
+           ("vrayCameraAutoFit", "bool"),
+           ("vrayCameraDist", "float"),
+           ("vrayCameraCurve", "float")],
+          label="cameras")
+_register("vray_cameraDome", "vray_cameraDome", ("camera",),
+          [("vrayCameraDomeOn", "bool"),
+           ("vrayCameraDomeFlipX", "bool"),
+           ("vrayCameraDomeFlipY", "bool"),
+           ("vrayCameraDomeFov", "float")],
+          label="cameras")
+
+# lights
+_register("vray_light", "vray_light", ("ambientLight",),
+          _LIGHT_ATTRIBUTES + (("vrayCutoffThreshold", "float"),) + _LIGHT_MB_ATTRIBUTES,
+          label="lights")
+_register("vray_directlight", "vray_directlight", ("directionalLight",),
+          _LIGHT_ATTRIBUTES + (("vrayDiffuseContrib", "float"),
+                               ("vraySpecularContrib", "float"),
+                               ("vrayStoreWithIrradianceMap", "bool")) + _LIGHT_MB_ATTRIBUTES,
+          label="lights")
+_register("vray_pointLight", "vray_pointLight", ("spotLight", "pointLight"),
+          _LIGHT_ATTRIBUTES + (("vrayCutoffThreshold", "float"),
+                               ("vrayDiffuseContrib", "float"),
+                               ("vraySpecularContrib", "float"),
+                               ("vrayStoreWithIrradianceMap", "bool")) + _LIGHT_MB_ATTRIBUTES,
+          label="lights")
+_register("vray_arealight", "vray_arealight", ("areaLight",),
+          _LIGHT_ATTRIBUTES + (("vrayCutoffThreshold", "float"),
+                               ("vrayDiffuseContrib", "float"),
+                               ("vraySpecularContrib", "float"),
+                               ("vrayInvisible", "bool")) + _LIGHT_MB_ATTRIBUTES,
+          label="lights")
+
+# file
+_register("vray_file_gamma", "vray_file_gamma", ("file", "VRayPtex", "substance", "imagePlane"),
+          [("vrayFileGammaEnable", "bool"),
+           ("vrayFileColorSpace", "enum"),
+           ("vrayFileGammaValue", "float")],
+          inputs="nodes", label="texture nodes")
+_register("vray_file_allow_neg_colors", "vray_file_allow_neg_colors", ("file", "substance", "imagePlane"),
+          [("vrayFileAllowNegColors", "bool")],
+          inputs="nodes", label="texture nodes")
+_register("vray_file_ifl", "vray_file_ifl", ("file",),
+          [("vrayFileIFLStartFrame", "int"),
+           ("vrayFileIFLEndCondition", "enum"),
+           ("vrayFileIFLPlaybackRate", "float")],
+          inputs="nodes", label="file nodes")
+_register("vray_texture_filter", "vray_texture_filter", ("file", "substance"),
+          [("vrayOverrideTextureFilter", "bool"),
+           ("vrayTextureFilter", "enum"),
+           ("vrayTextureSmoothType", "enum")],
+          inputs="nodes", label="texture nodes")
+
+# place2dTexture
+_register("vray_2d_placement_options", "vray_2d_placement_options", ("place2dTexture",),
+          [("vrayUVSetName", "string")],
+          inputs="nodes", label="place2dTexture nodes")
+
+# samplerInfo
+_register("vray_samplerinfo_extra_tex", "vray_samplerinfo_extra_tex", ("samplerInfo",),
+          [("vrayNormalObj", None),
+           ("vrayNormalWorld", None),
+           ("vrayGNormalWorld", None),
+           ("vrayPointWorldReferenceX", None),
+           ("vrayNormalWorldReferenceX", None),
+           ("vrayRayDepth", None),
+           ("vrayPathLength", None)],
+          inputs="nodes", label="samplerInfo nodes")
+
+# transform
+_register("vray_skip_export", "vray_skip_export", ("transform",),
+          [("vraySkipExport", "bool")],
+          inputs="transforms", label="transforms")
+
+
+#####################
+# attribute groups engine
+#####################
+
+_VALUE_CONVERTERS = {"bool": bool,
+                     "int": int,
+                     "enum": int,
+                     "float": float,
+                     "double3": lambda value: tuple(float(x) for x in value)}
+
+
+def _convert_value(attr, attrType, value):
+    """ Convert the user input value to the type of the attribute.
+
+    For module internal use.
+
+    :return: Converted value
+    """
+    if value is None or attrType is None:
+        return value
+
+    if attrType == "string":
+        if not isinstance(value, basestring):
+            raise TypeError("{0} argument must be a string, not {1}".format(attr, type(value)))
+        return value
+
+    try:
+        return _VALUE_CONVERTERS[attrType](value)
+    except (ValueError, TypeError):
+        raise TypeError("{0} argument must be a {1} convertable type, not {2}".format(attr, attrType, type(value)))
+
+
+def _convert_input(group, nodes, smartConvert=True, allDescendents=True, allowTransform=False):
+    """ Converts the input list to the nodes that can have the attribute group.
+
+    For module internal use.
+
+    :param group: The attribute group to convert the input for.
+    :type  group: AttributeGroup
+
+    :rtype: list
+    """
+    if group.inputs == "shapes":
+        return _convert_input_shapes(shapes=nodes, smartConvert=smartConvert, allDescendents=allDescendents,
+                                     filterType=group.validTypes, allowTransform=allowTransform)
+
+    if group.inputs == "materials":
+        if nodes is None:
+            nodes = mc.ls(sl=1)
+
+        if smartConvert:
+            return getAssignedMaterials(nodes)
+        else:
+            return mc.ls(nodes, mat=True)
+
+    scene = backend.getBackend()
+    if nodes is None:
+        nodes = scene.ls()
+
+    if group.inputs == "transforms":
+        if smartConvert:
+            # Include parent transform of a shape node
+            shapes = mc.ls(nodes, s=True, long=True)
+            if shapes:
+                shapeParents = mc.listRelatives(shapes, fullPath=True, parent=True)
+                if shapeParents:
+                    nodes = list(nodes) + shapeParents
+
+    if group.inputs == "nodes" and smartConvert and set(group.validTypes) & set(TEXTURE_TYPES):
+        # Include the textures in the shading networks of the input (meshes, shadingEngines, materials), the valid
+        # nodes in the input (e.g. file nodes and image planes) are used as they are
+        return getUpstreamTextures(nodes, textureTypes=group.validTypes)
+
+    # TODO: Implement smart convert for the other "nodes" inputs
+    return scene.ls(nodes, group.validTypes)
+
+
+def _plan_group(name, nodes, kwargs):
+    """ Plan adding/removing the registered attribute group `name` and setting its attribute values.
+
+    This is the single implementation behind all attribute functions in this module. The attribute functions pass
+    their input list and their keyword arguments (``locals()``), the registry decides which of those keywords are
+    attribute values.
+
+    For module internal use.
+
+    :param name: The name of the registered attribute group.
+    :type  name: str
+
+    :param nodes: The input list. If None the current selection is used.
+
+    :param kwargs: The keyword arguments of the attribute function.
+    :type  kwargs: dict
+
+    :rtype: vrayformayaUtils.batch.GroupPlan
+    """
+    group = ATTRIBUTE_GROUPS[name]
+    state = _convert_state(kwargs.get("state", 1))
+
+    nodes = _convert_input(group, nodes,
+                           smartConvert=kwargs.get("smartConvert", True),
+                           allDescendents=kwargs.get("allDescendents", True),
+                           allowTransform=kwargs.get("allowTransform", False))
+
+    if not nodes:
+        raise RuntimeError("No {0} found to apply the {1} attribute group changes to.".format(group.label, name))
+
+    # Process each instanced node only once
+    collapsed = 0
+    if group.inputs in ("shapes", "transforms"):
+        nodes, collapsed = uniqueInstances(nodes)
+
+    values = [(attr, _convert_value(attr, attrType, kwargs.get(attr))) for attr, attrType in group.attributes]
+
+    plan = planAttributeGroup(nodes, group.group, state,
+                              values=values,
+                              skipUnchanged=kwargs.get("skipUnchanged", False))
+    plan.collapsed = collapsed
+    return plan
+
+
+def _apply_group(name, nodes, kwargs):
+    """ Add/remove the registered attribute group `name` and set its attribute values.
+
+    For module internal use, see `_plan_group`.
+
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    plan = _plan_group(name, nodes, kwargs)
+
+    # Suspend the viewport refresh for large operations
+    with bulkOperation(len(plan)):
+        return plan.execute()
+
+
+def _bind_arguments(name, kwargs):
+    """ Return the keyword arguments of the attribute function `name` completed with the function's own defaults.
+
+    This gives `plan` the same arguments as the attribute function receives when it is called (its ``locals()``).
+
+    For module internal use.
+
+    :raises TypeError: If a keyword isn't an argument of the attribute function.
+
+    :rtype: dict
+    """
+    function = globals()[name]
+    # The profiling module wraps the public functions
+    function = getattr(function, "__wrapped__", function)
+
+    spec = _getargspec(function)
+    # The first argument is the input list
+    arguments = spec.args[1:]
+    bound = dict(zip(arguments, spec.defaults[-len(arguments):]))
+    for key, value in kwargs.items():
+        if key not in bound:
+            raise TypeError("{0}() got an unexpected keyword argument '{1}'".format(name, key))
+        bound[key] = value
+    return bound
+
+
+def plan(function, nodes=None, **kwargs):
+    """ Plan the changes of an attribute function without changing the scene (dry-run).
+
+    The returned plan lists every operation as a (node, group, action, values) tuple and can be executed afterwards,
+    which returns the nodes that were changed. For example to validate before committing the changes:
+
+    .. code-block:: python
+
+        import vrayformayaUtils as vfm
+
+        plan = vfm.attributes.plan(vfm.attributes.vray_subdivision, vraySubdivEnable=True, skipUnchanged=True)
+        for node, group, action, values in plan.operations:
+            print node, action, values
+
+        result = plan.execute()
+
+    :param function: The attribute function (or its name) to plan, e.g. ``vray_subdivision``.
+    :type  function: function or str
+
+    :param nodes: The input list of the attribute function. If None the current selection is used.
+
+    :param kwargs: The keyword arguments of the attribute function.
+
+    :rtype: vrayformayaUtils.batch.GroupPlan
+    """
+    name = getattr(function, "__name__", function)
+    if name not in ATTRIBUTE_GROUPS:
+        raise ValueError("{0} is not a registered attribute group function".format(name))
+
+    return _plan_group(name, nodes, _bind_arguments(name, kwargs))
+
+
 #####################
 # mesh, nurbsSurface
 #####################
@@ -112,7 +555,8 @@ def vray_object_id(shapes=None,
                      smartConvert=True,
                      allDescendents=True,
                      allowTransform=False,
-                     vrayObjectID=None):
+                     vrayObjectID=None,
+                     skipUnchanged=False):
     """ Add/change the V-ray Object ID *(vray_object_id)* attribute to selected meshes
 
     Valid node types: (mesh, nurbsSurface, VRayLightDomeShape, VRayLightRectShape, VRayLightSphereShape, transform)
@@ -146,27 +590,15 @@ def vray_object_id(shapes=None,
 
     :param vrayObjectID: The object ID number value. If None remains default/unchanged.
     :type  vrayObjectID: None or int
-    """
-    state = _convert_state(state)
-
-    validTypes = ("mesh",
-                  "nurbsSurface",
-                  "VRayLightDomeShape",
-                  "VRayLightRectShape",
-                  "VRayLightSphereShape")
-    shapes = _convert_input_shapes(shapes=shapes, smartConvert=smartConvert, allDescendents=allDescendents,
-                                   filterType=validTypes, allowTransform=allowTransform)
 
-    if not shapes:
-        raise RuntimeError("No shapes found to apply the vray_object_id attribute group changes to.")
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-    for shape in shapes:
-        mc.vray("addAttributesFromGroup", shape, "vray_objectID", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayObjectID is not None:
-                mc.setAttr("{0}.vrayObjectID".format(shape), vrayObjectID)
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    return _apply_group("vray_object_id", shapes, locals())
 
 
 def vray_user_attributes(shapes=None,
@@ -174,7 +606,8 @@ def vray_user_attributes(shapes=None,
                      smartConvert=True,
                      allDescendents=True,
                      allowTransform=False,
-                     vrayUserAttributes=None):
+                     vrayUserAttributes=None,
+                     skipUnchanged=False):
     """ Add/change the User Attributes *(vray_user_attributes)* attribute to input shapes/transforms.
 
     Valid node types: (mesh, nurbsSurface, transform)
@@ -201,24 +634,15 @@ def vray_user_attributes(shapes=None,
 
     :param vrayUserAttributes: The actual user attribute string value. If None it remains default/unchanged.
     :type  vrayUserAttributes: None or str
-    """
-
-    state = _convert_state(state)
 
-    validTypes = ("mesh", "nurbsSurface")
-    shapes = _convert_input_shapes(shapes=shapes, smartConvert=smartConvert, allDescendents=allDescendents,
-                                   filterType=validTypes, allowTransform=allowTransform)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-    if not shapes:
-        raise RuntimeError("No shapes found to apply the vray_user_attributes attribute group changes to.")
-
-    for shape in shapes:
-        mc.vray("addAttributesFromGroup", shape, "vray_user_attributes", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayUserAttributes is not None:
-                mc.setAttr("{0}.vrayUserAttributes".format(shape), vrayUserAttributes, type="string")
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    return _apply_group("vray_user_attributes", shapes, locals())
 
 
 ##########
@@ -233,7 +657,8 @@ def vray_subdivision(shapes=None,
                      vraySubdivUVs=None,
                      vrayPreserveMapBorders=None,
                      vrayStaticSubdiv=None,
-                     vrayClassicalCatmark=None):
+                     vrayClassicalCatmark=None,
+                     skipUnchanged=False):
     """ Add/change the Subdivision ``vray_subdivision`` attribute to input meshes.
 
     Valid node types: (mesh)
@@ -266,32 +691,15 @@ def vray_subdivision(shapes=None,
 
     :param vrayClassicalCatmark: Enable/disable vrayClassicalCatmark. If None it remains default/unchanged.
     :type  vrayClassicalCatmark: None or bool
-    """
-
-    state = _convert_state(state)
 
-    validTypes = ("mesh")
-    shapes = _convert_input_shapes(shapes=shapes, smartConvert=smartConvert, allDescendents=allDescendents,
-                                   filterType=validTypes)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-    if not shapes:
-        raise RuntimeError("No meshes found to apply the vray_subdivision attribute group changes to.")
-
-    for shape in shapes:
-        mc.vray("addAttributesFromGroup", shape, "vray_subdivision", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vraySubdivEnable is not None:
-                mc.setAttr("{0}.vraySubdivEnable".format(shape), vraySubdivEnable)
-            if vraySubdivUVs is not None:
-                mc.setAttr("{0}.vraySubdivUVs".format(shape), vraySubdivUVs)
-            if vrayPreserveMapBorders is not None:
-                mc.setAttr("{0}.vrayPreserveMapBorders".format(shape), vrayPreserveMapBorders)
-            if vrayStaticSubdiv is not None:
-                mc.setAttr("{0}.vrayStaticSubdiv".format(shape), vrayStaticSubdiv)
-            if vrayClassicalCatmark is not None:
-                mc.setAttr("{0}.vrayClassicalCatmark".format(shape), vrayClassicalCatmark)
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    return _apply_group("vray_subdivision", shapes, locals())
 
 
 def vray_subquality(shapes=None,
@@ -301,7 +709,8 @@ def vray_subquality(shapes=None,
                      vrayOverrideGlobalSubQual=None,
                      vrayViewDep=None,
                      vrayEdgeLength=None,
-                     vrayMaxSubdivs=None):
+                     vrayMaxSubdivs=None,
+                     skipUnchanged=False):
     """ Add/change the Subdivision and Displacement Quality ``vray_subquality`` attribute to input meshes
 
     Valid node types: (mesh)
@@ -327,30 +736,15 @@ def vray_subquality(shapes=None,
 
     :param vrayMaxSubdivs: Set the maximum subdivisions. If None it remains default/unchanged.
     :type  vrayMaxSubdivs: None or int
-    """
 
-    state = _convert_state(state)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-    validTypes = ("mesh")
-    shapes = _convert_input_shapes(shapes=shapes, smartConvert=smartConvert, allDescendents=allDescendents,
-                                   filterType=validTypes)
-
-    if not shapes:
-        raise RuntimeError("No meshes found to apply the vray_subquality attribute group changes to.")
-
-    for shape in shapes:
-        mc.vray("addAttributesFromGroup", shape, "vray_subquality", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayOverrideGlobalSubQual is not None:
-                mc.setAttr("{0}.vrayOverrideGlobalSubQual".format(shape), vrayOverrideGlobalSubQual)
-            if vrayViewDep is not None:
-                mc.setAttr("{0}.vrayViewDep".format(shape), vrayViewDep)
-            if vrayEdgeLength is not None:
-                mc.setAttr("{0}.vrayEdgeLength".format(shape), vrayEdgeLength)
-            if vrayMaxSubdivs is not None:
-                mc.setAttr("{0}.vrayMaxSubdivs".format(shape), vrayMaxSubdivs)
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    return _apply_group("vray_subquality", shapes, locals())
 
 
 def vray_displacement(shapes=None,
@@ -372,7 +766,8 @@ def vray_displacement(shapes=None,
                      vray2dDisplacementFilterBlur=None,
                      vrayDisplacementUseBounds=None,
                      vrayDisplacementMinValue=None,
-                     vrayDisplacementMaxValue=None):
+                     vrayDisplacementMaxValue=None,
+                     skipUnchanged=False):
     """ Add/change the Displacement Control ``vray_displacement`` attribute to input meshes.
 
     Valid node types: (mesh)
@@ -444,55 +839,14 @@ def vray_displacement(shapes=None,
     :param vrayDisplacementMaxValue: Set the min value bounds. If None it remains default/unchanged.
     :type  vrayDisplacementMaxValue: None or double3
 
-    """
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-    state = _convert_state(state)
-
-    validTypes = ("mesh")
-    shapes = _convert_input_shapes(shapes=shapes, smartConvert=smartConvert, allDescendents=allDescendents,
-                                   filterType=validTypes)
-
-    if not shapes:
-        raise RuntimeError("No meshes found to apply the vray_displacement attribute group changes to.")
-
-    for shape in shapes:
-        mc.vray("addAttributesFromGroup", shape, "vray_displacement", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-
-            if vrayDisplacementNone is not None:
-                mc.setAttr("{0}.vrayDisplacementNone".format(shape), vrayDisplacementNone)
-            if vrayDisplacementStatic is not None:
-                mc.setAttr("{0}.vrayDisplacementStatic".format(shape), vrayDisplacementStatic)
-            if vrayDisplacementType is not None:
-                mc.setAttr("{0}.vrayDisplacementType".format(shape), vrayDisplacementType)
-            if vrayDisplacementAmount is not None:
-                mc.setAttr("{0}.vrayDisplacementAmount".format(shape), vrayDisplacementAmount)
-            if vrayDisplacementShift is not None:
-                mc.setAttr("{0}.vrayDisplacementShift".format(shape), vrayDisplacementShift)
-            if vrayDisplacementKeepContinuity is not None:
-                mc.setAttr("{0}.vrayDisplacementKeepContinuity".format(shape), vrayDisplacementKeepContinuity)
-            if vrayEnableWaterLevel is not None:
-                mc.setAttr("{0}.vrayEnableWaterLevel".format(shape), vrayEnableWaterLevel)
-            if vrayWaterLevel is not None:
-                mc.setAttr("{0}.vrayWaterLevel".format(shape), vrayWaterLevel)
-            if vray2dDisplacementResolution is not None:
-                mc.setAttr("{0}.vray2dDisplacementResolution".format(shape), vray2dDisplacementResolution)
-            if vray2dDisplacementPrecision is not None:
-                mc.setAttr("{0}.vray2dDisplacementPrecision".format(shape), vray2dDisplacementPrecision)
-            if vray2dDisplacementTightBounds is not None:
-                mc.setAttr("{0}.vray2dDisplacementTightBounds".format(shape), vray2dDisplacementTightBounds)
-            if vray2dDisplacementFilterTexture is not None:
-                mc.setAttr("{0}.vray2dDisplacementFilterTexture".format(shape), vray2dDisplacementFilterTexture)
-            if vray2dDisplacementFilterBlur is not None:
-                mc.setAttr("{0}.vray2dDisplacementFilterBlur".format(shape), vray2dDisplacementFilterBlur)
-            if vrayDisplacementUseBounds is not None:
-                mc.setAttr("{0}.vrayDisplacementUseBounds".format(shape), vrayDisplacementUseBounds)
-            if vrayDisplacementMinValue is not None:
-                mc.setAttr("{0}.vrayDisplacementMinValue".format(shape), vrayDisplacementMinValue)
-            if vrayDisplacementMaxValue is not None:
-                mc.setAttr("{0}.vrayDisplacementMaxValue".format(shape), vrayDisplacementMaxValue)
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    return _apply_group("vray_displacement", shapes, locals())
 
 
 def vray_roundedges(shapes=None,
@@ -500,7 +854,8 @@ def vray_roundedges(shapes=None,
                      smartConvert=True,
                      allDescendents=True,
                      vrayRoundEdges=None,
-                     vrayRoundEdgesRadius=None):
+                     vrayRoundEdgesRadius=None,
+                     skipUnchanged=False):
     """ Add/change the Round Edges ``vray_roundedges`` attribute to input meshes.
 
     Valid node types: (mesh, shadingEngine)
@@ -520,34 +875,24 @@ def vray_roundedges(shapes=None,
 
     :param vrayRoundEdgesRadius: Set the round edges radius. If None it remains default/unchanged.
     :type  vrayRoundEdgesRadius: None or float
-    """
-    # TODO: Support mode to apply vray_roundedges on shadingEngine instead of material
-
-    state = _convert_state(state)
 
-    validTypes = ("mesh")
-    shapes = _convert_input_shapes(shapes=shapes, smartConvert=smartConvert, allDescendents=allDescendents,
-                                   filterType=validTypes)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-    if not shapes:
-        raise RuntimeError("No meshes found to apply the vray_roundedges attribute group changes to.")
-
-    for shape in shapes:
-        mc.vray("addAttributesFromGroup", shape, "vray_roundedges", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayRoundEdges is not None:
-                mc.setAttr("{0}.vrayRoundEdges".format(shape), vrayRoundEdges)
-            if vrayRoundEdgesRadius is not None:
-                mc.setAttr("{0}.vrayRoundEdgesRadius".format(shape), vrayRoundEdgesRadius)
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    # TODO: Support mode to apply vray_roundedges on shadingEngine instead of material
+    return _apply_group("vray_roundedges", shapes, locals())
 
 
 def vray_fogFadeOut(shapes=None,
                      state=1,
                      smartConvert=True,
                      allDescendents=True,
-                     vrayFogFadeOut=None):
+                     vrayFogFadeOut=None,
+                     skipUnchanged=False):
     """ Add/change the Fog Fade Out ``vray_fogFadeOut`` attribute to input meshes.
 
     Valid node types: (mesh)
@@ -564,31 +909,23 @@ def vray_fogFadeOut(shapes=None,
 
     :param vrayFogFadeOut: Set the fog fade out radius. If None it remains default/unchanged.
     :type  vrayFogFadeOut: None or float
-    """
 
-    state = _convert_state(state)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-    validTypes = ("mesh")
-    shapes = _convert_input_shapes(shapes=shapes, smartConvert=smartConvert, allDescendents=allDescendents,
-                                   filterType=validTypes)
-
-    if not shapes:
-        raise RuntimeError("No meshes found to apply the vray_fogFadeOut attribute group changes to.")
-
-    for shape in shapes:
-        mc.vray("addAttributesFromGroup", shape, "vray_fogFadeOut", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayFogFadeOut is not None:
-                mc.setAttr("{0}.vrayFogFadeOut".format(shape), vrayFogFadeOut)
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    return _apply_group("vray_fogFadeOut", shapes, locals())
 
 
 def vray_phoenix_object(shapes=None,
                      state=1,
                      smartConvert=True,
                      allDescendents=True,
-                     vrayPhoenixObjVoxels=None):
+                     vrayPhoenixObjVoxels=None,
+                     skipUnchanged=False):
     """ Add/change the Phoenix Object Properties ``vray_phoenix_object`` attribute to input meshes.
 
     Valid node types: (mesh)
@@ -611,24 +948,16 @@ def vray_phoenix_object(shapes=None,
                                     1. Center,
                                     2. Inscribed
     :type  vrayPhoenixObjVoxels: None or int (0-2)
-    """
-
-    state = _convert_state(state)
-
-    validTypes = ("mesh")
-    shapes = _convert_input_shapes(shapes=shapes, smartConvert=smartConvert, allDescendents=allDescendents,
-                                   filterType=validTypes)
 
-    if not shapes:
-        raise RuntimeError("No meshes found to apply the vray_phoenix_object attribute group changes to.")
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-    for shape in shapes:
-        mc.vray("addAttributesFromGroup", shape, "vray_phoenix_object", state)
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    return _apply_group("vray_phoenix_object", shapes, locals())
 
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayPhoenixObjVoxels is not None:
-                mc.setAttr("{0}.vrayPhoenixObjVoxels".format(shape), vrayPhoenixObjVoxels)
 
 ##########
 # nurbsSurface
@@ -640,7 +969,8 @@ def vray_nurbsStaticGeom(shapes=None,
                      allDescendents=True,
                      vrayAsStaticGeom=None,
                      vrayMaxSubdivDepth=None,
-                     vrayFlatnessCoef=None):
+                     vrayFlatnessCoef=None,
+                     skipUnchanged=False):
     """ Add/change the NURBS attributes ``vray_nurbsStaticGeom`` to input shapes.
 
     Valid node types: (nurbsSurface)
@@ -669,28 +999,15 @@ def vray_nurbsStaticGeom(shapes=None,
 
     :param vrayFlatnessCoef: Curvature Threshold. If None it remains default/unchanged.
     :type  vrayFlatnessCoef: float
-    """
 
-    state = _convert_state(state)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-    validTypes = ("nurbsSurface")
-    shapes = _convert_input_shapes(shapes=shapes, smartConvert=smartConvert, allDescendents=allDescendents,
-                                   filterType=validTypes)
-
-    if not shapes:
-        raise RuntimeError("No shapes found to apply the vray_object_id attribute group changes to.")
-
-    for shape in shapes:
-        mc.vray("addAttributesFromGroup", shape, "vray_nusrbsStaticGeom", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayAsStaticGeom is not None:
-                mc.setAttr("{0}.vrayAsStaticGeom".format(shape), vrayAsStaticGeom)
-            if vrayMaxSubdivDepth is not None:
-                mc.setAttr("{0}.vrayMaxSubdivDepth".format(shape), vrayMaxSubdivDepth)
-            if vrayFlatnessCoef is not None:
-                mc.setAttr("{0}.vrayFlatnessCoef".format(shape), vrayFlatnessCoef)
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    return _apply_group("vray_nurbsStaticGeom", shapes, locals())
 
 
 ##############
@@ -706,7 +1023,8 @@ def vray_nurbscurve_renderable(shapes=None,
                      vrayNurbsCurveTesselation=None,
                      vrayNurbsCurveStartWidth=None,
                      vrayNurbsCurveLockEndWidth=None,
-                     vrayNurbsCurveEndWidth=None):
+                     vrayNurbsCurveEndWidth=None,
+                     skipUnchanged=False):
     """ Add/change the Renderable Curve ``vray_nurbscurve_renderable`` attribute to input nurbsCurves.
 
     Valid node types: (nurbsCurve)
@@ -723,38 +1041,16 @@ def vray_nurbscurve_renderable(shapes=None,
     :param allDescendents: If True it will smartConvert to allDescendent shapes.
                            e.g. this allows you to apply it to a group and all shapes in it will get object ids.
     :type  allDescendents: bool
-    """
-    # TODO: Add change attribute parameter docstring
-
-    state = _convert_state(state)
-    validTypes = ("nurbsCurve")
-
-    shapes = _convert_input_shapes(shapes=shapes, smartConvert=smartConvert, allDescendents=allDescendents,
-                                   filterType=validTypes)
-
-    if not shapes:
-        raise RuntimeError("No shapes found to apply the vray_object_id attribute group changes to.")
 
-    for shape in shapes:
-        mc.vray("addAttributesFromGroup", shape, "vray_nurbscurve_renderable", state)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayNurbsCurveRenderable is not None:
-                mc.setAttr("{0}.vrayNurbsCurveRenderable".format(shape), vrayNurbsCurveRenderable)
-
-            # TODO: Test if this works, it's likely that this needs to have a connection instead of 'value'
-            if vrayNurbsCurveMaterial is not None:
-                mc.setAttr("{0}.vrayNurbsCurveMaterial".format(shape), vrayNurbsCurveMaterial)
-
-            if vrayNurbsCurveTesselation is not None:
-                mc.setAttr("{0}.vrayNurbsCurveTesselation".format(shape), vrayNurbsCurveTesselation)
-            if vrayNurbsCurveStartWidth is not None:
-                mc.setAttr("{0}.vrayNurbsCurveStartWidth".format(shape), vrayNurbsCurveStartWidth)
-            if vrayNurbsCurveLockEndWidth is not None:
-                mc.setAttr("{0}.vrayNurbsCurveLockEndWidth".format(shape), vrayNurbsCurveLockEndWidth)
-            if vrayNurbsCurveEndWidth is not None:
-                mc.setAttr("{0}.vrayNurbsCurveEndWidth".format(shape), vrayNurbsCurveEndWidth)
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    # TODO: Add change attribute parameter docstring
+    return _apply_group("vray_nurbscurve_renderable", shapes, locals())
 
 
 ##############
@@ -764,7 +1060,8 @@ def vray_nurbscurve_renderable(shapes=None,
 def vray_material_id(materials=None,
                      state=1,
                      smartConvert=True,
-                     vrayMaterialId=None):
+                     vrayMaterialId=None,
+                     skipUnchanged=False):
     """ Add/change the v-ray material ID ``vray_material_id`` attribute to input materials.
 
     Valid node types: (material, shadingEngine)
@@ -783,34 +1080,22 @@ def vray_material_id(materials=None,
 
     :param vrayMaterialId: The material ID number value. If None it will remain default/unchanged.
     :type  vrayMaterialId: None or int
-    """
-    # TODO: Support mode to apply material ID on shadingEngine instead of material
-
-    state = _convert_state(state)
-
-    if materials is None:
-        materials = mc.ls(sl=1)
 
-    if smartConvert:
-        materials = getMaterials(materials)
-    else:
-        materials = mc.ls(materials, mat=True)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-    if not materials:
-        raise RuntimeError("No materials found")
-
-    for mat in materials:
-        mc.vray("addAttributesFromGroup", mat, "vray_material_id", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayMaterialId is not None:
-                mc.setAttr("{0}.{1}".format(mat, 'vrayMaterialId'), vrayMaterialId)
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    # TODO: Support mode to apply material ID on shadingEngine instead of material
+    return _apply_group("vray_material_id", materials, locals())
 
 
 def vray_specific_mtl(materials=None,
                      state=1,
-                     smartConvert=True):
+                     smartConvert=True,
+                     skipUnchanged=False):
     """ Add/change the v-ray material override ``vray_specific_mtl`` attribute to input materials.
 
     Valid node types: (material, shadingEngine)
@@ -821,29 +1106,22 @@ def vray_specific_mtl(materials=None,
     :param state: If state is True it will add the attribute, else it will remove it.
     :type  state: 1 or 0
 
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
+
     :param smartConvert: If True the input materials list will be checked for 'related materials'
                          and those found will be included. Else it will on
                          If no materials provided smartConvert is forced to True and it will get
                          materials related to the current selection.
     :type  smartConvert: bool
+
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
     """
     # TODO: Support mode to apply vray_specific_mtl on shadingEngine instead of material
     # TODO: Add change attribute value support
-    state = _convert_state(state)
-
-    if materials is None:
-        materials = mc.ls(sl=1)
-
-    if smartConvert:
-        materials = getMaterials(materials)
-    else:
-        materials = mc.ls(materials, mat=True)
-
-    if not materials:
-        raise RuntimeError("No materials found")
-
-    for mat in materials:
-        mc.vray("addAttributesFromGroup", mat, "vray_specific_mtl", state)
+    return _apply_group("vray_specific_mtl", materials, locals())
 
 
 ##############
@@ -853,7 +1131,8 @@ def vray_specific_mtl(materials=None,
 def vray_closed_volume(materials=None,
                      state=1,
                      smartConvert=True,
-                     vrayClosedVolume=None):
+                     vrayClosedVolume=None,
+                     skipUnchanged=False):
     """ Add/change the v-ray closed volume shading ``vray_closed_volume`` attribute to input materials.
 
     Valid node types: (v-ray material)
@@ -872,30 +1151,16 @@ def vray_closed_volume(materials=None,
 
     :param vrayClosedVolume: Enable/Disable Closed Volume Shading. If None it remains default/unchanged.
     :type  vrayClosedVolume: bool
-    """
-    # TODO: Add check if node is a valid v-ray material that can have closed volume shading
-
-    state = _convert_state(state)
-
-    if materials is None:
-        materials = mc.ls(sl=1)
-
-    if smartConvert:
-        materials = getMaterials(materials)
-    else:
-        materials = mc.ls(materials, mat=True)
-
-
-    if not materials:
-        raise RuntimeError("No materials found")
 
-    for mat in materials:
-        mc.vray("addAttributesFromGroup", mat, "vray_closed_volume", state)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayClosedVolume is not None:
-                mc.setAttr("{0}.{1}".format(mat, 'vrayClosedVolume'), vrayClosedVolume)
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    # TODO: Add check if node is a valid v-ray material that can have closed volume shading
+    return _apply_group("vray_closed_volume", materials, locals())
 
 
 ##############
@@ -905,7 +1170,8 @@ def vray_closed_volume(materials=None,
 def vray_cameraPhysical(shapes=None,
                      state=1,
                      smartConvert=True,
-                     allDescendents=True):
+                     allDescendents=True,
+                     skipUnchanged=False):
     """ Add/change the V-ray Physical Camera ``vray_cameraPhysical`` attribute to input cameras.
 
     Valid node types: (camera)
@@ -916,22 +1182,18 @@ def vray_cameraPhysical(shapes=None,
     :param state: If state is True it will add the attribute, else it will remove it.
     :type  state: 1 or 0
 
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
+
     :param allDescendents: If True it will smartConvert to allDescendent shapes.
                            e.g. this allows you to apply it to a group and all shapes in it will get object ids.
     :type  allDescendents: bool
-    """
 
-    state = _convert_state(state)
-    validTypes = ("camera")
-
-    shapes = _convert_input_shapes(shapes=shapes, smartConvert=smartConvert, allDescendents=allDescendents,
-                                   filterType=validTypes)
-
-    if not shapes:
-        raise RuntimeError("No cameras found to apply the vray_cameraPhysical attribute group changes to.")
-
-    for shape in shapes:
-        mc.vray("addAttributesFromGroup", shape, "vray_cameraPhysical", state)
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    return _apply_group("vray_cameraPhysical", shapes, locals())
 
 
 def vray_cameraOverrides(shapes=None,
@@ -945,7 +1207,8 @@ def vray_cameraOverrides(shapes=None,
                      vrayCameraHeight=None,
                      vrayCameraAutoFit=None,
                      vrayCameraDist=None,
-                     vrayCameraCurve=None):
+                     vrayCameraCurve=None,
+                     skipUnchanged=False):
     """ Add/change the V-Ray Camera Settings ``vray_cameraOverrides`` attribute to input cameras.
 
     Valid node types: (camera)
@@ -959,38 +1222,15 @@ def vray_cameraOverrides(shapes=None,
     :param allDescendents: If True it will smartConvert to allDescendent shapes.
                            e.g. this allows you to apply it to a group and all shapes in it will get object ids.
     :type  allDescendents: bool
-    """
 
-    state = _convert_state(state)
-    validTypes = ("camera")
-
-    shapes = _convert_input_shapes(shapes=shapes, smartConvert=smartConvert, allDescendents=allDescendents,
-                                   filterType=validTypes)
-
-    if not shapes:
-        raise RuntimeError("No cameras found to apply the vray_cameraOverrides attribute group changes to.")
-
-    for shape in shapes:
-        mc.vray("addAttributesFromGroup", shape, "vray_cameraOverrides", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayCameraOverridesOn is not None:
-                mc.setAttr("{0}.vrayCameraOverridesOn".format(shape), vrayCameraOverridesOn)
-            if vrayCameraType is not None:
-                mc.setAttr("{0}.vrayCameraType".format(shape), vrayCameraType)
-            if vrayCameraOverrideFOV is not None:
-                mc.setAttr("{0}.vrayCameraOverrideFOV".format(shape), vrayCameraOverrideFOV)
-            if vrayCameraFOV is not None:
-                mc.setAttr("{0}.vrayCameraFOV".format(shape), vrayCameraFOV)
-            if vrayCameraHeight is not None:
-                mc.setAttr("{0}.vrayCameraHeight".format(shape), vrayCameraHeight)
-            if vrayCameraAutoFit is not None:
-                mc.setAttr("{0}.vrayCameraAutoFit".format(shape), vrayCameraAutoFit)
-            if vrayCameraDist is not None:
-                mc.setAttr("{0}.vrayCameraDist".format(shape), vrayCameraDist)
-            if vrayCameraCurve is not None:
-                mc.setAttr("{0}.vrayCameraCurve".format(shape), vrayCameraCurve)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
+
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    return _apply_group("vray_cameraOverrides", shapes, locals())
 
 
 def vray_cameraDome(shapes=None,
@@ -1000,7 +1240,8 @@ def vray_cameraDome(shapes=None,
                      vrayCameraDomeOn=None,
                      vrayCameraDomeFlipX=None,
                      vrayCameraDomeFlipY=None,
-                     vrayCameraDomeFov=None):
+                     vrayCameraDomeFov=None,
+                     skipUnchanged=False):
     """ Add/change the V-Ray Dome Camera ``vray_cameraDome`` attribute to input cameras.
 
     Valid node types: (camera)
@@ -1014,30 +1255,15 @@ def vray_cameraDome(shapes=None,
     :param allDescendents: If True it will smartConvert to allDescendent shapes.
                            e.g. this allows you to apply it to a group and all shapes in it will get object ids.
     :type  allDescendents: bool
-    """
-
-    state = _convert_state(state)
-    validTypes = ("camera")
 
-    shapes = _convert_input_shapes(shapes=shapes, smartConvert=smartConvert, allDescendents=allDescendents,
-                                   filterType=validTypes)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-    if not shapes:
-        raise RuntimeError("No cameras found to apply the vray_cameraDome attribute group changes to.")
-
-    for shape in shapes:
-        mc.vray("addAttributesFromGroup", shape, "vray_cameraDome", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayCameraDomeOn is not None:
-                mc.setAttr("{0}.vrayCameraDomeOn".format(shape), vrayCameraDomeOn)
-            if vrayCameraDomeFlipX is not None:
-                mc.setAttr("{0}.vrayCameraDomeFlipX".format(shape), vrayCameraDomeFlipX)
-            if vrayCameraDomeFlipY is not None:
-                mc.setAttr("{0}.vrayCameraDomeFlipY".format(shape), vrayCameraDomeFlipY)
-            if vrayCameraDomeFov is not None:
-                mc.setAttr("{0}.vrayCameraDomeFov".format(shape), vrayCameraDomeFov)
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    return _apply_group("vray_cameraDome", shapes, locals())
 
 
 ##############
@@ -1060,7 +1286,8 @@ def vray_light(shapes=None,
                      vrayShadowBias=None,
                      vrayCutoffThreshold=None,
                      vrayOverrideMBSamples=None,
-                     vrayMBSamples=None):
+                     vrayMBSamples=None,
+                     skipUnchanged=False):
     """ Add/change the Light Attributes ``vray_light`` attribute to input lights.
 
     Valid node types: (ambientLight)
@@ -1074,38 +1301,15 @@ def vray_light(shapes=None,
     :param allDescendents: If True it will smartConvert to allDescendent shapes.
                            e.g. this allows you to apply it to a group and all shapes in it will get object ids.
     :type  allDescendents: bool
-    """
 
-    state = _convert_state(state)
-    validTypes = ("ambientLight")
-
-    shapes = _convert_input_shapes(shapes=shapes, smartConvert=smartConvert, allDescendents=allDescendents,
-                                   filterType=validTypes)
-
-    if not shapes:
-        raise RuntimeError("No shapes found to apply the vray_light attribute group changes to.")
-
-    for shape in shapes:
-        mc.vray("addAttributesFromGroup", shape, "vray_light", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayPhotonSubdivs is not None:
-                mc.setAttr("{0}.vrayPhotonSubdivs".format(shape), vrayPhotonSubdivs)
-            if vrayDiffuseMult is not None:
-                mc.setAttr("{0}.vrayDiffuseMult".format(shape), vrayDiffuseMult)
-            if vrayCausticSubdivs is not None:
-                mc.setAttr("{0}.vrayCausticSubdivs".format(shape), vrayCausticSubdivs)
-            if vrayCausticMult is not None:
-                mc.setAttr("{0}.vrayCausticMult".format(shape), vrayCausticMult)
-            if vrayShadowBias is not None:
-                mc.setAttr("{0}.vrayShadowBias".format(shape), vrayShadowBias)
-            if vrayCutoffThreshold is not None:
-                mc.setAttr("{0}.vrayCutoffThreshold".format(shape), vrayCutoffThreshold)
-            if vrayOverrideMBSamples is not None:
-                mc.setAttr("{0}.vrayOverrideMBSamples".format(shape), vrayOverrideMBSamples)
-            if vrayMBSamples is not None:
-                mc.setAttr("{0}.vrayOverrideMBSamples".format(shape), vrayMBSamples)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
+
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    return _apply_group("vray_light", shapes, locals())
 
 
 def vray_directlight(shapes=None,
@@ -1121,7 +1325,8 @@ def vray_directlight(shapes=None,
                      vraySpecularContrib=None,
                      vrayStoreWithIrradianceMap=None,
                      vrayOverrideMBSamples=None,
-                     vrayMBSamples=None):
+                     vrayMBSamples=None,
+                     skipUnchanged=False):
     """ Add/change the Light Attributes ``vray_directlight`` attribute to input lights.
 
     Valid node types: (directionalLight)
@@ -1135,42 +1340,15 @@ def vray_directlight(shapes=None,
     :param allDescendents: If True it will smartConvert to allDescendent shapes.
                            e.g. this allows you to apply it to a group and all shapes in it will get object ids.
     :type  allDescendents: bool
-    """
 
-    state = _convert_state(state)
-    validTypes = ("directionalLight")
-
-    shapes = _convert_input_shapes(shapes=shapes, smartConvert=smartConvert, allDescendents=allDescendents,
-                                   filterType=validTypes)
-
-    if not shapes:
-        raise RuntimeError("No shapes found to apply the vray_pointLight attribute group changes to.")
-
-    for shape in shapes:
-        mc.vray("addAttributesFromGroup", shape, "vray_directlight", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayPhotonSubdivs is not None:
-                mc.setAttr("{0}.vrayPhotonSubdivs".format(shape), vrayPhotonSubdivs)
-            if vrayDiffuseMult is not None:
-                mc.setAttr("{0}.vrayDiffuseMult".format(shape), vrayDiffuseMult)
-            if vrayCausticSubdivs is not None:
-                mc.setAttr("{0}.vrayCausticSubdivs".format(shape), vrayCausticSubdivs)
-            if vrayCausticMult is not None:
-                mc.setAttr("{0}.vrayCausticMult".format(shape), vrayCausticMult)
-            if vrayShadowBias is not None:
-                mc.setAttr("{0}.vrayShadowBias".format(shape), vrayShadowBias)
-            if vrayDiffuseContrib is not None:
-                mc.setAttr("{0}.vrayDiffuseContrib".format(shape), vrayDiffuseContrib)
-            if vraySpecularContrib is not None:
-                mc.setAttr("{0}.vraySpecularContrib".format(shape), vraySpecularContrib)
-            if vrayStoreWithIrradianceMap is not None:
-                mc.setAttr("{0}.vrayStoreWithIrradianceMap".format(shape), vrayStoreWithIrradianceMap)
-            if vrayOverrideMBSamples is not None:
-                mc.setAttr("{0}.vrayOverrideMBSamples".format(shape), vrayOverrideMBSamples)
-            if vrayMBSamples is not None:
-                mc.setAttr("{0}.vrayOverrideMBSamples".format(shape), vrayMBSamples)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
+
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    return _apply_group("vray_directlight", shapes, locals())
 
 
 def vray_pointLight(shapes=None,
@@ -1187,7 +1365,8 @@ def vray_pointLight(shapes=None,
                      vraySpecularContrib=None,
                      vrayStoreWithIrradianceMap=None,
                      vrayOverrideMBSamples=None,
-                     vrayMBSamples=None):
+                     vrayMBSamples=None,
+                     skipUnchanged=False):
     """ Add/change the Light Attributes ``vray_pointLight`` attribute to input lights.
 
     Valid node types: (spotLight, pointLight)
@@ -1201,44 +1380,15 @@ def vray_pointLight(shapes=None,
     :param allDescendents: If True it will smartConvert to allDescendent shapes.
                            e.g. this allows you to apply it to a group and all shapes in it will get object ids.
     :type  allDescendents: bool
-    """
 
-    state = _convert_state(state)
-    validTypes = ("spotLight", "pointLight")
-
-    shapes = _convert_input_shapes(shapes=shapes, smartConvert=smartConvert, allDescendents=allDescendents,
-                                   filterType=validTypes)
-
-    if not shapes:
-        raise RuntimeError("No shapes found to apply the vray_pointLight attribute group changes to.")
-
-    for shape in shapes:
-        mc.vray("addAttributesFromGroup", shape, "vray_pointLight", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayPhotonSubdivs is not None:
-                mc.setAttr("{0}.vrayPhotonSubdivs".format(shape), vrayPhotonSubdivs)
-            if vrayDiffuseMult is not None:
-                mc.setAttr("{0}.vrayDiffuseMult".format(shape), vrayDiffuseMult)
-            if vrayCausticSubdivs is not None:
-                mc.setAttr("{0}.vrayCausticSubdivs".format(shape), vrayCausticSubdivs)
-            if vrayCausticMult is not None:
-                mc.setAttr("{0}.vrayCausticMult".format(shape), vrayCausticMult)
-            if vrayCutoffThreshold is not None:
-                mc.setAttr("{0}.vrayCutoffThreshold".format(shape), vrayCutoffThreshold)
-            if vrayShadowBias is not None:
-                mc.setAttr("{0}.vrayShadowBias".format(shape), vrayShadowBias)
-            if vrayDiffuseContrib is not None:
-                mc.setAttr("{0}.vrayDiffuseContrib".format(shape), vrayDiffuseContrib)
-            if vraySpecularContrib is not None:
-                mc.setAttr("{0}.vraySpecularContrib".format(shape), vraySpecularContrib)
-            if vrayStoreWithIrradianceMap is not None:
-                mc.setAttr("{0}.vrayStoreWithIrradianceMap".format(shape), vrayStoreWithIrradianceMap)
-            if vrayOverrideMBSamples is not None:
-                mc.setAttr("{0}.vrayOverrideMBSamples".format(shape), vrayOverrideMBSamples)
-            if vrayMBSamples is not None:
-                mc.setAttr("{0}.vrayOverrideMBSamples".format(shape), vrayMBSamples)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
+
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    return _apply_group("vray_pointLight", shapes, locals())
 
 
 def vray_arealight(shapes=None,
@@ -1255,7 +1405,8 @@ def vray_arealight(shapes=None,
                      vraySpecularContrib=None,
                      vrayInvisible=None,
                      vrayOverrideMBSamples=None,
-                     vrayMBSamples=None):
+                     vrayMBSamples=None,
+                     skipUnchanged=False):
     """ Add/change the Light Attributes ``vray_arealight`` attribute to input lights.
 
     Valid node types: (areaLight)
@@ -1269,44 +1420,15 @@ def vray_arealight(shapes=None,
     :param allDescendents: If True it will smartConvert to allDescendent shapes.
                            e.g. this allows you to apply it to a group and all shapes in it will get object ids.
     :type  allDescendents: bool
-    """
 
-    state = _convert_state(state)
-    validTypes = ("areaLight")
-
-    shapes = _convert_input_shapes(shapes=shapes, smartConvert=smartConvert, allDescendents=allDescendents,
-                                   filterType=validTypes)
-
-    if not shapes:
-        raise RuntimeError("No shapes found to apply the vray_arealight attribute group changes to.")
-
-    for shape in shapes:
-        mc.vray("addAttributesFromGroup", shape, "vray_arealight", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayPhotonSubdivs is not None:
-                mc.setAttr("{0}.vrayPhotonSubdivs".format(shape), vrayPhotonSubdivs)
-            if vrayDiffuseMult is not None:
-                mc.setAttr("{0}.vrayDiffuseMult".format(shape), vrayDiffuseMult)
-            if vrayCausticSubdivs is not None:
-                mc.setAttr("{0}.vrayCausticSubdivs".format(shape), vrayCausticSubdivs)
-            if vrayCausticMult is not None:
-                mc.setAttr("{0}.vrayCausticMult".format(shape), vrayCausticMult)
-            if vrayShadowBias is not None:
-                mc.setAttr("{0}.vrayShadowBias".format(shape), vrayShadowBias)
-            if vrayCutoffThreshold is not None:
-                mc.setAttr("{0}.vrayCutoffThreshold".format(shape), vrayCutoffThreshold)
-            if vrayDiffuseContrib is not None:
-                mc.setAttr("{0}.vrayDiffuseContrib".format(shape), vrayDiffuseContrib)
-            if vraySpecularContrib is not None:
-                mc.setAttr("{0}.vraySpecularContrib".format(shape), vraySpecularContrib)
-            if vrayInvisible is not None:
-                mc.setAttr("{0}.vrayStoreWithIrradianceMap".format(shape), vrayInvisible)
-            if vrayOverrideMBSamples is not None:
-                mc.setAttr("{0}.vrayOverrideMBSamples".format(shape), vrayOverrideMBSamples)
-            if vrayMBSamples is not None:
-                mc.setAttr("{0}.vrayOverrideMBSamples".format(shape), vrayMBSamples)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
+
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    return _apply_group("vray_arealight", shapes, locals())
 
 
 ##############
@@ -1318,7 +1440,8 @@ def vray_file_gamma(nodes=None,
                      smartConvert=True,
                      vrayFileGammaEnable=None,
                      vrayFileColorSpace=None,
-                     vrayFileGammaValue=None):
+                     vrayFileGammaValue=None,
+                     skipUnchanged=False):
     """ Add/change the Texture input Gamma ``vray_file_gamma`` attribute to input nodes.
 
     Valid node types: (file, VRayPTex, Substance nodes, imagePlane)
@@ -1326,46 +1449,29 @@ def vray_file_gamma(nodes=None,
     :param nodes: nodes to apply the attribute to. If nodes is None it will get
                   the nodes related to the current selection.
 
-    :param smartConvert: CURRENTLY NO IMPLEMENTATION
+    :param smartConvert: If True the input is also converted to the texture nodes in its shading networks, so
+                         meshes, shadingEngines and materials can be used as input.
     :type  smartConvert: bool
 
     :param state: If state is True it will add the attribute, else it will remove it.
     :type  state: 1 or 0
-    """
-    # TODO: Implement attribute parameters description
 
-    state = _convert_state(state)
-    validTypes = ("file", "VRayPtex", "substance", "imagePlane")
-
-    if nodes is None:
-        nodes = mc.ls(sl=1, long=True)
-
-    if smartConvert:
-        # TODO: Implement smart convert
-        pass
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-    nodes = mc.ls(nodes, type=validTypes, long=True)
-
-    if not nodes:
-        raise RuntimeError("No samplerInfo found to apply the vray_file_gamma attribute changes to.")
-
-    for node in nodes:
-        mc.vray("addAttributesFromGroup", node, "vray_file_gamma", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayFileGammaEnable is not None:
-                mc.setAttr("{0}.vrayFileGammaEnable".format(node), vrayFileGammaEnable)
-            if vrayFileColorSpace is not None:
-                mc.setAttr("{0}.vrayFileColorSpace".format(node), vrayFileColorSpace)
-            if vrayFileGammaValue is not None:
-                mc.setAttr("{0}.vrayFileGammaValue".format(node), vrayFileGammaValue)
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    # TODO: Implement attribute parameters description
+    return _apply_group("vray_file_gamma", nodes, locals())
 
 
 def vray_file_allow_neg_colors(nodes=None,
                      state=1,
                      smartConvert=True,
-                     vrayFileAllowNegColors=None):
+                     vrayFileAllowNegColors=None,
+                     skipUnchanged=False):
     """ Add/change the Texture input Gamma (vray_file_allow_neg_colors) attribute to input nodes.
 
     Valid node types: (file, Substance nodes, imagePlane)
@@ -1373,36 +1479,22 @@ def vray_file_allow_neg_colors(nodes=None,
     :param nodes: nodes to apply the attribute to. If nodes is None it will get
                   the nodes related to the current selection.
 
-    :param smartConvert: CURRENTLY NO IMPLEMENTATION
+    :param smartConvert: If True the input is also converted to the texture nodes in its shading networks, so
+                         meshes, shadingEngines and materials can be used as input.
     :type  smartConvert: bool
 
     :param state: If state is True it will add the attribute, else it will remove it.
     :type  state: 1 or 0
-    """
-    # TODO: Implement attribute parameters description
 
-    state = _convert_state(state)
-    validTypes = ("file", "substance", "imagePlane")
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-    if nodes is None:
-        nodes = mc.ls(sl=1, long=True)
-
-    if smartConvert:
-        # TODO: Implement smart convert
-        pass
-
-    nodes = mc.ls(nodes, type=validTypes, long=True)
-
-    if not nodes:
-        raise RuntimeError("No samplerInfo found to apply the vray_samplerinfo_extra_tex attribute changes to.")
-
-    for node in nodes:
-        mc.vray("addAttributesFromGroup", node, "vray_file_allow_neg_colors", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayFileAllowNegColors is not None:
-                mc.setAttr("{0}.vrayFileAllowNegColors".format(node), vrayFileAllowNegColors)
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    # TODO: Implement attribute parameters description
+    return _apply_group("vray_file_allow_neg_colors", nodes, locals())
 
 
 def vray_file_ifl(nodes=None,
@@ -1410,48 +1502,34 @@ def vray_file_ifl(nodes=None,
                      smartConvert=True,
                      vrayFileIFLStartFrame=None,
                      vrayFileIFLEndCondition=None,
-                     vrayFileIFLPlaybackRate=None):
+                     vrayFileIFLPlaybackRate=None,
+                     skipUnchanged=False):
     """ Add/change the Texture input Gamma (vray_file_ifl) attribute to input nodes.
 
     Valid node types: (file)
 
+    To only add it to the file nodes that point at an image sequence (with their start frame set) use
+    `vrayformayaUtils.textures.iflPass`.
+
     :param nodes: nodes to apply the attribute to. If nodes is None it will get
                   the nodes related to the current selection.
 
-    :param smartConvert: CURRENTLY NO IMPLEMENTATION
+    :param smartConvert: If True the input is also converted to the texture nodes in its shading networks, so
+                         meshes, shadingEngines and materials can be used as input.
     :type  smartConvert: bool
 
     :param state: If state is True it will add the attribute, else it will remove it.
     :type  state: 1 or 0
-    """
-    # TODO: Implement attribute parameters description
-
-    state = _convert_state(state)
-    validTypes = ("file")
-
-    if nodes is None:
-        nodes = mc.ls(sl=1, long=True)
-
-    if smartConvert:
-        # TODO: Implement smart convert
-        pass
-
-    nodes = mc.ls(nodes, type=validTypes, long=True)
 
-    if not nodes:
-        raise RuntimeError("No samplerInfo found to apply the vray_file_ifl attribute changes to.")
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-    for node in nodes:
-        mc.vray("addAttributesFromGroup", node, "vray_file_ifl", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayFileIFLStartFrame is not None:
-                mc.setAttr("{0}.vrayFileIFLStartFrame".format(node), vrayFileIFLStartFrame)
-            if vrayFileIFLEndCondition is not None:
-                mc.setAttr("{0}.vrayFileIFLEndCondition".format(node), vrayFileIFLEndCondition)
-            if vrayFileIFLPlaybackRate is not None:
-                mc.setAttr("{0}.vrayFileIFLPlaybackRate".format(node), vrayFileIFLPlaybackRate)
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    # TODO: Implement attribute parameters description
+    return _apply_group("vray_file_ifl", nodes, locals())
 
 
 def vray_texture_filter(nodes=None,
@@ -1459,7 +1537,8 @@ def vray_texture_filter(nodes=None,
                      smartConvert=True,
                      vrayOverrideTextureFilter=None,
                      vrayTextureFilter=None,
-                     vrayTextureSmoothType=None):
+                     vrayTextureSmoothType=None,
+                     skipUnchanged=False):
     """ Add/change the Texture input Gamma ``vray_file_gamma`` attribute to input nodes.
 
     Valid node types: (file, VRayPTex, Substance nodes, imagePlane)
@@ -1467,7 +1546,8 @@ def vray_texture_filter(nodes=None,
     :param nodes: nodes to apply the attribute to. If nodes is None it will get
                   the nodes related to the current selection.
 
-    :param smartConvert: CURRENTLY NO IMPLEMENTATION
+    :param smartConvert: If True the input is also converted to the texture nodes in its shading networks, so
+                         meshes, shadingEngines and materials can be used as input.
     :type  smartConvert: bool
 
     :param state: If state is True it will add the attribute, else it will remove it.
@@ -1491,35 +1571,15 @@ def vray_texture_filter(nodes=None,
                                        1. Bucubic,
                                        2. Biquadratic
     :type  vrayTextureSmoothType: None or int (0-2)
-    """
-
-    state = _convert_state(state)
-    validTypes = ("file", "substance")
 
-    if nodes is None:
-        nodes = mc.ls(sl=1, long=True)
-
-    if smartConvert:
-        # TODO: Implement smart convert
-        pass
-
-    nodes = mc.ls(nodes, type=validTypes, long=True)
-
-    if not nodes:
-        raise RuntimeError("No samplerInfo found to apply the vray_texture_filter attribute changes to.")
-
-    for node in nodes:
-        mc.vray("addAttributesFromGroup", node, "vray_texture_filter", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayOverrideTextureFilter is not None:
-                mc.setAttr("{0}.vrayOverrideTextureFilter".format(node), vrayOverrideTextureFilter)
-            if vrayTextureFilter is not None:
-                mc.setAttr("{0}.vrayTextureFilter".format(node), vrayTextureFilter)
-            if vrayTextureSmoothType is not None:
-                mc.setAttr("{0}.vrayTextureSmoothType".format(node), vrayTextureSmoothType)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    return _apply_group("vray_texture_filter", nodes, locals())
 
 
 ###################
@@ -1529,7 +1589,8 @@ def vray_texture_filter(nodes=None,
 def vray_2d_placement_options(nodes=None,
                      state=1,
                      smartConvert=True,
-                     vrayUVSetName=None):
+                     vrayUVSetName=None,
+                     skipUnchanged=False):
     """ Add/change the 2D Placement Options ``vray_2d_placement_options`` attribute to input place2dTexture nodes.
 
     Valid node types: (place2dTexture)
@@ -1545,30 +1606,15 @@ def vray_2d_placement_options(nodes=None,
 
     :param vrayUVSetName: Set the UV set name attribute string value. If None it remains default/unchanged.
     :type  vrayUVSetName: None or str
-    """
-
-    state = _convert_state(state)
-    validTypes = ("place2dTexture")
-
-    if nodes is None:
-        nodes = mc.ls(sl=1, long=True)
-
-    if smartConvert:
-        # TODO: Implement smart convert
-        pass
-
-    nodes = mc.ls(nodes, type=validTypes, long=True)
-
-    if not nodes:
-        raise RuntimeError("No place2dTexture found to apply the vray_2d_placement_options attribute changes to.")
 
-    for node in nodes:
-        mc.vray("addAttributesFromGroup", node, "vray_2d_placement_options", state)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayUVSetName is not None:
-                mc.setAttr("{0}.vrayUVSetName".format(node), vrayUVSetName, type="string")
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    return _apply_group("vray_2d_placement_options", nodes, locals())
 
 
 ###################
@@ -1584,7 +1630,8 @@ def vray_samplerinfo_extra_tex(nodes=None,
                      vrayPointWorldReferenceX=None,
                      vrayNormalWorldReferenceX=None,
                      vrayRayDepth=None,
-                     vrayPathLength=None):
+                     vrayPathLength=None,
+                     skipUnchanged=False):
     """ Add/change the Additional outputs ``vray_samplerinfo_extra_tex`` attribute to input samplerInfo nodes.
 
     Note that in general setting the attribute values for a samplerInfo node isn't really doing anything useful.
@@ -1600,43 +1647,16 @@ def vray_samplerinfo_extra_tex(nodes=None,
 
     :param state: If state is True it will add the attribute, else it will remove it.
     :type  state: 1 or 0
-    """
-    # TODO: Implement attribute parameters description
 
-    state = _convert_state(state)
-    validTypes = ("samplerInfo")
-
-    if nodes is None:
-        nodes = mc.ls(sl=1, long=True)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-    if smartConvert:
-        # TODO: Implement smart convert
-        pass
-
-    nodes = mc.ls(nodes, type=validTypes, long=True)
-
-    if not nodes:
-        raise RuntimeError("No samplerInfo found to apply the vray_samplerinfo_extra_tex attribute changes to.")
-
-    for node in nodes:
-        mc.vray("addAttributesFromGroup", node, "vray_samplerinfo_extra_tex", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vrayNormalObj is not None:
-                mc.setAttr("{0}.vrayNormalObj".format(node), vrayNormalObj)
-            if vrayNormalWorld is not None:
-                mc.setAttr("{0}.vrayNormalWorld".format(node), vrayNormalWorld)
-            if vrayGNormalWorld is not None:
-                mc.setAttr("{0}.vrayGNormalWorld".format(node), vrayGNormalWorld)
-            if vrayPointWorldReferenceX is not None:
-                mc.setAttr("{0}.vrayPointWorldReferenceX".format(node), vrayPointWorldReferenceX)
-            if vrayNormalWorldReferenceX is not None:
-                mc.setAttr("{0}.vrayNormalWorldReferenceX".format(node), vrayNormalWorldReferenceX)
-            if vrayRayDepth is not None:
-                mc.setAttr("{0}.vrayRayDepth".format(node), vrayRayDepth)
-            if vrayPathLength is not None:
-                mc.setAttr("{0}.vrayPathLength".format(node), vrayPathLength)
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    # TODO: Implement attribute parameters description
+    return _apply_group("vray_samplerinfo_extra_tex", nodes, locals())
 
 
 ###################
@@ -1646,7 +1666,8 @@ def vray_samplerinfo_extra_tex(nodes=None,
 def vray_skip_export(transforms=None,
                      state=1,
                      smartConvert=False,
-                     vraySkipExport=None):
+                     vraySkipExport=None,
+                     skipUnchanged=False):
     """ Add/change the Skip Rendering ``vray_skip_export`` attribute to input transforms.
 
     Valid node types: (transform)
@@ -1660,30 +1681,12 @@ def vray_skip_export(transforms=None,
 
     :param state: If state is True it will add the attribute, else it will remove it.
     :type  state: 1 or 0
-    """
-    state = _convert_state(state)
-    validTypes = ("transform")
 
-    if transforms is None:
-        transforms = mc.ls(sl=1, long=True)
-
-    if smartConvert:
-        # Include parent transform of a shape node
-        shapes = mc.ls(transforms, s=True, long=True)
-        if shapes:
-            shapeParents = mc.listRelatives(shapes, fullPath=True, parent=True)
-            if shapeParents:
-                transforms.extend(shapeParents)
+    :param skipUnchanged: If True the current attributes are queried first and only nodes that actually need to
+                          change are processed. The skipped nodes are listed in the returned result.
+    :type  skipUnchanged: bool
 
-    transforms = mc.ls(transforms, type=validTypes, long=True)
-
-    if not transforms:
-        raise RuntimeError("No transforms found to apply the vray_skip_export attribute group changes to.")
-
-    for node in transforms:
-        mc.vray("addAttributesFromGroup", node, "vray_skip_export", state)
-
-        # Manage the attributes (if not None change it to the set value)
-        if state:
-            if vraySkipExport is not None:
-                mc.setAttr("{0}.vraySkipExport".format(node), vraySkipExport)
\ No newline at end of file
+    :return: The nodes that were changed and the nodes that were skipped.
+    :rtype: vrayformayaUtils.batch.GroupResult
+    """
+    return _apply_group("vray_skip_export", transforms, locals())
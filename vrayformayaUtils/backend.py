@@ -0,0 +1,269 @@
+"""
+    The `backend` module defines how the package traverses and filters nodes in the scene.
+
+    Two backends are available:
+
+    - **cmds** (default)
+
+        Uses ``maya.cmds`` string lists (``mc.ls``, ``mc.listRelatives``).
+
+    - **api**
+
+        Uses ``maya.api.OpenMaya``. The nodes are resolved into a single ``MSelectionList`` and the hierarchy is
+        traversed once with ``MItDag`` filtered to shapes, comparing the types of the node handles instead of
+        filtering the resulting string lists with ``mc.ls`` over and over again.
+
+    The backend is selected with the module level BACKEND setting:
+
+    .. code-block:: python
+
+        from vrayformayaUtils import backend
+        backend.BACKEND = "api"
+
+    Both backends implement the same interface (see `CmdsBackend`) and exchange long names, so they return identical
+    results. Any object implementing that interface can be set as BACKEND as well (e.g. a fake backend in tests).
+
+    Functions
+    =========
+"""
+import maya.cmds as mc
+
+try:
+    basestring
+except NameError:
+    basestring = str
+
+#: The backend that is used, either the name of a registered backend ("cmds" or "api") or a backend instance.
+BACKEND = "cmds"
+
+_INSTANCES = {}
+
+
+def getBackend():
+    """ Return the backend that is selected with the BACKEND setting.
+
+    :rtype: CmdsBackend or ApiBackend
+    """
+    if not isinstance(BACKEND, basestring):
+        return BACKEND
+
+    backend = _INSTANCES.get(BACKEND)
+    if backend is None:
+        if BACKEND not in BACKENDS:
+            raise ValueError("Unknown backend: {0}. Available backends are: {1}".format(BACKEND,
+                                                                                     ", ".join(sorted(BACKENDS))))
+        backend = _INSTANCES[BACKEND] = BACKENDS[BACKEND]()
+    return backend
+
+
+class CmdsBackend(object):
+    """ Traverses and filters nodes through ``maya.cmds``.
+
+    This class also defines the interface every backend implements. All methods return long names.
+    """
+    def ls(self, nodes=None, filterType=None):
+        """ Return the existing nodes (or the selection if nodes is None), filtered to filterType.
+
+        :param nodes: The nodes to filter. If None the current selection is used.
+        :type  nodes: None or list
+
+        :param filterType: The node type(s) to filter to, including their derived types. If None it doesn't filter.
+        :type  filterType: None, str or tuple
+
+        :rtype: list
+        """
+        kwargs = {"long": True}
+        if filterType is not None:
+            kwargs["type"] = filterType
+
+        if nodes is None:
+            return mc.ls(sl=1, **kwargs)
+        return mc.ls(nodes, **kwargs)
+
+    def shapes(self, nodes=None, allDescendents=True, filterType=None):
+        """ Return the shapes in nodes and their children shapes (or of the selection if nodes is None).
+
+        :param nodes: The nodes to get the shapes from. If None the current selection is used.
+        :type  nodes: None or list
+
+        :param allDescendents: If True it will get all children shapes at any depth.
+                               Otherwise it will only get direct children shapes.
+        :type  allDescendents: bool
+
+        :param filterType: The shape type(s) to filter to, including their derived types. If None it doesn't filter.
+        :type  filterType: None, str or tuple
+
+        :rtype: list
+        """
+        # Acquire from selection
+        if nodes is None:
+            if allDescendents:
+                shapes = mc.ls(sl=1, s=1, dag=1, lf=1, o=1, long=True, allPaths=True)
+            else:
+                sel = mc.ls(sl=1)
+                shapes = mc.ls(sl=1, s=1, long=True)
+
+                # Note that we can't directly get allDescendents and filter to shapes through listRelatives because
+                # it will still stop at the first level because it will not pass through other nodes than shapes. :/
+                children = mc.listRelatives(sel,
+                                            children=True,
+                                            fullPath=True,
+                                            allDescendents=allDescendents)
+                if children:
+                    childrenShapes = mc.ls(children, s=True, long=True)
+                    if childrenShapes:
+                        shapes.extend(childrenShapes)
+
+        # Acquire from input nodes
+        else:
+            shapes = mc.ls(nodes, s=1, long=True)
+
+            children = mc.listRelatives(nodes,
+                                        children=True,
+                                        fullPath=True,
+                                        allDescendents=allDescendents)
+            if children:
+                childrenShapes = mc.ls(children, s=True, long=True)
+                if childrenShapes:
+                    shapes.extend(childrenShapes)
+
+        if shapes and filterType is not None:
+            shapes = mc.ls(shapes, type=filterType, long=True)
+
+        return shapes
+
+    def shortNames(self, nodes):
+        """ Return the shortest unique names of the nodes.
+
+        :param nodes: The long names of the nodes.
+        :type  nodes: list
+
+        :rtype: list
+        """
+        if not nodes:
+            return []
+        return mc.ls(nodes)
+
+
+class ApiBackend(object):
+    """ Traverses and filters nodes through ``maya.api.OpenMaya``, see `CmdsBackend` for the interface """
+    def __init__(self):
+        import maya.api.OpenMaya as om
+        self._om = om
+        self._derivedTypes = {}
+
+    def _typeNames(self, filterType):
+        """ Return the set of type names for filterType including all derived types """
+        if isinstance(filterType, basestring):
+            filterType = (filterType,)
+
+        types = set()
+        for typeName in filterType:
+            derived = self._derivedTypes.get(typeName)
+            if derived is None:
+                derived = set(mc.nodeType(typeName, isTypeName=True, derived=True) or [])
+                derived.add(typeName)
+                self._derivedTypes[typeName] = derived
+            types.update(derived)
+        return types
+
+    def _selectionList(self, nodes):
+        """ Return the nodes as MSelectionList (or the active selection if nodes is None) """
+        om = self._om
+        if nodes is None:
+            return om.MGlobal.getActiveSelectionList()
+
+        if isinstance(nodes, basestring):
+            nodes = [nodes]
+
+        selectionList = om.MSelectionList()
+        for node in nodes:
+            try:
+                selectionList.add(node)
+            except RuntimeError:
+                # The node doesn't exist, like mc.ls we ignore it
+                pass
+        return selectionList
+
+    def _handles(self, selectionList):
+        """ Yield a (MObjectHandle, MDagPath or None) pair per item of the selection list """
+        om = self._om
+        for i in range(selectionList.length()):
+            obj = selectionList.getDependNode(i)
+            if obj.hasFn(om.MFn.kDagNode):
+                yield om.MObjectHandle(obj), selectionList.getDagPath(i)
+            else:
+                yield om.MObjectHandle(obj), None
+
+    def _name(self, handle, path):
+        if path is not None:
+            return path.fullPathName()
+        return self._om.MFnDependencyNode(handle.object()).name()
+
+    def _typeName(self, handle):
+        return self._om.MFnDependencyNode(handle.object()).typeName
+
+    def ls(self, nodes=None, filterType=None):
+        types = self._typeNames(filterType) if filterType is not None else None
+
+        result = []
+        seen = set()
+        for handle, path in self._handles(self._selectionList(nodes)):
+            if types is not None and self._typeName(handle) not in types:
+                continue
+            name = self._name(handle, path)
+            if name not in seen:
+                seen.add(name)
+                result.append(name)
+        return result
+
+    def shapes(self, nodes=None, allDescendents=True, filterType=None):
+        om = self._om
+        types = self._typeNames(filterType) if filterType is not None else None
+
+        result = []
+        seen = set()
+
+        def visit(path):
+            if not path.node().hasFn(om.MFn.kShape):
+                return
+            name = path.fullPathName()
+            if name in seen:
+                return
+            seen.add(name)
+            if types is None or om.MFnDependencyNode(path.node()).typeName in types:
+                result.append(name)
+
+        iterator = om.MItDag(om.MItDag.kDepthFirst, om.MFn.kShape)
+        for handle, path in self._handles(self._selectionList(nodes)):
+            if path is None:
+                continue
+
+            if allDescendents:
+                # Traverse the whole hierarchy below the path once, only stopping at shapes (the root included)
+                iterator.reset(path, om.MItDag.kDepthFirst, om.MFn.kShape)
+                while not iterator.isDone():
+                    visit(iterator.getPath())
+                    iterator.next()
+            else:
+                visit(path)
+                for i in range(path.childCount()):
+                    childPath = om.MDagPath(path)
+                    childPath.push(path.child(i))
+                    visit(childPath)
+
+        return result
+
+    def shortNames(self, nodes):
+        result = []
+        for handle, path in self._handles(self._selectionList(nodes)):
+            if path is not None:
+                result.append(path.partialPathName())
+            else:
+                result.append(self._name(handle, path))
+        return result
+
+
+#: The registered backends by name.
+BACKENDS = {"cmds": CmdsBackend,
+            "api": ApiBackend}
@@ -0,0 +1,493 @@
+"""
+    The `batch` module executes large amounts of v-ray commands with as few command invocations as possible.
+
+    Calling ``mc.vray("addAttributesFromGroup", ..)`` from Python for every single node has a fixed overhead per call
+    (argument conversion, command lookup, result conversion). On scenes with tens of thousands of shapes that overhead
+    is where most of the time goes. Instead this module combines the commands into MEL statements and evaluates them
+    in chunks, so only one command invocation is done per chunk of nodes.
+
+    The same goes for setting the attribute values. All requested values of an attribute group operation are written
+    in the same pass as the ``addAttributesFromGroup`` statements and recorded as a single undo step.
+
+    Functions
+    =========
+"""
+import time
+from collections import namedtuple
+
+import maya.cmds as mc
+import maya.mel as mel
+from vrayformayaUtils import profiling
+from vrayformayaUtils.utils import bulkOperation
+
+try:
+    basestring
+except NameError:
+    basestring = str
+
+#: The maximum amount of statements that are combined into a single MEL evaluation.
+CHUNK_SIZE = 1000
+
+# Returns the values of the plugs as strings, numeric compounds (e.g. double3) as their space separated children
+_GET_ATTRIBUTES_PROC = """
+global proc string[] vrayformayaUtils_getAttributes(string $plugs[])
+{
+    string $values[];
+    for ($i = 0; $i < size($plugs); $i++)
+    {
+        string $type = `getAttr -type $plugs[$i]`;
+        if ($type == "string")
+        {
+            $values[$i] = `getAttr $plugs[$i]`;
+        }
+        else if (`gmatch $type "*[23]"`)
+        {
+            float $children[] = `getAttr $plugs[$i]`;
+            string $value = "";
+            for ($child in $children)
+                $value += $child + " ";
+            $values[$i] = strip($value);
+        }
+        else
+        {
+            float $value = `getAttr $plugs[$i]`;
+            $values[$i] = $value;
+        }
+    }
+    return $values;
+}
+"""
+
+
+def _mel_string(value):
+    """ Return the value as a quoted MEL string literal.
+
+    For module internal use.
+
+    :param value: The string to quote.
+    :type  value: str, unicode
+
+    :rtype: str
+    """
+    value = value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+    return "\"{0}\"".format(value)
+
+
+def melStringArray(values):
+    """ Return the values as a MEL string array literal, e.g. ``{"a", "b"}``.
+
+    :param values: The strings.
+    :type  values: list
+
+    :rtype: str
+    """
+    return "{" + ", ".join(_mel_string(value) for value in values) + "}"
+
+
+def _unique(nodes):
+    """ Return the nodes without duplicates while preserving the order.
+
+    For module internal use.
+
+    :rtype: list
+    """
+    seen = set()
+    result = []
+    for node in nodes:
+        if node not in seen:
+            seen.add(node)
+            result.append(node)
+    return result
+
+
+def evalStatements(statements, chunkSize=None):
+    """ Evaluate a list of MEL statements in as few ``mel.eval`` calls as possible.
+
+    All statements are recorded as a single undo step. While profiling the statements are recorded per command,
+    see `vrayformayaUtils.profiling`.
+
+    :param statements: The MEL statements to evaluate (without trailing semicolon).
+    :type  statements: list
+
+    :param chunkSize: The amount of statements combined per evaluation. If None the module's CHUNK_SIZE is used.
+    :type  chunkSize: None or int
+
+    :return: The amount of ``mel.eval`` calls that were done.
+    :rtype: int
+    """
+    if chunkSize is None:
+        chunkSize = CHUNK_SIZE
+
+    calls = 0
+    with bulkOperation(suspendRefresh=False):
+        for i in range(0, len(statements), chunkSize):
+            chunk = statements[i:i+chunkSize]
+            start = time.time()
+            mel.eval(";\n".join(chunk) + ";")
+            profiling.addStatements(chunk, time.time() - start)
+            calls += 1
+
+    return calls
+
+
+def getAttributes(plugs, chunkSize=None):
+    """ Return the current values of the plugs.
+
+    The values are queried in chunks with a MEL procedure, so only one command invocation is done per chunk of
+    plugs instead of a ``mc.getAttr`` per plug. The values are returned as strings: numeric values are converted
+    and numeric compounds (e.g. double3) are returned as their space separated child values.
+
+    :param plugs: The plugs to query, e.g. ["pCubeShape1.vraySubdivEnable"].
+    :type  plugs: list
+
+    :param chunkSize: The amount of plugs queried per evaluation. If None the module's CHUNK_SIZE is used.
+    :type  chunkSize: None or int
+
+    :return: The values in the same order as the plugs.
+    :rtype: list
+    """
+    if chunkSize is None:
+        chunkSize = CHUNK_SIZE
+
+    values = []
+    if not plugs:
+        return values
+
+    mel.eval(_GET_ATTRIBUTES_PROC)
+    for i in range(0, len(plugs), chunkSize):
+        values.extend(mel.eval("vrayformayaUtils_getAttributes({0})".format(melStringArray(plugs[i:i+chunkSize])))
+                      or [])
+    return values
+
+
+def addAttributesFromGroup(nodes, group, state=1, chunkSize=None):
+    """ Add/remove a v-ray attribute group to/from all nodes.
+
+    This is the batched equivalent of calling ``mc.vray("addAttributesFromGroup", node, group, state)`` for every
+    node. Duplicate nodes are only processed once.
+
+    :param nodes: The nodes to add the attribute group to (or remove it from).
+    :type  nodes: list
+
+    :param group: The name of the v-ray attribute group, e.g. "vray_subdivision".
+    :type  group: str
+
+    :param state: If state is True it will add the attribute group, else it will remove it.
+    :type  state: 1 or 0
+
+    :param chunkSize: The amount of nodes processed per command invocation. If None the module's CHUNK_SIZE is used.
+    :type  chunkSize: None or int
+
+    :return: The nodes that have been processed.
+    :rtype: list
+    """
+    nodes = _unique(nodes)
+    evalStatements(_add_statements(nodes, group, state), chunkSize=chunkSize)
+    return nodes
+
+
+def _add_statements(nodes, group, state):
+    """ Return the MEL statements that add/remove the attribute group to/from the nodes.
+
+    For module internal use.
+
+    :rtype: list
+    """
+    suffix = " {0} {1}".format(_mel_string(group), int(state))
+    return ["vray \"addAttributesFromGroup\" " + _mel_string(node) + suffix for node in nodes]
+
+
+#: The result of an attribute group operation. `changed` lists the nodes that were processed, `skipped` lists the
+#: nodes that were already in the requested state (only filled when skipping unchanged nodes) and `collapsed` is the
+#: amount of instanced DAG paths that were skipped because their underlying node was already processed.
+GroupResult = namedtuple("GroupResult", ["changed", "skipped", "collapsed"])
+
+
+def _values_equal(current, value):
+    """ Return whether the current attribute value (as returned by getAttr or `getAttributes`) equals the requested
+    value.
+
+    For module internal use.
+
+    :rtype: bool
+    """
+    # Numeric compounds are returned by getAttributes as their space separated child values
+    if isinstance(value, (list, tuple)) and isinstance(current, basestring):
+        current = current.split()
+
+    # Compound attributes (e.g. double3) are returned by getAttr as a list with a single tuple
+    if isinstance(current, list) and len(current) == 1 and isinstance(current[0], tuple):
+        current = current[0]
+
+    if isinstance(value, (list, tuple)):
+        if not isinstance(current, (list, tuple)) or len(current) != len(value):
+            return False
+        return all(_values_equal(c, v) for c, v in zip(current, value))
+
+    if isinstance(value, basestring):
+        # An empty string attribute is returned as None
+        return (current or "") == value
+
+    # Float attributes are single precision, so large values are compared with a relative tolerance
+    try:
+        current, value = float(current), float(value)
+        return abs(current - value) <= max(1e-6, 1e-5 * max(abs(current), abs(value)))
+    except (ValueError, TypeError):
+        return current == value
+
+
+def hasAttribute(nodes, attr):
+    """ Return the nodes that have the attribute `attr`.
+
+    The existence is queried with a single ``mc.ls`` call for all nodes instead of an ``mc.objExists`` per node.
+
+    :param nodes: The nodes (long names) to check.
+    :type  nodes: list
+
+    :param attr: The attribute name.
+    :type  attr: str
+
+    :rtype: set
+    """
+    if not nodes:
+        return set()
+
+    plugs = mc.ls(["{0}.{1}".format(node, attr) for node in nodes], long=True)
+    if not plugs:
+        return set()
+
+    return set(plug.rsplit(".", 1)[0] for plug in plugs)
+
+
+def _mel_set_attr(value):
+    """ Return the flags and value arguments of a MEL setAttr statement for the value.
+
+    For module internal use.
+
+    :return: A (flags, arguments) tuple of MEL argument strings.
+    :rtype: tuple
+    """
+    if isinstance(value, basestring):
+        return "-type \"string\" ", " " + _mel_string(value)
+    elif isinstance(value, (list, tuple)):
+        # Numeric compounds (double3, float3) take their child values directly without a type flag
+        return "", " " + " ".join(repr(float(x)) for x in value)
+    elif isinstance(value, bool):
+        return "", " {0}".format(int(value))
+    elif isinstance(value, float):
+        return "", " " + repr(value)
+    else:
+        return "", " {0}".format(value)
+
+
+def setAttributes(nodes, values, chunkSize=None):
+    """ Set the attribute values on all nodes.
+
+    The values are converted to MEL arguments only once per attribute (instead of once per node) and all setAttr
+    statements are evaluated in chunks, so the amount of command invocations doesn't grow with nodes * attributes.
+
+    :param nodes: The nodes to set the values on.
+    :type  nodes: list
+
+    :param values: The (attribute, value) pairs to set in order. Pairs with a value of None are ignored.
+    :type  values: list
+
+    :param chunkSize: The amount of statements combined per evaluation. If None the module's CHUNK_SIZE is used.
+    :type  chunkSize: None or int
+    """
+    evalStatements(_set_statements(nodes, values), chunkSize=chunkSize)
+
+
+def setNodeAttributes(nodeValues, chunkSize=None):
+    """ Set different attribute values per node.
+
+    Like `setAttributes` all setAttr statements are evaluated in chunks, but every node gets its own values.
+
+    :param nodeValues: The (node, values) pairs where values are the (attribute, value) pairs to set on the node in
+                       order. Pairs with a value of None are ignored.
+    :type  nodeValues: list
+
+    :param chunkSize: The amount of statements combined per evaluation. If None the module's CHUNK_SIZE is used.
+    :type  chunkSize: None or int
+    """
+    statements = []
+    for node, values in nodeValues:
+        statements.extend(_set_statements_from_args(node, _set_args(values)))
+    evalStatements(statements, chunkSize=chunkSize)
+
+
+def _set_args(values):
+    """ Return the (plug suffix, (flags, arguments)) pairs of MEL setAttr arguments for the values.
+
+    For module internal use.
+
+    :rtype: list
+    """
+    return [(".{0}".format(attr), _mel_set_attr(value)) for attr, value in values if value is not None]
+
+
+def _set_statements_from_args(node, args):
+    """ Return the MEL setAttr statements for a single node from converted arguments.
+
+    For module internal use.
+
+    :rtype: list
+    """
+    return ["setAttr " + flags + _mel_string(node + attr) + value for attr, (flags, value) in args]
+
+
+def _set_statements(nodes, values):
+    """ Return the MEL setAttr statements that set the values on all nodes.
+
+    For module internal use.
+
+    :rtype: list
+    """
+    args = _set_args(values)
+
+    statements = []
+    for node in nodes:
+        statements.extend(_set_statements_from_args(node, args))
+    return statements
+
+
+#: A single planned operation on a node. `action` is "add" (add the attribute group and set the values), "remove"
+#: (remove the attribute group) or "set" (the node already has the attribute group, only set the values).
+#: `values` are the (attribute, value) pairs that will be set.
+Operation = namedtuple("Operation", ["node", "group", "action", "values"])
+
+
+class GroupPlan(object):
+    """ The planned operations of an attribute group operation.
+
+    Planning doesn't change the scene, so a plan can be inspected (e.g. by a pipeline validator) before it is
+    executed. Nodes that share the same values also share the same `values` tuple, which keeps planning cheap for
+    large amounts of nodes.
+    """
+    def __init__(self, group, operations, skipped=None, collapsed=0):
+        self.group = group
+        self.operations = operations
+        self.skipped = skipped or []
+        self.collapsed = collapsed
+
+    def __len__(self):
+        return len(self.operations)
+
+    def __iter__(self):
+        return iter(self.operations)
+
+    def __repr__(self):
+        return "GroupPlan({0!r}, {1} operations, {2} skipped)".format(self.group, len(self.operations),
+                                                                        len(self.skipped))
+
+    def execute(self, chunkSize=None):
+        """ Execute the planned operations in a single pass.
+
+        :param chunkSize: The amount of statements processed per command invocation.
+                          If None the module's CHUNK_SIZE is used.
+        :type  chunkSize: None or int
+
+        :rtype: GroupResult
+        """
+        statements = []
+        setStatements = []
+        converted = {}
+        for node, group, action, values in self.operations:
+            if action != "set":
+                statements.extend(_add_statements([node], group, int(action == "add")))
+            if values:
+                # Convert the values to MEL arguments only once per distinct values tuple
+                args = converted.get(id(values))
+                if args is None:
+                    args = converted[id(values)] = _set_args(values)
+                setStatements.extend(_set_statements_from_args(node, args))
+
+        statements.extend(setStatements)
+        evalStatements(statements, chunkSize=chunkSize)
+
+        return GroupResult(changed=[operation.node for operation in self.operations],
+                           skipped=self.skipped,
+                           collapsed=self.collapsed)
+
+
+def planAttributeGroup(nodes, group, state=1, values=None, skipUnchanged=False):
+    """ Plan adding/removing a v-ray attribute group to/from the nodes and setting the requested attribute values.
+
+    This doesn't change the scene. When skipUnchanged is True the scene is queried (in bulk) to leave out the nodes
+    that are already in the requested state.
+
+    See `applyAttributeGroup` for the parameters.
+
+    :rtype: GroupPlan
+    """
+    nodes = _unique(nodes)
+    values = values or []
+    setValues = tuple((attr, value) for attr, value in values if value is not None)
+    action = "add" if state else "remove"
+
+    if not skipUnchanged or not values:
+        if not state:
+            setValues = ()
+        return GroupPlan(group, [Operation(node, group, action, setValues) for node in nodes])
+
+    # Detect which nodes already have the attribute group by checking for one of its attributes
+    present = hasAttribute(nodes, values[0][0])
+
+    if not state:
+        operations = [Operation(node, group, action, ()) for node in nodes if node in present]
+        return GroupPlan(group, operations, skipped=[node for node in nodes if node not in present])
+
+    # Query the current values of all nodes that already have the attribute group in a single pass
+    presentNodes = [node for node in nodes if node in present]
+    plugs = ["{0}.{1}".format(node, attr) for node in presentNodes for attr, value in setValues]
+    current = dict(zip(plugs, getAttributes(plugs)))
+
+    # Only set the values that differ on the nodes that already have the attribute group
+    operations = []
+    skipped = []
+    for node in nodes:
+        if node not in present:
+            operations.append(Operation(node, group, action, setValues))
+            continue
+
+        differing = tuple((attr, value) for attr, value in setValues
+                          if not _values_equal(current["{0}.{1}".format(node, attr)], value))
+        if differing:
+            operations.append(Operation(node, group, "set", differing))
+        else:
+            skipped.append(node)
+
+    return GroupPlan(group, operations, skipped=skipped)
+
+
+def applyAttributeGroup(nodes, group, state=1, values=None, skipUnchanged=False, chunkSize=None):
+    """ Add/remove a v-ray attribute group to/from the nodes and set the requested attribute values.
+
+    When skipUnchanged is True the presence of the attribute group is queried in bulk up front and the current
+    values are compared against the requested values. Only nodes that actually need to change are processed,
+    which makes re-running the same operation on an already finished scene cheap.
+
+    :param nodes: The nodes to operate on.
+    :type  nodes: list
+
+    :param group: The name of the v-ray attribute group, e.g. "vray_subdivision".
+    :type  group: str
+
+    :param state: If state is True it will add the attribute group, else it will remove it.
+    :type  state: 1 or 0
+
+    :param values: The (attribute, value) pairs of the attribute group. Values that are None remain
+                   default/unchanged. The attribute names are also used to detect whether a node already has
+                   the attribute group.
+    :type  values: None or list
+
+    :param skipUnchanged: If True only nodes that need to change are processed.
+    :type  skipUnchanged: bool
+
+    :param chunkSize: The amount of nodes processed per command invocation. If None the module's CHUNK_SIZE is used.
+    :type  chunkSize: None or int
+
+    :rtype: GroupResult
+    """
+    plan = planAttributeGroup(nodes, group, state, values=values, skipUnchanged=skipUnchanged)
+    return plan.execute(chunkSize=chunkSize)
@@ -1,5 +1,40 @@
+import json
+import os
+
 import maya.cmds as mc
 import maya.mel as mel
+from vrayformayaUtils import sceneIndex
+from vrayformayaUtils.batch import melStringArray, setNodeAttributes
+from vrayformayaUtils.utils import bulkOperation, getStringAttributes
+
+try:
+    basestring
+except NameError:
+    basestring = str
+
+#: The JSON file the render element schemas are persisted to. If None the schemas are stored in
+#: ``vrayformayaUtils/renderElementSchemas.json`` in Maya's user app directory.
+SCHEMA_CACHE_PATH = None
+
+#: The attribute schemas of the render elements per vrayClassType of the loaded V-Ray version (loaded lazily from
+#: the schema cache file), see `getRenderElementSchema`.
+_RENDER_ELEMENT_SCHEMAS = None
+
+#: Creates multiple render elements (and renames them) in a single MEL evaluation, see `addRenderElements`.
+_ADD_RENDER_ELEMENTS_PROC = """
+global proc string[] vrayformayaUtils_addRenderElements(string $classTypes[], string $names[])
+{
+    string $nodes[];
+    for ($i = 0; $i < size($classTypes); $i++)
+    {
+        string $node = `vrayAddRenderElement $classTypes[$i]`;
+        if ($names[$i] != "")
+            $node = `rename $node $names[$i]`;
+        $nodes[$i] = $node;
+    }
+    return $nodes;
+}
+"""
 
 def loadVray():
     """ Loads the v-ray plug-in """
@@ -17,6 +52,57 @@ def getRenderElementClassType(renderElement):
     return mc.getAttr(attr)
 
 
+def getRenderElementClassTypes(renderElements):
+    """ Return the vrayClassType of all render elements in a single pass.
+
+        Instead of a ``mc.getAttr`` call per render element the values are read through the API in one go, see
+        ``vrayformayaUtils.utils.getStringAttributes``.
+
+        :param renderElements: The names of the render element nodes.
+        :type  renderElements: list
+
+        :returns: The vrayClassType per render element, in the same order as renderElements.
+        :rtype: list
+    """
+    return getStringAttributes(renderElements, "vrayClassType")
+
+
+def buildRenderElementIndex(renderElements=None):
+    """ Return an index of the render elements by their vrayClassType.
+
+        :param renderElements: An input list to get render elements from. If None it will use ALL nodes in the scene.
+        :type  renderElements: list, None
+
+        :returns: A dictionary of vrayClassType to the list of render element node names.
+        :rtype: dict
+    """
+    if renderElements is None:
+        renderElements = mc.ls(type="VRayRenderElement")
+    else:
+        renderElements = mc.ls(renderElements, type="VRayRenderElement")
+
+    index = {}
+    for renderElement, classType in zip(renderElements, getRenderElementClassTypes(renderElements)):
+        index.setdefault(classType, []).append(renderElement)
+    return index
+
+
+def getRenderElementIndex():
+    """ Return an index of all render elements in the scene by their vrayClassType.
+
+        When the scene index is enabled (see ``vrayformayaUtils.sceneIndex``) the index is cached until a render
+        element is created, renamed or deleted.
+
+        :returns: A dictionary of vrayClassType to the list of render element node names.
+        :rtype: dict
+    """
+    index = sceneIndex.active()
+    if index is not None:
+        return index.renderElementIndex()
+
+    return buildRenderElementIndex()
+
+
 def getRenderElements(renderElements=None, vrayClassType=None):
     """ Returns the render elements in the scene.
 
@@ -44,7 +130,18 @@ def getRenderElements(renderElements=None, vrayClassType=None):
         else:
             vrayClassType = set(vrayClassType)
 
-        renderElements = [x for x in renderElements if getRenderElementClassType(x) in vrayClassType]
+        # Look up the class types of all render elements at once instead of per render element
+        index = sceneIndex.active()
+        if index is not None:
+            index = index.renderElementIndex()
+        else:
+            index = buildRenderElementIndex(renderElements)
+
+        matching = set()
+        for classType in vrayClassType:
+            matching.update(index.get(classType, []))
+
+        renderElements = [x for x in renderElements if x in matching]
 
     return renderElements
 
@@ -87,15 +184,242 @@ def addRenderElement(vrayClassType, enabled=True, name=None, suffix=None, **kwar
     if suffix is not None:
         mc.setAttr("{0}.vray_name_multimatte".format(node), suffix, type="string")
 
-    for kw, value in kwargs.iteritems():
+    schema = None
+    for kw, value in kwargs.items():
         if kw.startswith("vray"):
+            if schema is None:
+                schema = getRenderElementSchema(vrayClassType, node=node)
+
             nodeAttr = "{0}.{1}".format(node, kw)
-            if not mc.objExists(nodeAttr):
+            if kw not in schema:
                 mc.warning("{0} doesn't exist. You have likely entered an invalid attribute keyword.".format(nodeAttr))
+            elif schema[kw] == "string":
+                mc.setAttr(nodeAttr, _coerce_string(value), type="string")
             else:
-                if isinstance(value, basestring):
-                    mc.setAttr(nodeAttr, value, type="string")
-                else:
-                    mc.setAttr(nodeAttr, value)
+                mc.setAttr(nodeAttr, value)
+
+    return node
+
+
+def _coerce_string(value):
+    """ Return the value as string for a string attribute.
+
+        For module internal use.
+    """
+    if isinstance(value, basestring):
+        return value
+    return str(value)
+
+
+def _vray_version():
+    """ Return the version of the loaded V-Ray plug-in or None if it isn't loaded.
+
+        For module internal use.
+    """
+    try:
+        return mc.pluginInfo("vrayformaya", query=True, version=True)
+    except RuntimeError:
+        return None
+
+
+def _schema_cache_path():
+    """ Return the path of the render element schema cache file.
+
+        For module internal use.
+    """
+    if SCHEMA_CACHE_PATH is not None:
+        return SCHEMA_CACHE_PATH
+    return os.path.join(mc.internalVar(userAppDir=True), "vrayformayaUtils", "renderElementSchemas.json")
+
+
+def _read_schema_cache(path):
+    """ Return the contents of the schema cache file (an empty dictionary if it doesn't exist or is invalid).
+
+        For module internal use.
+    """
+    try:
+        with open(path, "r") as f:
+            cache = json.load(f)
+    except (IOError, OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _load_schemas():
+    """ Return the render element schemas of the loaded V-Ray version, loading them from the cache file once.
+
+        For module internal use.
+    """
+    global _RENDER_ELEMENT_SCHEMAS
+    if _RENDER_ELEMENT_SCHEMAS is None:
+        version = _vray_version()
+        schemas = {}
+        if version is not None:
+            schemas = _read_schema_cache(_schema_cache_path()).get(version, {})
+        _RENDER_ELEMENT_SCHEMAS = schemas
+    return _RENDER_ELEMENT_SCHEMAS
+
+
+def _save_schemas():
+    """ Persist the render element schemas of the loaded V-Ray version to the cache file.
+
+        The schemas of other V-Ray versions in the file are kept.
+
+        For module internal use.
+    """
+    version = _vray_version()
+    if version is None:
+        return
+
+    path = _schema_cache_path()
+    cache = _read_schema_cache(path)
+    cache[version] = _RENDER_ELEMENT_SCHEMAS
+    try:
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(path, "w") as f:
+            json.dump(cache, f, indent=1, sort_keys=True)
+    except (IOError, OSError) as e:
+        mc.warning("Unable to write the render element schema cache {0}: {1}".format(path, e))
+
+
+def clearRenderElementSchemas(persisted=False):
+    """ Clear the cached render element schemas so they will be looked up again.
+
+        :param persisted: If True the schemas of the loaded V-Ray version are also removed from the cache file.
+        :type  persisted: bool
+    """
+    global _RENDER_ELEMENT_SCHEMAS
+    if persisted:
+        _RENDER_ELEMENT_SCHEMAS = {}
+        _save_schemas()
+    _RENDER_ELEMENT_SCHEMAS = None
+
+
+def getRenderElementSchema(vrayClassType, node=None):
+    """ Return the v-ray attributes that are available on render elements of the vrayClassType.
+
+        The schema is discovered only once per vrayClassType and V-Ray version. It is persisted to a JSON file (see
+        SCHEMA_CACHE_PATH) keyed by the V-Ray version, so later sessions only need a dictionary lookup. To discover
+        the schema an existing render element of that type is used. If the scene doesn't have one a temporary render
+        element is created and deleted again within a single undo step.
+
+        :param vrayClassType: The vrayClassType of the render element, e.g. "MultiMatteElement".
+        :type  vrayClassType: str
+
+        :param node: A render element of the vrayClassType to discover the schema from if it isn't cached yet.
+        :type  node: None or str
+
+        :returns: A dictionary of attribute name to attribute type (as returned by ``mc.getAttr(type=True)``).
+        :rtype: dict
+    """
+    schemas = _load_schemas()
+    schema = schemas.get(vrayClassType)
+    if schema is not None:
+        return schema
+
+    with bulkOperation(suspendRefresh=False):
+        temporary = False
+        if node is None:
+            existing = getRenderElements(vrayClassType=vrayClassType)
+            if existing:
+                node = existing[0]
+            else:
+                node = mel.eval("vrayAddRenderElement {0}".format(vrayClassType))
+                temporary = True
+
+        try:
+            schema = {}
+            for attr in mc.listAttr(node, string="vray*") or []:
+                try:
+                    schema[attr] = mc.getAttr("{0}.{1}".format(node, attr), type=True)
+                except (RuntimeError, ValueError):
+                    # Multi and compound children can't be queried without an index
+                    schema[attr] = None
+        finally:
+            if temporary:
+                mc.delete(node)
+
+    schemas[vrayClassType] = schema
+    _save_schemas()
+    return schema
+
+
+def addRenderElements(specs):
+    """ Create many V-ray Render Elements at once.
+
+        Each spec is a dictionary with the same keywords as `addRenderElement`. All specs are validated against the
+        attribute schema of their vrayClassType (see `getRenderElementSchema`) before anything is created. Values for
+        string attributes are converted to strings. The render
+        elements are created and renamed in a single MEL evaluation and all attributes are set in one batched pass,
+        recorded as a single undo step. Discovering a schema that isn't cached yet may create and delete a temporary
+        render element, that is part of the same undo step.
+
+        .. code-block:: python
+
+            import vrayformayaUtils as vfm
+
+            vfm.addRenderElements([{"vrayClassType": "MultiMatteElement",
+                                    "name": "multimatte{0}".format(x),
+                                    "vray_redid_multimatte": x} for x in range(10)])
+
+        :param specs: The render elements to create.
+        :type  specs: list
+
+        :return: The names of the created nodes in the order of specs.
+        :rtype: list
+    """
+    options = ("vrayClassType", "enabled", "name", "suffix")
+
+    if not specs:
+        return []
+
+    # The schemas are discovered within the undo chunk, so their temporary render elements are undone with it
+    with bulkOperation(len(specs)):
+        # Validate all specs before creating anything
+        errors = []
+        for i, spec in enumerate(specs):
+            if "vrayClassType" not in spec:
+                raise TypeError("Render element spec {0} is missing the vrayClassType".format(i))
+
+            schema = getRenderElementSchema(spec["vrayClassType"])
+            for kw, value in spec.items():
+                if kw in options:
+                    continue
+                if not kw.startswith("vray"):
+                    raise TypeError("Render element spec {0} got an unexpected keyword '{1}'".format(i, kw))
+
+                attrType = schema.get(kw, False)
+                if attrType is False:
+                    errors.append("{0} doesn't exist on {1} render elements.".format(kw, spec["vrayClassType"]))
+                elif attrType != "string" and isinstance(value, basestring):
+                    errors.append("{0} of {1} render elements must be numeric, not {2!r}".format(
+                        kw, spec["vrayClassType"], value))
+
+        if errors:
+            raise RuntimeError("Invalid render element specs:\n" + "\n".join(errors))
+
+        mel.eval(_ADD_RENDER_ELEMENTS_PROC)
+        nodes = mel.eval("vrayformayaUtils_addRenderElements({0}, {1})".format(
+            melStringArray([spec["vrayClassType"] for spec in specs]),
+            melStringArray([spec.get("name") or "" for spec in specs])))
+
+        nodeValues = []
+        for node, spec in zip(nodes, specs):
+            values = []
+            if not spec.get("enabled", True):
+                values.append(("enabled", False))
+            if spec.get("suffix") is not None:
+                values.append(("vray_name_multimatte", _coerce_string(spec["suffix"])))
+            schema = getRenderElementSchema(spec["vrayClassType"])
+            for kw, value in spec.items():
+                if kw not in options:
+                    if schema[kw] == "string":
+                        value = _coerce_string(value)
+                    values.append((kw, value))
+            nodeValues.append((node, values))
+
+        setNodeAttributes(nodeValues)
 
-    return node
\ No newline at end of file
+    return list(nodes)
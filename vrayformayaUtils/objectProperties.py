@@ -20,18 +20,38 @@
         Instead of forcing you to operate on the current selection (like Chaosgroup is doing) our method contains a
         nodes parameter that allows you to operate on the list you provide yourself.
 
+    - **No selection changes (useSelection parameter)**
+
+        With useSelection set to False new objectProperties nodes are created and their members are added directly,
+        so the selection isn't touched. Changing the selection triggers Maya's selection callbacks and UI updates
+        (e.g. in the outliner) which makes the selection based ``mc.vray("objectProperties", ..)`` slow for large
+        amounts of nodes. This is opt-in until it's verified to give the same nodes as the vray command for all
+        objectProperties types.
+
+    - **Many sets in one call**
+
+        With ``addObjectProperties`` a whole mapping of set name to member nodes is created (or updated) at once.
+
+    - **Single undo step**
+
+        The selection changes, the objectProperties command and the renaming are recorded as a single undo step.
+
 
     Functions
     =========
 """
 
+from collections import OrderedDict
+
 import maya.cmds as mc
-from vrayformayaUtils.utils import getConnectedSets
+from vrayformayaUtils.utils import ConnectedSetsSnapshot, bulkOperation
 
+@bulkOperation()
 def objectProperties(cmd,
                      type=None,
                      nodes=None,
-                     name=None):
+                     name=None,
+                     useSelection=True):
     """ Adds/removes objectProperties to/from input nodes.
 
     This is currently an experimental implementation, behaviour and naming of functions/keywords may change.
@@ -51,6 +71,12 @@ def objectProperties(cmd,
     :param name: Rename the created nodes to `name`. If None provided nodes will get default name.
     :type  name: str
 
+    :param useSelection: If True the objectProperties are changed through ``mc.vray("objectProperties", ..)``
+                         which operates on the selection (the original selection is restored afterwards).
+                         If False new objectProperties nodes are created directly without touching the selection
+                         (experimental). The "remove" and "remove_sub" cmds always use the selection.
+    :type  useSelection: bool
+
     :return: If objectProperties nodes are created it returns the newly created nodes. If no nodes have been created,
              but there are related objectProperties nodes that have been deletd those will be returned.
 
@@ -61,6 +87,117 @@ def objectProperties(cmd,
                 For "remove" cmd it will return the removed/deleted objectProperties nodes.
     :rtype: list
 
+    """
+    # We're using the type to filter the connected sets to a list as small as possible. (Optimization)
+    # Therefore if None is provided (default is used) we convert it to its actual default type name.
+    if type is None:
+        type = "VRayObjectProperties"
+
+    if useSelection or cmd not in _DIRECT_COMMANDS:
+        return _objectProperties_selection(cmd, type, nodes, name)
+
+    if nodes is None:
+        nodes = mc.ls(sl=1)
+    else:
+        nodes = mc.ls(nodes)
+
+    if not nodes:
+        return []
+
+    return _DIRECT_COMMANDS[cmd](type, nodes, name)
+
+
+def _add_single(type, nodes, name):
+    """ Create a single objectProperties node with all nodes as members.
+
+    For module internal use.
+
+    :rtype: list
+    """
+    node = mc.createNode(type, name=name) if name is not None else mc.createNode(type)
+    mc.sets(nodes, addElement=node)
+    return [node]
+
+
+def _add_multiple(type, nodes, name):
+    """ Create an objectProperties node per node.
+
+    For module internal use.
+
+    :rtype: list
+    """
+    new_sets = []
+    for node in nodes:
+        new_sets.extend(_add_single(type, [node], name))
+    return new_sets
+
+
+@bulkOperation()
+def addObjectProperties(sets, type=None, replace=False):
+    """ Create or update many objectProperties nodes in one call.
+
+    Existing objectProperties nodes of `type` with the requested names are looked up once for all sets and get the
+    members added. All other sets are created. The selection isn't changed and no connected sets have to be compared
+    before and after, so this scales with the amount of sets instead of the amount of scene queries per set.
+
+    .. code-block:: python
+
+        from vrayformayaUtils.objectProperties import addObjectProperties
+
+        addObjectProperties({"rocks_props": mc.ls("rock*", type="transform"),
+                             "trees_props": mc.ls("tree*", type="transform")})
+
+    :param sets: The objectProperties node names mapped to their member nodes.
+    :type  sets: dict
+
+    :param type: The objectProperties type to operate on. If None provided the default "VRayObjectProperties" is used.
+    :type  type: str
+
+    :param replace: If True the members of existing nodes that aren't in the mapping are removed.
+    :type  replace: bool
+
+    :return: The requested names mapped to the actual objectProperties node names (a new node gets another name if
+             a node of another type already has the requested name).
+    :rtype: OrderedDict
+    """
+    if type is None:
+        type = "VRayObjectProperties"
+
+    items = list(sets.items())
+    existing = set(mc.ls([name for name, members in items], type=type) or [])
+
+    result = OrderedDict()
+    for name, members in items:
+        members = mc.ls(members, long=True) if members else []
+
+        if name in existing:
+            node = name
+            if replace:
+                current = mc.sets(node, q=True)
+                obsolete = set(mc.ls(current, long=True) if current else []) - set(members)
+                if obsolete:
+                    mc.sets(list(obsolete), remove=node)
+        else:
+            node = mc.createNode(type, name=name)
+
+        if members:
+            mc.sets(members, addElement=node)
+        result[name] = node
+
+    return result
+
+
+#: The objectProperties commands that are implemented without changing the selection.
+_DIRECT_COMMANDS = {"add_single": _add_single,
+                    "add_multiple": _add_multiple}
+
+
+def _objectProperties_selection(cmd, type, nodes, name):
+    """ Adds/removes objectProperties to/from input nodes through the selection based vray command.
+
+    For module internal use.
+
+    :rtype: list
     """
     # Since the objectProperties command operates on selection when we provide a nodes list
     # we override the selection and store the current selection to set it back afterwards
@@ -74,19 +211,13 @@ def objectProperties(cmd,
     if not sel:
         return []
 
-    # We're using the type to filter the connected sets to a list as small as possible. (Optimization)
-    # Therefore if None is provided (default is used) we convert it to its actual default type name.
-    if type is None:
-        type = "VRayObjectProperties"
-
-    pre_connected_sets = set(getConnectedSets(sel, type=type))
+    snapshot = ConnectedSetsSnapshot(sel, type=type)
 
     # Create the object properties
     mc.vray("objectProperties", cmd, type)
 
     # Get the actual objectProperties nodes that have been created
-    post_connected_sets = set(getConnectedSets(sel, type=type))
-    new_sets = post_connected_sets - pre_connected_sets
+    new_sets, deleted_sets = snapshot.diff()
 
     # If there are new sets than the objectProperties commands created something
     if new_sets:
@@ -106,7 +237,6 @@ def objectProperties(cmd,
         return list(new_sets)
 
     # If no new sets were created it's likely that something has been deleted instead.
-    deleted_sets = pre_connected_sets - post_connected_sets
     if deleted_sets:
         # Return the names of the deleted nodes
         return list(deleted_sets)
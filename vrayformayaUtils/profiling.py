@@ -0,0 +1,292 @@
+"""
+    The `profiling` module provides optional instrumentation of the package to see where the time of a slow call goes.
+
+    While profiling every ``maya.cmds`` command (including ``mc.vray``, recorded per sub-command like
+    "vray addAttributesFromGroup") and ``mel.eval`` call made by the package is recorded with its count and cumulative
+    time, both in total and per public function of the package that issued it. The public functions themselves are
+    recorded with their call count and cumulative (inclusive) time as well.
+
+    The MEL statements that are batched into a single ``mel.eval`` (see `vrayformayaUtils.batch.evalStatements`) are
+    recorded per command too, so a batched operation doesn't show up as a single opaque ``mel.eval`` row.
+
+    Example:
+
+    .. code-block:: python
+
+        import vrayformayaUtils as vfm
+
+        with vfm.profile() as stats:
+            vfm.attributes.vray_subdivision(state=1)
+
+        print(stats.report())
+
+    Outside of a profile the package isn't instrumented at all, so it has no overhead.
+
+    Functions
+    =========
+"""
+import importlib
+import sys
+import time
+import types
+
+_ACTIVE = None
+
+#: The commands whose first argument is a sub-command, they're recorded per sub-command.
+SUBCOMMANDS = ("vray",)
+
+
+def _commandName(command, args):
+    """ Return the name a command call is recorded as, e.g. "vray addAttributesFromGroup".
+
+    For module internal use.
+    """
+    if command in SUBCOMMANDS and args:
+        return "{0} {1}".format(command, args[0])
+    return command
+
+
+def _statementCommand(statement):
+    """ Return the name a MEL statement is recorded as, e.g. "setAttr" or "vray addAttributesFromGroup".
+
+    For module internal use.
+    """
+    parts = statement.split(None, 2)
+    return _commandName(parts[0], [part.strip("\"") for part in parts[1:2]])
+
+
+def addStatements(statements, seconds):
+    """ Record MEL statements that were evaluated together in seconds by the active profile.
+
+    The time is divided evenly over the statements. Outside of a profile this doesn't do anything.
+
+    :param statements: The MEL statements.
+    :type  statements: list
+
+    :param seconds: The time the evaluation of all statements took.
+    :type  seconds: float
+    """
+    profiler = _ACTIVE
+    if profiler is None or not statements:
+        return
+
+    seconds /= len(statements)
+    for statement in statements:
+        profiler.stats.addStatement(_statementCommand(statement), seconds)
+
+
+class ProfileStats(object):
+    """ The statistics collected by a `profile`.
+
+    - **commands**: {command: [count, seconds]} of all Maya commands.
+    - **functions**: {function: [count, seconds]} of the public functions of the package.
+    - **commandsByFunction**: {function: {command: [count, seconds]}} of the Maya commands issued directly by each
+      public function. Commands that aren't issued from within a public function are listed under None.
+    - **statements**: {command: [count, seconds]} of the batched MEL statements. The seconds are the time of their
+      ``mel.eval`` divided evenly over its statements.
+    """
+    def __init__(self):
+        self.commands = {}
+        self.functions = {}
+        self.commandsByFunction = {}
+        self.statements = {}
+        self.seconds = 0.0
+
+    def _add(self, table, key, seconds):
+        entry = table.get(key)
+        if entry is None:
+            entry = table[key] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+
+    def addCommand(self, command, function, seconds):
+        """ Record a single Maya command call that took seconds, issued from the public function (or None) """
+        self._add(self.commands, command, seconds)
+        self._add(self.commandsByFunction.setdefault(function, {}), command, seconds)
+
+    def addStatement(self, command, seconds):
+        """ Record a single batched MEL statement of command that took seconds """
+        self._add(self.statements, command, seconds)
+
+    def addFunction(self, function, seconds):
+        """ Record a single public function call that took seconds """
+        self._add(self.functions, function, seconds)
+
+    @property
+    def commandCount(self):
+        """ The total amount of Maya commands that were called """
+        return sum(count for count, seconds in self.commands.values())
+
+    def report(self, sortBy="time", limit=None):
+        """ Return the statistics as a readable table.
+
+        :param sortBy: Sort the rows by "time", "count" or "name".
+        :type  sortBy: str
+
+        :param limit: The maximum amount of rows per table. If None all rows are listed.
+        :type  limit: None or int
+
+        :rtype: str
+        """
+        sortKeys = {"time": lambda item: (-item[1][1], item[0]),
+                    "count": lambda item: (-item[1][0], item[0]),
+                    "name": lambda item: item[0]}
+        if sortBy not in sortKeys:
+            raise ValueError("Invalid sortBy: {0}. Use one of: {1}".format(sortBy, ", ".join(sorted(sortKeys))))
+
+        def table(title, entries):
+            rows = sorted(((str(key), value) for key, value in entries.items()), key=sortKeys[sortBy])
+            if limit is not None:
+                rows = rows[:limit]
+            lines = ["{0:<48} {1:>8} {2:>12}".format(title, "calls", "seconds")]
+            lines.extend("{0:<48} {1:>8} {2:>12.6f}".format(name, count, seconds)
+                         for name, (count, seconds) in rows)
+            return lines
+
+        lines = ["Profiled {0} Maya commands in {1:.6f} seconds".format(self.commandCount, self.seconds), ""]
+        lines.extend(table("function", self.functions))
+        lines.append("")
+        lines.extend(table("command", self.commands))
+        if self.statements:
+            lines.append("")
+            lines.extend(table("MEL statement", self.statements))
+        for function in sorted(self.commandsByFunction, key=str):
+            lines.append("")
+            lines.extend(table("{0} > command".format(function), self.commandsByFunction[function]))
+        return "\n".join(lines)
+
+    def dump(self, stream=None, **kwargs):
+        """ Write the report to stream (sys.stdout by default), the kwargs are passed on to `report` """
+        if stream is None:
+            stream = sys.stdout
+        stream.write(self.report(**kwargs) + "\n")
+
+
+class _CommandsProxy(object):
+    """ Stands in for the ``maya.cmds`` or ``maya.mel`` module of an instrumented module.
+
+    For module internal use.
+    """
+    def __init__(self, module, profiler, prefix=""):
+        self._module = module
+        self._profiler = profiler
+        self._prefix = prefix
+        self._wrappers = {}
+
+    def __getattr__(self, name):
+        attr = getattr(self._module, name)
+        if not callable(attr):
+            return attr
+
+        wrapper = self._wrappers.get(name)
+        if wrapper is None:
+            wrapper = self._wrappers[name] = self._profiler._wrapCommand(self._prefix + name, attr)
+        return wrapper
+
+
+class profile(object):
+    """ Instrument the package and collect `ProfileStats` while the context is active.
+
+    .. code-block:: python
+
+        with profile() as stats:
+            vray_subdivision(nodes)
+        stats.dump()
+
+    Only a single profile can be active at a time.
+    """
+    def __init__(self):
+        self.stats = ProfileStats()
+        self._stack = []
+        self._patched = []
+        self._start = None
+
+    def _wrapCommand(self, command, func):
+        stats = self.stats
+        stack = self._stack
+
+        def wrapper(*args, **kwargs):
+            start = time.time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats.addCommand(_commandName(command, args), stack[-1] if stack else None, time.time() - start)
+
+        return wrapper
+
+    def _wrapFunction(self, name, func):
+        stats = self.stats
+        stack = self._stack
+
+        def wrapper(*args, **kwargs):
+            # Recursive calls are included in the time of the outer call
+            if name in stack:
+                return func(*args, **kwargs)
+
+            stack.append(name)
+            start = time.time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stack.pop()
+                stats.addFunction(name, time.time() - start)
+
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def _modules(self):
+        """ Return the modules of the package except for this one """
+        package = __name__.rpartition(".")[0]
+
+        # Load the lazily imported submodules so they're instrumented as well
+        for name in getattr(sys.modules[package], "_LAZY_SUBMODULES", ()):
+            importlib.import_module("{0}.{1}".format(package, name))
+
+        return [module for name, module in sorted(sys.modules.items())
+                if module is not None and (name == package or name.startswith(package + "."))
+                and name != __name__]
+
+    def _patch(self, module, name, value):
+        self._patched.append((module, name, getattr(module, name)))
+        setattr(module, name, value)
+
+    def __enter__(self):
+        global _ACTIVE
+        if _ACTIVE is not None:
+            raise RuntimeError("Another profile is already active.")
+        _ACTIVE = self
+
+        import maya.cmds
+        import maya.mel
+        proxies = {id(maya.cmds): _CommandsProxy(maya.cmds, self),
+                   id(maya.mel): _CommandsProxy(maya.mel, self, prefix="mel.")}
+
+        modules = self._modules()
+        packageNames = set(module.__name__ for module in modules)
+
+        # The same function may be imported in several modules, it gets the same wrapper everywhere
+        wrappers = {}
+        for module in modules:
+            for name, value in list(vars(module).items()):
+                if id(value) in proxies and isinstance(value, types.ModuleType):
+                    self._patch(module, name, proxies[id(value)])
+                elif (isinstance(value, types.FunctionType) and not name.startswith("_")
+                        and value.__module__ in packageNames):
+                    wrapper = wrappers.get(value)
+                    if wrapper is None:
+                        label = "{0}.{1}".format(value.__module__.rpartition(".")[2], value.__name__)
+                        wrapper = wrappers[value] = self._wrapFunction(label, value)
+                    self._patch(module, name, wrapper)
+
+        self._start = time.time()
+        return self.stats
+
+    def __exit__(self, *exc_info):
+        global _ACTIVE
+        self.stats.seconds += time.time() - self._start
+        for module, name, value in reversed(self._patched):
+            setattr(module, name, value)
+        self._patched = []
+        _ACTIVE = None
@@ -0,0 +1,374 @@
+"""
+    The `sceneIndex` module provides an opt-in cache of the scene's DAG hierarchy, shapes by type, material
+    assignments and render elements by vrayClassType.
+
+    Functions like ``getShapes`` and ``getMaterials`` query the scene with ``mc.ls``, ``mc.listRelatives``,
+    ``mc.listHistory`` and ``mc.listConnections`` on every call. When running several attribute functions in a row
+    on the same (large) selection those queries are repeated every time. With the scene index enabled they are
+    answered from an index that is built once and kept up to date through Maya's message callbacks. Only the section
+    of the index that is affected by a change (hierarchy, shadingEngine membership, the materials of a single
+    shadingEngine or the render elements) is rebuilt the next time it is used.
+
+    Example:
+
+    .. code-block:: python
+
+        import vrayformayaUtils as vfm
+        from vrayformayaUtils import sceneIndex
+
+        sceneIndex.enable()
+        vfm.attributes.vray_subdivision()
+        vfm.attributes.vray_subquality(vrayMaxSubdivs=4)
+        sceneIndex.disable()
+
+    Functions
+    =========
+"""
+import maya.cmds as mc
+
+#: The node types that are indexed as render elements.
+_RENDER_ELEMENT_TYPES = ("VRayRenderElement",)
+
+#: The plugs on a shadingEngine that define its membership.
+_MEMBERSHIP_ATTRS = ("dagSetMembers", "instObjGroups")
+
+_ACTIVE = None
+
+
+def active():
+    """ Return the enabled scene index or None if the scene index isn't enabled.
+
+    :rtype: SceneIndex or None
+    """
+    return _ACTIVE
+
+
+def enable(index=None):
+    """ Enable the scene index so it gets used by ``getShapes`` and ``getMaterials``.
+
+    :param index: The index to enable. If None a new index is created that is kept up to date through Maya's
+                  message callbacks.
+    :type  index: None or SceneIndex
+
+    :return: The enabled scene index.
+    :rtype: SceneIndex
+    """
+    global _ACTIVE
+    disable()
+
+    if index is None:
+        index = SceneIndex()
+        index.registerCallbacks()
+
+    _ACTIVE = index
+    return index
+
+
+def disable():
+    """ Disable the scene index and remove its message callbacks """
+    global _ACTIVE
+    if _ACTIVE is not None:
+        _ACTIVE.removeCallbacks()
+        _ACTIVE = None
+
+
+class SceneIndex(object):
+    """ A cache of the scene's DAG hierarchy, shapes by type, material assignments and render elements.
+
+    The index is built lazily per section on first use. The invalidation methods (`nodeAdded`, `nodeRemoved`,
+    `nodeRenamed`, `parentChanged` and `connectionChanged`) mark only the affected sections as dirty. They are
+    called by Maya's message callbacks (see `registerCallbacks`) or by any other scene that reports its changes.
+    """
+    def __init__(self):
+        self._callbacks = []
+
+        # Hierarchy section
+        self._types = None          # long name -> node type (all dag paths)
+        self._children = None       # long name -> child long names
+        self._shapes = None         # set of long names of shapes
+        self._byType = None         # node type -> long names
+
+        # Materials section
+        self._memberships = None    # long name of shape -> shadingEngines
+        self._engineMaterials = {}  # shadingEngine -> materials
+
+        # Render elements section
+        self._renderElements = None  # vrayClassType -> render elements
+
+        self._derivedTypes = {}
+
+    # Invalidation
+
+    def invalidate(self):
+        """ Mark the whole index as dirty """
+        self._types = None
+        self._memberships = None
+        self._engineMaterials = {}
+        self._renderElements = None
+
+    def nodeAdded(self, name, type, dag):
+        if type in _RENDER_ELEMENT_TYPES:
+            self._renderElements = None
+        elif dag:
+            self._types = None
+        elif type == "shadingEngine":
+            self._memberships = None
+
+    def nodeRemoved(self, name, type, dag):
+        if type in _RENDER_ELEMENT_TYPES:
+            self._renderElements = None
+        elif dag:
+            self._types = None
+            self._memberships = None
+        elif type == "shadingEngine":
+            self._memberships = None
+            self._engineMaterials.pop(name, None)
+        else:
+            # A removed material could be connected to any shadingEngine
+            self._engineMaterials = dict((engine, materials) for engine, materials in self._engineMaterials.items()
+                                         if name not in materials)
+
+    def nodeRenamed(self, name, oldName, type, dag):
+        if type in _RENDER_ELEMENT_TYPES:
+            self._renderElements = None
+        elif dag:
+            self._types = None
+            self._memberships = None
+        elif type == "shadingEngine":
+            self._memberships = None
+            self._engineMaterials.pop(oldName, None)
+        else:
+            self.nodeRemoved(oldName, type, dag)
+
+    def parentChanged(self, child):
+        # The long names of the child and all its descendents change.
+        self._types = None
+        self._memberships = None
+
+    def connectionChanged(self, src, dst, made):
+        srcAttr = src.split(".", 1)[-1]
+        dstNode, dstAttr = dst.split(".", 1)
+        if dstAttr.startswith(_MEMBERSHIP_ATTRS) or srcAttr.startswith(_MEMBERSHIP_ATTRS):
+            self._memberships = None
+        else:
+            # The materials of a shadingEngine are the nodes connected to its inputs
+            self._engineMaterials.pop(dstNode.rsplit("|", 1)[-1], None)
+
+    # Maya message callbacks
+
+    def registerCallbacks(self):
+        """ Keep the index up to date through Maya's message callbacks """
+        import maya.api.OpenMaya as om
+
+        def nodeInfo(obj):
+            fn = om.MFnDependencyNode(obj)
+            return fn.name(), fn.typeName, obj.hasFn(om.MFn.kDagNode)
+
+        def nodeAdded(obj, clientData):
+            self.nodeAdded(*nodeInfo(obj))
+
+        def nodeRemoved(obj, clientData):
+            self.nodeRemoved(*nodeInfo(obj))
+
+        def nodeRenamed(obj, oldName, clientData):
+            name, type, dag = nodeInfo(obj)
+            self.nodeRenamed(name, oldName, type, dag)
+
+        def parentChanged(child, parent, clientData):
+            self.parentChanged(child.fullPathName())
+
+        def connectionChanged(src, dst, made, clientData):
+            self.connectionChanged(src.name(), dst.name(), made)
+
+        def sceneChanged(clientData):
+            self.invalidate()
+
+        self.removeCallbacks()
+        self._callbacks = [om.MDGMessage.addNodeAddedCallback(nodeAdded, "dependNode"),
+                           om.MDGMessage.addNodeRemovedCallback(nodeRemoved, "dependNode"),
+                           om.MNodeMessage.addNameChangedCallback(om.MObject(), nodeRenamed),
+                           om.MDagMessage.addParentAddedCallback(parentChanged),
+                           om.MDagMessage.addParentRemovedCallback(parentChanged),
+                           om.MDGMessage.addConnectionCallback(connectionChanged),
+                           om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, sceneChanged),
+                           om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, sceneChanged)]
+
+    def removeCallbacks(self):
+        """ Remove the Maya message callbacks registered by `registerCallbacks` """
+        if self._callbacks:
+            import maya.api.OpenMaya as om
+            om.MMessage.removeCallbacks(self._callbacks)
+            self._callbacks = []
+
+    # Building
+
+    def _ensureHierarchy(self):
+        if self._types is not None:
+            return
+
+        types = {}
+        children = {}
+        byType = {}
+        listing = mc.ls(dag=True, long=True, allPaths=True, showType=True) or []
+        for path, type in zip(listing[::2], listing[1::2]):
+            types[path] = type
+            byType.setdefault(type, []).append(path)
+            parent = path.rsplit("|", 1)[0]
+            if parent:
+                children.setdefault(parent, []).append(path)
+
+        self._children = children
+        self._byType = byType
+        self._shapes = set(mc.ls(dag=True, shapes=True, long=True, allPaths=True) or [])
+        self._types = types
+
+    def _ensureMemberships(self):
+        if self._memberships is not None:
+            return
+
+        memberships = {}
+        for engine in mc.ls(type="shadingEngine") or []:
+            members = mc.sets(engine, q=True)
+            if not members:
+                continue
+            for member in mc.ls(members, long=True, objectsOnly=True) or []:
+                memberships.setdefault(member, []).append(engine)
+
+        self._memberships = memberships
+
+    def _getEngineMaterials(self, engine):
+        materials = self._engineMaterials.get(engine)
+        if materials is None:
+            inputs = mc.listConnections(engine, source=True, destination=False)
+            materials = mc.ls(inputs, mat=True, long=True) if inputs else []
+            self._engineMaterials[engine] = materials
+        return materials
+
+    def _ensureRenderElements(self):
+        if self._renderElements is not None:
+            return
+
+        from vrayformayaUtils.core import buildRenderElementIndex
+        self._renderElements = buildRenderElementIndex()
+
+    def _expandTypes(self, filterType):
+        if isinstance(filterType, (list, tuple, set)):
+            types = set()
+            for type in filterType:
+                types.update(self._expandTypes(type))
+            return types
+
+        derived = self._derivedTypes.get(filterType)
+        if derived is None:
+            derived = set(mc.nodeType(filterType, isTypeName=True, derived=True) or [])
+            derived.add(filterType)
+            self._derivedTypes[filterType] = derived
+        return derived
+
+    # Queries
+
+    def nodesOfType(self, type):
+        """ Return the long names of all dag nodes of type (including derived types).
+
+        :param type: The node type(s).
+        :type  type: str or tuple
+
+        :rtype: list
+        """
+        self._ensureHierarchy()
+        result = []
+        for t in self._expandTypes(type):
+            result.extend(self._byType.get(t, []))
+        return result
+
+    def children(self, node, allDescendents=False):
+        """ Return the long names of the children of the dag node.
+
+        :param node: The long name of the node.
+        :type  node: str
+
+        :param allDescendents: If True it will return the children at any depth.
+        :type  allDescendents: bool
+
+        :rtype: list
+        """
+        self._ensureHierarchy()
+        result = []
+        stack = list(reversed(self._children.get(node, [])))
+        while stack:
+            child = stack.pop()
+            result.append(child)
+            if allDescendents:
+                stack.extend(reversed(self._children.get(child, [])))
+        return result
+
+    def getShapes(self, nodes=None, filterType=None, allDescendents=True, fullPath=True):
+        """ Return the shapes related to nodes, see ``vrayformayaUtils.utils.getShapes`` """
+        if nodes is None:
+            nodes = mc.ls(sl=1, long=True)
+        elif not nodes:
+            return []
+        else:
+            nodes = mc.ls(nodes, long=True)
+
+        if not nodes:
+            return []
+
+        self._ensureHierarchy()
+        shapes = []
+        seen = set()
+        for node in nodes:
+            for shape in [node] + self.children(node, allDescendents=allDescendents):
+                if shape in self._shapes and shape not in seen:
+                    seen.add(shape)
+                    shapes.append(shape)
+
+        if filterType is not None:
+            types = self._expandTypes(filterType)
+            shapes = [shape for shape in shapes if self._types[shape] in types]
+
+        if shapes and not fullPath:
+            shapes = mc.ls(shapes)
+
+        return shapes
+
+    def getMaterials(self, nodes=None):
+        """ Return the materials related to nodes, see ``vrayformayaUtils.utils.getMaterials`` """
+        if nodes is None:
+            nodes = mc.ls(sl=1)
+
+        materials = mc.ls(nodes, mat=1, long=True)
+        if not nodes:
+            return materials
+
+        self._ensureHierarchy()
+        self._ensureMemberships()
+
+        engines = []
+        for node in mc.ls(nodes, long=True):
+            if node in self._shapes:
+                shapes = [node]
+            elif node in self._types:
+                shapes = [child for child in self.children(node) if child in self._shapes]
+            else:
+                if node in self._engineMaterials or mc.nodeType(node) == "shadingEngine":
+                    engines.append(node)
+                continue
+
+            for shape in shapes:
+                engines.extend(self._memberships.get(shape, []))
+
+        seen = set(materials)
+        for engine in engines:
+            for material in self._getEngineMaterials(engine):
+                if material not in seen:
+                    seen.add(material)
+                    materials.append(material)
+
+        return materials
+
+    def renderElementIndex(self):
+        """ Return the render elements by vrayClassType, see ``vrayformayaUtils.core.getRenderElementIndex`` """
+        self._ensureRenderElements()
+        return dict((classType, list(renderElements))
+                    for classType, renderElements in self._renderElements.items())
@@ -0,0 +1,780 @@
+"""
+    The `textures` module contains scene-wide operations on texture file nodes.
+
+    - **Colour space pass**
+
+        `colorSpacePass` classifies file nodes by their file name with a table of regular expression rules and sets
+        the ``vray_file_gamma`` attributes of all nodes of a rule in a single batched operation. The file names are
+        read in a single pass and every unique file name is only classified once.
+
+        .. code-block:: python
+
+            from vrayformayaUtils import textures
+
+            for result in textures.colorSpacePass():
+                print(result.rule, len(result.nodes), len(result.changed), result.seconds)
+
+        The rules are (name, pattern, values) tuples. The first rule whose pattern matches the file name (without
+        its directory, case insensitive) is used and values are the ``vray_file_gamma`` attribute values to set.
+
+        .. code-block:: python
+
+            rules = [("data", r"_(normal|rough)\\.", {"vrayFileGammaEnable": True,
+                                                      "vrayFileColorSpace": textures.COLOR_SPACE_LINEAR})] + \\
+                    textures.COLOR_SPACE_RULES
+            textures.colorSpacePass(rules=rules)
+
+    - **Image sequences (IFL)**
+
+        `iflPass` enables the ``vray_file_ifl`` attributes only on the file nodes that point at a file of a frame
+        numbered image sequence and sets their start frame. The texture directories are scanned once and their
+        listings are cached until the modification time of the directory changes, so thousands of file nodes can be
+        processed without rescanning the filesystem per node. See `detectSequences` and `clearDirectoryCache`.
+
+        A file is part of a sequence when its frame number follows a separator (``.``, ``_`` or ``-``) and has at
+        least three digits, e.g. ``smoke.1001.exr``, so texture variants like ``rock_1.jpg`` and ``rock_2.jpg``
+        aren't grouped. The rule is the `FRAME_PATTERN` regular expression and can be replaced. UDIM tiles aren't
+        image sequences: file nodes with UV tiling enabled (a uvTilingMode or a fileTextureNamePattern) are left
+        alone.
+
+    - **Texture path validation**
+
+        `validateTexturePaths` collects the paths of all texture nodes (file, substance and VRayPtex) in a single
+        query and checks them on a pool of threads. Paths with UDIM (``<UDIM>``, ``<UVTILE>``, ``u<U>_v<V>``,
+        ``<U>_<V>``) or frame (``<f>``, ``#``) tokens are valid when at least one readable file matches them.
+
+        .. code-block:: python
+
+            report = textures.validateTexturePaths()
+            for texturePath in report.missing:
+                print(texturePath.path, texturePath.nodes)
+
+    - **UDIM tile index**
+
+        `buildTileIndex` resolves the tiles of all tiled texture nodes at once. Every texture directory is scanned a
+        single time into a map of tile patterns (e.g. ``wood.<UDIM>.tif``) to the tiles on disk, which is cached with
+        the directory listing. Looking up the tiles of a node is a dictionary lookup after that.
+
+        .. code-block:: python
+
+            index = textures.buildTileIndex()
+            for node in index.nodes():
+                print(node, index.udims(node))
+
+    Functions
+    =========
+"""
+import os
+import re
+import time
+from collections import namedtuple, OrderedDict
+from multiprocessing.pool import ThreadPool
+
+import maya.cmds as mc
+from vrayformayaUtils.batch import applyAttributeGroup, getAttributes
+from vrayformayaUtils.utils import bulkOperation, getStringAttributes
+
+#: The vrayFileColorSpace enum values.
+COLOR_SPACE_LINEAR = 0
+COLOR_SPACE_GAMMA = 1
+COLOR_SPACE_SRGB = 2
+
+_LINEAR = {"vrayFileGammaEnable": True, "vrayFileColorSpace": COLOR_SPACE_LINEAR}
+_SRGB = {"vrayFileGammaEnable": True, "vrayFileColorSpace": COLOR_SPACE_SRGB}
+
+#: The default colour space rules as (name, pattern, values) tuples, see `colorSpacePass`.
+#: Non-colour data (normal, bump, roughness, ...) and high dynamic range formats are linear, 8-bit formats are sRGB.
+COLOR_SPACE_RULES = [
+    ("data", r"[._-](normal|nrm|bump|disp|displacement|height|rough|roughness|gloss|glossiness|metal|metalness|"
+             r"mask|opacity|alpha)([._-]|$)", _LINEAR),
+    ("hdr", r"\.(exr|hdr)$", _LINEAR),
+    ("srgb", r"\.(jpe?g|png|tga|bmp|gif|tiff?)$", _SRGB),
+]
+
+#: The result of a colour space pass per rule. `nodes` are the file nodes that matched the rule, `changed` and
+#: `skipped` are the nodes that were changed and that already had the rule's values, `seconds` is the time that was
+#: spent applying the rule.
+ColorSpaceResult = namedtuple("ColorSpaceResult", ["rule", "nodes", "changed", "skipped", "seconds"])
+
+#: A frame numbered image sequence in `directory` with the files prefix + frame + suffix. `padding` is the amount of
+#: digits of the frame numbers (the smallest amount when they aren't padded) and `frames` are the sorted frames.
+Sequence = namedtuple("Sequence", ["directory", "prefix", "suffix", "padding", "frames"])
+
+#: Splits a file name into its prefix, its frame number and suffix, see `findSequence`. The frame number is the last
+#: group of at least three digits before the extension that follows a separator.
+FRAME_PATTERN = r"^(.*[._-])(\d{3,})(\.[^.]*)$"
+
+#: The attribute that holds the path per texture node type, see `validateTexturePaths`.
+TEXTURE_PATH_ATTRIBUTES = OrderedDict([("file", "fileTextureName"),
+                                       ("substance", "package"),
+                                       ("VRayPtex", "ptexFile")])
+
+#: The path tokens that stand for a UDIM tile or a frame number and the regular expression they match in file names.
+#: A group of ``#`` characters matches a frame number with that amount of digits.
+PATH_TOKENS = OrderedDict([("<UDIM>", r"\d{4}"),
+                           ("<UVTILE>", r"u\d+_v\d+"),
+                           ("<U>", r"\d+"),
+                           ("<V>", r"\d+"),
+                           ("<f>", r"-?\d+"),
+                           ("<frame>", r"-?\d+")])
+
+#: The status of a validated texture path.
+STATUS_OK = "ok"
+STATUS_MISSING = "missing"
+STATUS_UNREADABLE = "unreadable"
+STATUS_EMPTY = "empty"
+
+#: The validation result of a single texture path. `nodes` are the texture nodes using the path, `status` is one of
+#: the STATUS constants and `files` are the existing files the path resolves to (more than one for token paths).
+TexturePath = namedtuple("TexturePath", ["path", "nodes", "status", "files"])
+
+#: The result of `validateTexturePaths`. `paths` lists all TexturePath results in the order they were found,
+#: `missing`, `unreadable` and `empty` list the invalid ones and `seconds` is the time the validation took.
+ValidationReport = namedtuple("ValidationReport", ["paths", "missing", "unreadable", "empty", "seconds"])
+
+_TOKEN_PATTERN = re.compile("|".join([re.escape(token) for token in PATH_TOKENS] + ["#+"]), re.IGNORECASE)
+_TOKEN_REGEX = dict((token.lower(), regex) for token, regex in PATH_TOKENS.items())
+
+#: A single UDIM tile of a texture. `u` and `v` are the zero based tile coordinates.
+Tile = namedtuple("Tile", ["path", "udim", "u", "v"])
+
+#: The tokens of tiled texture paths by their lower case name.
+_TILE_TOKENS = dict((token.lower(), token) for token in ("<UDIM>", "<UVTILE>", "<U>", "<V>"))
+_TILE_TOKEN_PATTERN = re.compile("|".join(re.escape(token) for token in _TILE_TOKENS.values()), re.IGNORECASE)
+_UDIM_PATTERN = re.compile(r"(?<!\d)1(?!000)\d{3}(?!\d)")
+_UV_PATTERN = re.compile(r"u(\d+)_v(\d+)")
+_BARE_UV_PATTERN = re.compile(r"(?<!\d)(\d+)_(\d+)(?!\d)")
+
+# The tiles per tile pattern of a directory listing: {directory: (entries, tiles by pattern)}
+_TILE_CACHE = {}
+
+# The cached listing per directory: {directory: (mtime, FRAME_PATTERN, (entries, sequences by (prefix, suffix)))}
+_DIRECTORY_CACHE = {}
+
+
+def getFileTextureNames(nodes):
+    """ Return the fileTextureName of all file nodes in a single pass.
+
+    :param nodes: The names of the file nodes.
+    :type  nodes: list
+
+    :return: The file name per node, in the same order as nodes.
+    :rtype: list
+    """
+    return getStringAttributes(nodes, "fileTextureName")
+
+
+def compileColorSpaceRules(rules=None):
+    """ Return the rules with their patterns compiled.
+
+    :param rules: The (name, pattern, values) rules. If None the module's COLOR_SPACE_RULES are used.
+                  Already compiled patterns are used as is.
+    :type  rules: None or list
+
+    :rtype: list
+    """
+    if rules is None:
+        rules = COLOR_SPACE_RULES
+
+    compiled = []
+    for name, pattern, values in rules:
+        if not hasattr(pattern, "search"):
+            pattern = re.compile(pattern, re.IGNORECASE)
+        compiled.append((name, pattern, values))
+    return compiled
+
+
+def classifyFileNodes(nodes=None, rules=None):
+    """ Return the file nodes per matching colour space rule.
+
+    :param nodes: The file nodes to classify. If None all file nodes in the scene are used.
+    :type  nodes: None or list
+
+    :param rules: The (name, pattern, values) rules. If None the module's COLOR_SPACE_RULES are used.
+    :type  rules: None or list
+
+    :return: The nodes per rule name in the order of the rules. Nodes that don't match any rule are listed under None.
+    :rtype: OrderedDict
+    """
+    rules = compileColorSpaceRules(rules)
+
+    if nodes is None:
+        nodes = mc.ls(type="file")
+    elif nodes:
+        nodes = mc.ls(nodes, type="file")
+
+    result = OrderedDict((name, []) for name, pattern, values in rules)
+    result[None] = []
+    if not nodes:
+        return result
+
+    # Textures are often used by many file nodes, so every unique file name is only matched once
+    classified = {}
+    for node, fileName in zip(nodes, getFileTextureNames(nodes)):
+        name = classified.get(fileName, False)
+        if name is False:
+            name = None
+            baseName = os.path.basename(fileName.replace("\\", "/"))
+            if baseName:
+                for ruleName, pattern, values in rules:
+                    if pattern.search(baseName):
+                        name = ruleName
+                        break
+            classified[fileName] = name
+        result[name].append(node)
+
+    return result
+
+
+def colorSpacePass(nodes=None, rules=None, default=None, skipUnchanged=True, chunkSize=None):
+    """ Set the ``vray_file_gamma`` attributes of file nodes by the colour space rules their file name matches.
+
+    The nodes of each rule are processed in a single batched operation (see `vrayformayaUtils.batch`) and the whole
+    pass is a single undo step.
+
+    :param nodes: The file nodes to process. If None all file nodes in the scene are used.
+    :type  nodes: None or list
+
+    :param rules: The (name, pattern, values) rules where values are the ``vray_file_gamma`` attribute values to set
+                  (e.g. {"vrayFileColorSpace": COLOR_SPACE_SRGB}). The first matching rule is used.
+                  If None the module's COLOR_SPACE_RULES are used.
+    :type  rules: None or list
+
+    :param default: The attribute values to set on the nodes that don't match any rule. If None those nodes aren't
+                    changed.
+    :type  default: None or dict
+
+    :param skipUnchanged: If True only the nodes that don't have the values of their rule yet are changed.
+    :type  skipUnchanged: bool
+
+    :param chunkSize: The amount of statements combined per evaluation. If None the batch module's CHUNK_SIZE is used.
+    :type  chunkSize: None or int
+
+    :return: The result per rule in the order of the rules. The nodes that didn't match any rule are listed last
+             with the rule None.
+    :rtype: list
+    """
+    rules = compileColorSpaceRules(rules)
+    classified = classifyFileNodes(nodes, rules=rules)
+    ruleValues = dict((name, values) for name, pattern, values in rules)
+    ruleValues[None] = default
+
+    results = []
+    with bulkOperation(sum(len(x) for x in classified.values())):
+        for name, ruleNodes in classified.items():
+            values = ruleValues[name]
+            changed = []
+            skipped = []
+
+            start = time.time()
+            if ruleNodes and values is not None:
+                result = applyAttributeGroup(ruleNodes, "vray_file_gamma", state=1,
+                                             values=sorted(values.items()),
+                                             skipUnchanged=skipUnchanged,
+                                             chunkSize=chunkSize)
+                changed = result.changed
+                skipped = result.skipped
+
+            results.append(ColorSpaceResult(name, ruleNodes, changed, skipped, time.time() - start))
+
+    return results
+
+
+def clearDirectoryCache():
+    """ Clear the cached directory listings of the sequence detection and the tile index.
+
+    The listings are invalidated automatically when the modification time of a directory changes, this is only
+    needed to free the memory.
+    """
+    _DIRECTORY_CACHE.clear()
+    _TILE_CACHE.clear()
+
+
+def _split_frame(fileName):
+    """ Return the (prefix, frame digits, suffix) of a file name or None if it has no frame number.
+
+    For module internal use.
+
+    :rtype: tuple or None
+    """
+    match = re.match(FRAME_PATTERN, fileName)
+    if match is None:
+        return None
+    return match.groups()
+
+
+def _group_sequences(directory, entries):
+    """ Return the image sequences in the directory entries by their (prefix, suffix).
+
+    For module internal use.
+
+    :rtype: dict
+    """
+    frames = {}
+    for entry in entries:
+        split = _split_frame(entry)
+        if split is not None:
+            prefix, digits, suffix = split
+            frames.setdefault((prefix, suffix), []).append(digits)
+
+    sequences = {}
+    for (prefix, suffix), digits in frames.items():
+        # A single frame numbered file isn't a sequence
+        if len(digits) > 1:
+            sequences[(prefix, suffix)] = Sequence(directory, prefix, suffix,
+                                                   min(len(x) for x in digits),
+                                                   sorted(int(x) for x in digits))
+    return sequences
+
+
+def _directory_listing(directory):
+    """ Return the (entries, sequences by (prefix, suffix)) of directory.
+
+    The directory is only listed again when its modification time or FRAME_PATTERN changed since it was cached.
+
+    For module internal use.
+
+    :return: The listing or None if the directory doesn't exist or can't be listed.
+    :rtype: tuple or None
+    """
+    try:
+        mtime = os.stat(directory).st_mtime
+        cached = _DIRECTORY_CACHE.get(directory)
+        if cached is not None and cached[0] == mtime and cached[1] == FRAME_PATTERN:
+            return cached[2]
+        entries = tuple(sorted(os.listdir(directory)))
+    except OSError:
+        _DIRECTORY_CACHE.pop(directory, None)
+        return None
+
+    listing = (entries, _group_sequences(directory, entries))
+    _DIRECTORY_CACHE[directory] = (mtime, FRAME_PATTERN, listing)
+    return listing
+
+
+def findSequence(fileName):
+    """ Return the image sequence the file is part of.
+
+    The frame number and the prefix and suffix around it are matched with FRAME_PATTERN.
+
+    :param fileName: The path of a file.
+    :type  fileName: str
+
+    :return: The sequence or None if the file isn't part of a sequence of at least two files.
+    :rtype: Sequence or None
+    """
+    directory, baseName = os.path.split(fileName.replace("\\", "/"))
+    split = _split_frame(baseName)
+    if split is None:
+        return None
+
+    prefix, digits, suffix = split
+    listing = _directory_listing(directory or ".")
+    if listing is None:
+        return None
+    return listing[1].get((prefix, suffix))
+
+
+def detectSequences(nodes=None):
+    """ Return the image sequence of every file node.
+
+    Every texture directory is listed only once (and not at all while its cached listing is still up to date).
+    File nodes that use UV tiling (a uvTilingMode other than 0 or a fileTextureNamePattern) don't get a sequence,
+    their numbers are tiles instead of frames.
+
+    :param nodes: The file nodes. If None all file nodes in the scene are used.
+    :type  nodes: None or list
+
+    :return: The sequence per file node, None for the nodes that don't point at a file of a sequence.
+    :rtype: OrderedDict
+    """
+    if nodes is None:
+        nodes = mc.ls(type="file")
+    elif nodes:
+        nodes = mc.ls(nodes, type="file")
+
+    result = OrderedDict()
+    if not nodes:
+        return result
+
+    patterns = getStringAttributes(nodes, "fileTextureNamePattern")
+    tilingModes = getAttributes(["{0}.uvTilingMode".format(node) for node in nodes])
+    for node, fileName, pattern, tilingMode in zip(nodes, getFileTextureNames(nodes), patterns, tilingModes):
+        if not fileName or pattern or int(float(tilingMode)):
+            result[node] = None
+        else:
+            result[node] = findSequence(fileName)
+    return result
+
+
+def iflPass(nodes=None, endCondition=None, playbackRate=None, skipUnchanged=True, chunkSize=None):
+    """ Enable the ``vray_file_ifl`` attributes on the file nodes that point at an image sequence.
+
+    The vrayFileIFLStartFrame of each node is set to the first frame of its sequence. File nodes that don't point
+    at a sequence aren't changed.
+
+    :param nodes: The file nodes to process. If None all file nodes in the scene are used.
+    :type  nodes: None or list
+
+    :param endCondition: The vrayFileIFLEndCondition to set. If None it remains default/unchanged.
+    :type  endCondition: None or int
+
+    :param playbackRate: The vrayFileIFLPlaybackRate to set. If None it remains default/unchanged.
+    :type  playbackRate: None or float
+
+    :param skipUnchanged: If True only the nodes that don't have the values yet are changed.
+    :type  skipUnchanged: bool
+
+    :param chunkSize: The amount of statements combined per evaluation. If None the batch module's CHUNK_SIZE is used.
+    :type  chunkSize: None or int
+
+    :return: The sequence per file node that was found to point at a sequence, and the changed and skipped nodes.
+    :rtype: tuple
+    """
+    sequences = OrderedDict((node, sequence) for node, sequence in detectSequences(nodes).items()
+                            if sequence is not None)
+
+    # The nodes with the same start frame are processed together
+    byStartFrame = OrderedDict()
+    for node, sequence in sequences.items():
+        byStartFrame.setdefault(sequence.frames[0], []).append(node)
+
+    changed = []
+    skipped = []
+    with bulkOperation(len(sequences)):
+        for startFrame, startNodes in byStartFrame.items():
+            values = [("vrayFileIFLStartFrame", startFrame),
+                      ("vrayFileIFLEndCondition", endCondition),
+                      ("vrayFileIFLPlaybackRate", playbackRate)]
+            result = applyAttributeGroup(startNodes, "vray_file_ifl", state=1, values=values,
+                                         skipUnchanged=skipUnchanged, chunkSize=chunkSize)
+            changed.extend(result.changed)
+            skipped.extend(result.skipped)
+
+    return sequences, changed, skipped
+
+
+def getTexturePaths(nodes=None):
+    """ Return the path of every texture node.
+
+    The paths are collected with a single query per node type in TEXTURE_PATH_ATTRIBUTES.
+
+    :param nodes: The texture nodes. If None all texture nodes in the scene are used.
+    :type  nodes: None or list
+
+    :return: The path per texture node.
+    :rtype: OrderedDict
+    """
+    if nodes is not None and not nodes:
+        return OrderedDict()
+
+    typeNodes = []
+    attrs = []
+    for nodeType, attr in TEXTURE_PATH_ATTRIBUTES.items():
+        if nodes is None:
+            found = mc.ls(type=nodeType)
+        else:
+            found = mc.ls(nodes, type=nodeType)
+        if found:
+            typeNodes.extend(found)
+            attrs.extend([attr] * len(found))
+
+    return OrderedDict(zip(typeNodes, getStringAttributes(typeNodes, attrs)))
+
+
+def _token_regex(baseName):
+    """ Return the compiled regular expression that matches the file names of a base name with path tokens.
+
+    For module internal use.
+
+    :return: The regular expression or None if the base name has no tokens.
+    """
+    parts = []
+    position = 0
+    for match in _TOKEN_PATTERN.finditer(baseName):
+        parts.append(re.escape(baseName[position:match.start()]))
+        token = match.group(0)
+        if token.startswith("#"):
+            parts.append(r"\d{{{0},}}".format(len(token)))
+        else:
+            parts.append(_TOKEN_REGEX[token.lower()])
+        position = match.end()
+
+    if not parts:
+        return None
+
+    parts.append(re.escape(baseName[position:]))
+    return re.compile("".join(parts) + "$", re.IGNORECASE)
+
+
+def expandTexturePath(path):
+    """ Return the existing files of a texture path with UDIM or frame tokens.
+
+    The directory listing is shared with (and cached like) the image sequence detection.
+
+    :param path: The texture path. A path without tokens is returned as is when it exists.
+    :type  path: str
+
+    :rtype: list
+    """
+    tiles = _lookup_tiles(path)
+    if tiles is not None:
+        return [tile.path for tile in tiles]
+
+    directory, baseName = os.path.split(path.replace("\\", "/"))
+    regex = _token_regex(baseName)
+    if regex is None:
+        return [path] if os.path.isfile(path) else []
+
+    listing = _directory_listing(directory or ".")
+    if listing is None:
+        return []
+    return [os.path.join(directory, entry) for entry in listing[0] if regex.match(entry)]
+
+
+def _resolve_path(path, root):
+    """ Return the path with its environment variables expanded and made absolute against the workspace root.
+
+    For module internal use.
+
+    :param root: The root directory of the workspace.
+    :type  root: str
+
+    :rtype: str
+    """
+    if not path:
+        return path
+    path = os.path.expandvars(path)
+    if not os.path.isabs(path):
+        path = os.path.join(root, path)
+    return path
+
+
+def _validate_path(path):
+    """ Return the (status, files) of a single (resolved) texture path.
+
+    For module internal use.
+
+    :rtype: tuple
+    """
+    if not path:
+        return STATUS_EMPTY, []
+
+    files = expandTexturePath(path)
+    if not files:
+        return STATUS_MISSING, []
+
+    readable = [x for x in files if os.access(x, os.R_OK)]
+    if not readable:
+        return STATUS_UNREADABLE, files
+    return STATUS_OK, readable
+
+
+def validateTexturePaths(nodes=None, threads=8):
+    """ Validate that the paths of the texture nodes exist and are readable.
+
+    The paths of all nodes are collected in a single pass (see `getTexturePaths`). Every unique path is checked once
+    and the filesystem checks run on a pool of threads, which mostly helps for paths on network storage. Environment
+    variables in the paths are expanded and relative paths are resolved against the root of the current workspace
+    (before the threads start, as Maya commands can only be used from the main thread).
+
+    :param nodes: The texture nodes to validate. If None all texture nodes in the scene are used.
+    :type  nodes: None or list
+
+    :param threads: The amount of threads that check the paths. If 1 or less the paths are checked directly.
+    :type  threads: int
+
+    :rtype: ValidationReport
+    """
+    start = time.time()
+
+    pathNodes = OrderedDict()
+    for node, path in getTexturePaths(nodes).items():
+        pathNodes.setdefault(path, []).append(node)
+
+    paths = list(pathNodes)
+    root = mc.workspace(query=True, rootDirectory=True) if paths else None
+    resolved = [_resolve_path(path, root) for path in paths]
+    if threads > 1 and len(paths) > 1:
+        pool = ThreadPool(min(threads, len(paths)))
+        try:
+            results = pool.map(_validate_path, resolved)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_validate_path(path) for path in resolved]
+
+    texturePaths = [TexturePath(path, pathNodes[path], status, files)
+                    for path, (status, files) in zip(paths, results)]
+
+    def withStatus(status):
+        return [texturePath for texturePath in texturePaths if texturePath.status == status]
+
+    return ValidationReport(texturePaths,
+                            withStatus(STATUS_MISSING),
+                            withStatus(STATUS_UNREADABLE),
+                            withStatus(STATUS_EMPTY),
+                            time.time() - start)
+
+
+def _directory_tiles(directory):
+    """ Return the tiles in directory by their tile pattern, e.g. {"wood.<UDIM>.tif": [Tile, ..]}.
+
+    Every file name is parsed once into the patterns it matches: a four digit number from 1001 as ``<UDIM>``,
+    ``u#_v#`` as zero based ``u<U>_v<V>`` and one based ``<UVTILE>`` and ``#_#`` as zero based ``<U>_<V>``. The result
+    is cached until the directory is listed again.
+
+    For module internal use.
+
+    :rtype: dict
+    """
+    listing = _directory_listing(directory or ".")
+    if listing is None:
+        return {}
+
+    entries = listing[0]
+    cached = _TILE_CACHE.get(directory)
+    if cached is not None and cached[0] is entries:
+        return cached[1]
+
+    tiles = {}
+    for entry in entries:
+        path = os.path.join(directory, entry)
+        for match in _UDIM_PATTERN.finditer(entry):
+            udim = int(match.group(0))
+            pattern = entry[:match.start()] + "<UDIM>" + entry[match.end():]
+            tiles.setdefault(pattern, []).append(Tile(path, udim, (udim - 1001) % 10, (udim - 1001) // 10))
+
+        for match in _UV_PATTERN.finditer(entry):
+            u, v = int(match.group(1)), int(match.group(2))
+            prefix, suffix = entry[:match.start()], entry[match.end():]
+            tiles.setdefault(prefix + "u<U>_v<V>" + suffix, []).append(Tile(path, 1001 + u + 10 * v, u, v))
+            if u and v:
+                tiles.setdefault(prefix + "<UVTILE>" + suffix, []).append(Tile(path, 1000 + u + 10 * (v - 1),
+                                                                               u - 1, v - 1))
+
+        for match in _BARE_UV_PATTERN.finditer(entry):
+            u, v = int(match.group(1)), int(match.group(2))
+            pattern = entry[:match.start()] + "<U>_<V>" + entry[match.end():]
+            tiles.setdefault(pattern, []).append(Tile(path, 1001 + u + 10 * v, u, v))
+
+    for patternTiles in tiles.values():
+        patternTiles.sort(key=lambda tile: tile.udim)
+
+    _TILE_CACHE[directory] = (entries, tiles)
+    return tiles
+
+
+def _lookup_tiles(path):
+    """ Return the tiles of a tiled texture path.
+
+    For module internal use.
+
+    :return: The tiles or None if the path has no tile tokens (or also has frame tokens).
+    :rtype: list or None
+    """
+    directory, baseName = os.path.split(path.replace("\\", "/"))
+    if not _TILE_TOKEN_PATTERN.search(baseName):
+        return None
+
+    pattern = _TILE_TOKEN_PATTERN.sub(lambda match: _TILE_TOKENS[match.group(0).lower()], baseName)
+    if _TOKEN_PATTERN.search(_TILE_TOKEN_PATTERN.sub("", pattern)):
+        return None
+
+    return list(_directory_tiles(directory).get(pattern, ()))
+
+
+class TileIndex(object):
+    """ The UDIM tiles of texture nodes, see `buildTileIndex`.
+
+    :param patterns: The tiled path per texture node.
+    :type  patterns: dict
+
+    :param tiles: The tiles per tiled path.
+    :type  tiles: dict
+    """
+    def __init__(self, patterns, tiles):
+        self._patterns = patterns
+        self._tiles = tiles
+
+    def __contains__(self, node):
+        return node in self._patterns
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def __iter__(self):
+        return iter(self._patterns)
+
+    def nodes(self):
+        """ Return the tiled texture nodes.
+
+        :rtype: list
+        """
+        return list(self._patterns)
+
+    def pattern(self, node):
+        """ Return the tiled path of the node (e.g. ``/textures/wood.<UDIM>.tif``) or None if it isn't tiled.
+
+        :rtype: str or None
+        """
+        return self._patterns.get(node)
+
+    def tiles(self, node):
+        """ Return the tiles of the node sorted by their UDIM, an empty list if it isn't tiled.
+
+        :rtype: list
+        """
+        pattern = self._patterns.get(node)
+        if pattern is None:
+            return []
+        return list(self._tiles[pattern])
+
+    def udims(self, node):
+        """ Return the UDIM numbers of the tiles of the node.
+
+        :rtype: list
+        """
+        return [tile.udim for tile in self.tiles(node)]
+
+    def paths(self, node):
+        """ Return the file paths of the tiles of the node.
+
+        :rtype: list
+        """
+        return [tile.path for tile in self.tiles(node)]
+
+
+def buildTileIndex(nodes=None):
+    """ Return the UDIM tiles of all tiled texture nodes.
+
+    The paths are collected with a single query per node type (for file nodes the fileTextureNamePattern is used
+    when Maya's UV tiling mode filled it in). Every directory is scanned once into all its tile patterns and that scan
+    is cached until the directory changes, so building the index again only queries the scene.
+
+    :param nodes: The texture nodes. If None all texture nodes in the scene are used.
+    :type  nodes: None or list
+
+    :rtype: TileIndex
+    """
+    paths = getTexturePaths(nodes)
+
+    fileNodes = mc.ls(list(paths), type="file") if paths else []
+    for node, pattern in zip(fileNodes, getStringAttributes(fileNodes, "fileTextureNamePattern")):
+        if pattern:
+            paths[node] = pattern
+
+    patterns = OrderedDict()
+    tiles = {}
+    for node, path in paths.items():
+        if not path:
+            continue
+        if path not in tiles:
+            pathTiles = _lookup_tiles(path)
+            if pathTiles is None:
+                continue
+            tiles[path] = pathTiles
+        patterns[node] = path
+
+    return TileIndex(patterns, tiles)
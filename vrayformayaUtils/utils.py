@@ -1,4 +1,26 @@
+from collections import OrderedDict
+from functools import wraps
+
 import maya.cmds as mc
+from vrayformayaUtils import backend, sceneIndex
+
+try:
+    basestring
+except NameError:
+    basestring = str
+
+#: Operations on at least this amount of nodes suspend the viewport refresh by default, see `bulkOperation`.
+BULK_THRESHOLD = 500
+
+#: The texture node types that are collected from shading networks by default, see `getUpstreamTextures`.
+TEXTURE_TYPES = ("file", "substance", "VRayPtex")
+
+#: The node type classifications (see ``mc.getClassification``) of the nodes that are part of shading networks. The
+#: upstream walk of `getUpstreamTextures` stops at other nodes, like expressions, constraints and animation curves.
+SHADING_CLASSIFICATIONS = ("shader/", "texture/", "utility/", "rendernode/")
+
+# Whether a node type is part of shading networks per node type
+_SHADING_TYPES = {}
 
 
 def getMaterials(nodes=None):
@@ -9,6 +31,10 @@ def getMaterials(nodes=None):
 
     :rtype: list
     """
+    index = sceneIndex.active()
+    if index is not None:
+        return index.getMaterials(nodes)
+
     # Get selected nodes if None provided
     if nodes is None:
         nodes = mc.ls(sl=1)
@@ -33,6 +59,212 @@ def getMaterials(nodes=None):
     return materials
 
 
+def getAssignedMaterials(nodes=None, volume=False, displacement=False):
+    """ Returns the materials assigned to nodes through their shadingEngines
+
+    This is a faster alternative to `getMaterials`. Instead of listing the connections of the full future history of
+    the nodes it goes directly from the shapes to their shadingEngines (through the instObjGroups connections) and
+    from there to the connected shaders. All nodes are resolved together, so the amount of queries doesn't grow with
+    the amount of nodes.
+
+    :param nodes: The nodes to get the assigned materials from. Materials and shadingEngines in the list are included
+                  directly, transforms are resolved through their direct children shapes.
+                  If nodes is None the current selection will be used.
+    :type  nodes: None or list
+
+    :param volume: If True the volume shaders of the shadingEngines are included.
+    :type  volume: bool
+
+    :param displacement: If True the displacement shaders of the shadingEngines are included.
+    :type  displacement: bool
+
+    :rtype: list
+    """
+    index = sceneIndex.active()
+    if index is not None and not volume and not displacement:
+        return index.getMaterials(nodes)
+
+    # Get selected nodes if None provided
+    if nodes is None:
+        nodes = mc.ls(sl=1)
+
+    if not nodes:
+        return []
+
+    materials = mc.ls(nodes, mat=True, long=True)
+
+    # Get the shadingEngines of the shapes (and the shadingEngines that were directly in the input list)
+    engines = mc.ls(nodes, type="shadingEngine")
+    shapes = getShapes(nodes, allDescendents=False)
+    if shapes:
+        connected = mc.listConnections(["{0}.instObjGroups".format(shape) for shape in shapes],
+                                       type="shadingEngine",
+                                       source=False,
+                                       destination=True)
+        if connected:
+            engines.extend(connected)
+
+    if not engines:
+        return materials
+
+    # Get the shaders connected to the shadingEngines
+    shaderAttrs = ["surfaceShader"]
+    if volume:
+        shaderAttrs.append("volumeShader")
+    if displacement:
+        shaderAttrs.append("displacementShader")
+
+    plugs = ["{0}.{1}".format(engine, attr) for engine in set(engines) for attr in shaderAttrs]
+    shaders = mc.listConnections(plugs, source=True, destination=False)
+    if shaders:
+        # Use a set so we don't have any duplicates
+        seen = set(materials)
+        for shader in mc.ls(shaders, long=True):
+            if shader not in seen:
+                seen.add(shader)
+                materials.append(shader)
+
+    return materials
+
+
+def _is_shading_type(nodeType):
+    """ Return whether nodes of nodeType are part of shading networks, see SHADING_CLASSIFICATIONS.
+
+    For module internal use.
+
+    :rtype: bool
+    """
+    shading = _SHADING_TYPES.get(nodeType)
+    if shading is None:
+        classifications = ":".join(mc.getClassification(nodeType) or []).split(":")
+        shading = any(classification.startswith(SHADING_CLASSIFICATIONS) for classification in classifications)
+        _SHADING_TYPES[nodeType] = shading
+    return shading
+
+
+def _shading_nodes(nodes):
+    """ Return the nodes that are part of shading networks: dependency nodes of a shading type.
+
+    For module internal use.
+
+    :rtype: set
+    """
+    if not nodes:
+        return set()
+
+    dag = set(mc.ls(nodes, type="dagNode") or [])
+    typed = mc.ls(nodes, showType=True) or []
+    return set(node for node, nodeType in zip(typed[::2], typed[1::2])
+               if node not in dag and _is_shading_type(nodeType))
+
+
+def _upstream_graph(roots):
+    """ Return the upstream connections of roots and of all the shading nodes upstream of them.
+
+    The network is walked breadth first, listing the connections of all nodes of a level together so the amount of
+    queries only grows with the depth of the network. Each node is queried only once, also when it's shared. The walk
+    doesn't continue into DAG nodes and nodes that aren't shading nodes (e.g. an expression or constraint driving a
+    material attribute), so it stays within the shading network.
+
+    For module internal use.
+
+    :return: The source nodes per node, in the order they were found.
+    :rtype: OrderedDict
+    """
+    graph = OrderedDict()
+    frontier = []
+    for root in roots:
+        if root not in graph:
+            graph[root] = []
+            frontier.append(root)
+
+    while frontier:
+        # Returns pairs of (destination plug of the frontier node, source node)
+        pairs = mc.listConnections(frontier, source=True, destination=False, connections=True) or []
+        shading = _shading_nodes(list(set(source for source in pairs[1::2] if source not in graph)))
+
+        frontier = []
+        for plug, source in zip(pairs[::2], pairs[1::2]):
+            if source not in graph and source not in shading:
+                continue
+            sources = graph.setdefault(plug.split(".", 1)[0], [])
+            if source not in sources:
+                sources.append(source)
+            if source not in graph:
+                graph[source] = []
+                frontier.append(source)
+
+    return graph
+
+
+def getUpstreamTextures(nodes=None, textureTypes=TEXTURE_TYPES, byMaterial=False):
+    """ Returns the texture nodes in the shading networks of nodes
+
+    Texture nodes of textureTypes in the input are returned as they are, their upstream networks aren't walked.
+    Meshes, transforms and shadingEngines are resolved to their assigned materials (including volume and
+    displacement shaders) with `getAssignedMaterials`. From there (and from the materials in the input) the upstream
+    shading network is walked and all nodes of textureTypes are collected. Other input nodes are ignored. The walk
+    stops at DAG nodes and at nodes that aren't shading nodes, see SHADING_CLASSIFICATIONS.
+
+    :param nodes: The nodes to get the textures from.
+                  If nodes is None the current selection will be used.
+    :type  nodes: None or list
+
+    :param textureTypes: The node types to collect.
+    :type  textureTypes: str or tuple
+
+    :param byMaterial: If True return the textures per material (and per texture node from the input).
+                       The textures of shared parts of the networks are only resolved once.
+    :type  byMaterial: bool
+
+    :rtype: list or OrderedDict
+    """
+    if nodes is None:
+        nodes = mc.ls(sl=1)
+
+    nodes = mc.ls(nodes, long=True) if nodes else []
+    if not nodes:
+        return OrderedDict() if byMaterial else []
+
+    inputTextures = mc.ls(nodes, type=textureTypes, long=True) or []
+    skip = set(inputTextures)
+
+    # Long names of DAG nodes start with a pipe, those (and the shadingEngines) are resolved to their materials
+    engines = mc.ls(nodes, type="shadingEngine") or []
+    resolve = [node for node in nodes if node.startswith("|") and node not in skip] + engines
+    roots = [node for node in mc.ls(nodes, mat=True, long=True) or [] if node not in skip]
+    if resolve:
+        roots.extend(getAssignedMaterials(resolve, volume=True, displacement=True))
+
+    graph = _upstream_graph(roots)
+    textures = set(mc.ls(list(graph), type=textureTypes) or []) if graph else set()
+
+    if not byMaterial:
+        return inputTextures + [node for node in graph if node in textures and node not in skip]
+
+    # Memoize the textures per node so every shared part of the networks is collected once
+    memo = {}
+
+    def collect(node):
+        result = memo.get(node)
+        if result is None:
+            # Mark as in progress so cycles in the network end here
+            memo[node] = ()
+            result = OrderedDict()
+            if node in textures:
+                result[node] = None
+            for source in graph[node]:
+                for texture in collect(source):
+                    result[texture] = None
+            result = memo[node] = tuple(result)
+        return result
+
+    result = OrderedDict((texture, [texture]) for texture in inputTextures)
+    for root in roots:
+        result[root] = list(collect(root))
+    return result
+
+
 def getShapes(nodes=None,
               filterType=None,
               allDescendents=True,
@@ -57,63 +289,120 @@ def getShapes(nodes=None,
 
     :rtype: list
     """
+    index = sceneIndex.active()
+    if index is not None:
+        return index.getShapes(nodes, filterType=filterType, allDescendents=allDescendents, fullPath=fullPath)
 
-    # Acquire from selection
-    if nodes is None:
-        if allDescendents:
-            shapes = mc.ls(sl=1, s=1, dag=1, lf=1, o=1, long=True, allPaths=True)
-        else:
-            sel = mc.ls(sl=1)
-            shapes = mc.ls(sl=1, s=1, long=True)
-
-            # Note that we can't directly get allDescendents and filter to shapes through listRelatives because it will
-            # still stop at the first level because it will not pass through other nodes than shapes. :/
-            children = mc.listRelatives(sel,
-                                       children=True,
-                                       fullPath=True,
-                                       allDescendents=allDescendents)
-            if children:
-                childrenShapes = mc.ls(children, s=True, long=True)
-                if childrenShapes:
-                    shapes.extend(childrenShapes)
-
-    # Acquire from input nodes
-    else:
-
-        # If an emtpy list (or anything that passes through as False) was passed in we return the empty list
-        if not nodes:
-            return []
-
-        shapes = mc.ls(nodes, s=1, long=True)
-
-        children = mc.listRelatives(nodes,
-                                       children=True,
-                                       fullPath=True,
-                                       allDescendents=allDescendents)
-        if children:
-            childrenShapes = mc.ls(children, s=True, long=True)
-            if childrenShapes:
-                shapes.extend(childrenShapes)
+    # If an emtpy list (or anything that passes through as False) was passed in we return the empty list
+    if nodes is not None and not nodes:
+        return []
+
+    # Acquire from input nodes (or the selection if nodes is None)
+    scene = backend.getBackend()
+    shapes = scene.shapes(nodes, allDescendents=allDescendents, filterType=filterType)
 
     # Return nothing if we have nothing
     if not shapes:
         return []
 
-    # Filter to a certain type (and change to non-long/non-fullPath version if the user requests that).
-    elif filterType is not None:
-        # Only apply to mesh or nurbsSurface (other shapes can't contain the vray_subdivision attribute)
-        shapes = mc.ls(shapes, type=filterType, long=fullPath)
-
     # Change to non-long/non-fullPath version if the user requests that.
-    elif not fullPath:
-        shapes = mc.ls(shapes, long=fullPath)
+    if not fullPath:
+        shapes = scene.shortNames(shapes)
 
     return shapes
 
 
+def _node_ids(nodes):
+    """ Return an identifier of the underlying node for every node (or DAG path) in nodes.
+
+    For module internal use.
+
+    :rtype: list
+    """
+    try:
+        ids = mc.ls(nodes, uuid=True)
+    except TypeError:
+        # The uuid flag is only available since Maya 2016
+        ids = None
+
+    if ids is not None and len(ids) == len(nodes):
+        return ids
+
+    import maya.api.OpenMaya as om
+    ids = []
+    for node in nodes:
+        selectionList = om.MSelectionList()
+        selectionList.add(node)
+        ids.append(om.MObjectHandle(selectionList.getDependNode(0)).hashCode())
+    return ids
+
+
+def getStringAttributes(nodes, attrs):
+    """ Return the value of a string attribute per node in a single pass.
+
+    Instead of a ``mc.getAttr`` call per node the values are read through the API. Every name is resolved to its own
+    node, so duplicate names (or different names of the same node) still get a value each.
+
+    :param nodes: The names of the nodes.
+    :type  nodes: list
+
+    :param attrs: The attribute name, or the attribute name per node.
+    :type  attrs: str or list
+
+    :return: The value per node, in the same order as nodes.
+    :rtype: list
+    """
+    if not nodes:
+        return []
+    if isinstance(attrs, basestring):
+        attrs = [attrs] * len(nodes)
+
+    import maya.api.OpenMaya as om
+    # The plug values per (node, attr), so duplicates are only resolved once
+    cache = {}
+    values = []
+    for node, attr in zip(nodes, attrs):
+        value = cache.get((node, attr))
+        if value is None:
+            selectionList = om.MSelectionList()
+            selectionList.add(node)
+            fn = om.MFnDependencyNode(selectionList.getDependNode(0))
+            value = cache[(node, attr)] = fn.findPlug(attr, False).asString()
+        values.append(value)
+    return values
+
+
+def uniqueInstances(nodes):
+    """ Returns the nodes with only a single DAG path per underlying node
+
+    An instanced shape has a DAG path per instance. When operating on node data (like attributes) each underlying
+    node only needs to be processed once, so only the first path per node is kept.
+
+    :param nodes: The nodes (DAG paths) to deduplicate.
+    :type  nodes: list
+
+    :return: A tuple of the deduplicated nodes and the amount of paths that were collapsed.
+    :rtype: tuple
+    """
+    if not nodes:
+        return [], 0
+
+    seen = set()
+    unique = []
+    for node, nodeId in zip(nodes, _node_ids(nodes)):
+        if nodeId not in seen:
+            seen.add(nodeId)
+            unique.append(node)
+
+    return unique, len(nodes) - len(unique)
+
+
 def getConnectedSets(nodes, type=None):
     """ Return the sets that are connected to nodes
 
+    Only the connections that define set membership are queried: the instObjGroups of DAG nodes and the message
+    of dependency nodes. Other downstream connections (deformers, constraints, caches) are never listed.
+
     :param nodes: The nodes to get the sets from.
     :type  nodes: str, list
 
@@ -122,8 +411,17 @@ def getConnectedSets(nodes, type=None):
 
     :rtype: list
     """
+    # Components (e.g. faces) are listed as the shape they belong to
+    nodes = mc.ls(nodes, objectsOnly=True, long=True)
+    if not nodes:
+        return []
+
+    # Long names of DAG nodes start with a pipe
+    plugs = ["{0}.instObjGroups".format(node) if node.startswith("|") else "{0}.message".format(node)
+             for node in nodes]
+
     # Sets are connected to outputs of a node
-    out_connections = mc.listConnections(nodes, source=False, destination=True)
+    out_connections = mc.listConnections(plugs, source=False, destination=True)
     if not out_connections:
         return []
 
@@ -135,4 +433,134 @@ def getConnectedSets(nodes, type=None):
     # Filter to sets (and possibly by type) only.
     connected_sets = mc.ls(out_connections, sets=True, **kwargs)
 
-    return connected_sets
\ No newline at end of file
+    return connected_sets
+
+
+class ConnectedSetsSnapshot(object):
+    """ A snapshot of the sets connected to nodes that can be compared after an operation.
+
+    .. code-block:: python
+
+        snapshot = ConnectedSetsSnapshot(nodes, type="VRayObjectProperties")
+        mc.vray("objectProperties", "add_single", "VRayObjectProperties")
+        added, removed = snapshot.diff()
+
+    :param nodes: The nodes to get the sets from.
+    :type  nodes: str, list
+
+    :param type: If type is provided only sets of type are captured.
+    :type  type: str, tuple
+    """
+    def __init__(self, nodes, type=None):
+        self.nodes = nodes
+        self.type = type
+        self.sets = set(getConnectedSets(nodes, type=type))
+
+    def diff(self, update=False):
+        """ Return the sets that have been connected and disconnected since the snapshot.
+
+        :param update: If True the snapshot is updated to the current sets afterwards, so a following diff only
+                       returns the changes since this diff.
+        :type  update: bool
+
+        :return: A tuple of the added and the removed sets.
+        :rtype: tuple
+        """
+        current = set(getConnectedSets(self.nodes, type=self.type))
+        added = current - self.sets
+        removed = self.sets - current
+        if update:
+            self.sets = current
+        return added, removed
+
+
+class bulkOperation(object):
+    """ Run an operation as a single undo step and optionally suspend the viewport refresh.
+
+    Can be used as a context manager or as a decorator:
+
+    .. code-block:: python
+
+        with bulkOperation(nodes):
+            vray_subdivision(nodes)
+            vray_displacement(nodes)
+
+        @bulkOperation(suspendRefresh=True)
+        def lookdev():
+            ...
+
+    Nested bulk operations are recorded in the undo chunk of the outer one and the viewport refresh is only resumed
+    when the operation that suspended it finishes.
+
+    :param nodes: The nodes (or the amount of nodes) of the operation. Used to decide whether the viewport refresh
+                  is suspended when suspendRefresh is None.
+    :type  nodes: None, list or int
+
+    :param undoable: If False the undo queue is disabled during the operation (without flushing it). This is
+                     faster for very large operations, but the operation can't be undone.
+    :type  undoable: bool
+
+    :param suspendRefresh: If True the viewport refresh is suspended during the operation. If None it is suspended
+                           when the amount of nodes is at least `threshold`.
+    :type  suspendRefresh: None or bool
+
+    :param threshold: The amount of nodes from which the refresh is suspended. If None BULK_THRESHOLD is used.
+    :type  threshold: None or int
+    """
+    # Whether the viewport refresh is suspended by a running bulk operation
+    _suspended = False
+
+    def __init__(self, nodes=None, undoable=True, suspendRefresh=None, threshold=None):
+        if suspendRefresh is None:
+            if threshold is None:
+                threshold = BULK_THRESHOLD
+            if nodes is None:
+                count = 0
+            elif isinstance(nodes, int):
+                count = nodes
+            else:
+                count = len(nodes)
+            suspendRefresh = count >= threshold
+
+        self.undoable = undoable
+        self.suspendRefresh = suspendRefresh
+        self._restore = []
+
+    def __enter__(self):
+        cls = type(self)
+        restore = {"undo": False, "refresh": False}
+        if not self.undoable and mc.undoInfo(query=True, state=True):
+            mc.undoInfo(stateWithoutFlush=False)
+            restore["undo"] = True
+        else:
+            mc.undoInfo(openChunk=True)
+
+        # The refresh suspension isn't counted by Maya, so only the first operation that suspends it may resume it
+        if self.suspendRefresh and not cls._suspended:
+            mc.refresh(suspend=True)
+            cls._suspended = True
+            restore["refresh"] = True
+
+        self._restore.append(restore)
+        return self
+
+    def __exit__(self, *exc_info):
+        cls = type(self)
+        restore = self._restore.pop()
+        try:
+            if restore["refresh"]:
+                cls._suspended = False
+                mc.refresh(suspend=False)
+        finally:
+            if restore["undo"]:
+                mc.undoInfo(stateWithoutFlush=True)
+            else:
+                mc.undoInfo(closeChunk=True)
+        return False
+
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self:
+                return func(*args, **kwargs)
+        return wrapper